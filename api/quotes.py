@@ -1,24 +1,255 @@
 """Quote fetching for the StudyBuddy Scheduler.
 
 This script defines the QuoteFetcher class, which retrieves motivational
-quotes from the ZenQuotes API.
+quotes from the ZenQuotes API, and the QuoteCache class, which keeps a
+prefetched batch of quotes in memory and on disk so that generating a
+schedule never has to wait on the network.
 """
 
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from monitoring.metrics import metrics, timed
+
+ZENQUOTES_URL = "https://zenquotes.io/api/quotes"
+FALLBACK_QUOTE = "Failed to fetch quote"
+DEFAULT_TIMEOUT = 3.0
+DEFAULT_TTL = 6 * 60 * 60
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "studybuddy", "quotes.json")
+
+QUOTE_SECONDS = metrics.histogram("studybuddy_quote_seconds", "Time to return a quote.", ("mode",))
+QUOTE_REFILLS = metrics.counter("studybuddy_quote_refills", "Quote API requests by outcome.", ("result",))
+
+_session = None
+_session_lock = threading.Lock()
+_default_cache = None
+
+
+def get_session():
+    """Returns the requests session shared by every QuoteFetcher.
+
+    Reusing one session keeps a pool of open connections to the quote API
+    instead of doing a new TCP and TLS handshake on every request.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+            _session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        return _session
+
+
+def default_cache():
+    """Returns the process-wide QuoteCache stored at DEFAULT_CACHE_PATH.
+
+    Returns:
+        QuoteCache: The shared quote cache.
+    """
+    global _default_cache
+    with _session_lock:
+        if _default_cache is None:
+            _default_cache = QuoteCache()
+        return _default_cache
+
+
+class QuoteCache:
+    """Keeps a batch of quotes in memory, mirrored to a JSON file on disk.
+
+    Quotes are served until they are older than the TTL, after which the
+    cache is considered stale and should be refilled. Stale quotes are still
+    served while the refill is in progress.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, retry_after=60):
+        """Initializes the cache and loads any quotes saved on disk.
+
+        Args:
+            path (str, optional): JSON file used to persist the quotes, or
+                None to keep them in memory only. Defaults to DEFAULT_CACHE_PATH.
+            ttl (float, optional): Seconds before the quotes need a refill.
+                Defaults to DEFAULT_TTL.
+            retry_after (float, optional): Seconds to wait after a failed
+                refill before trying the API again. Defaults to 60.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.refill_lock = threading.Lock()
+        self._quotes = []
+        self._fetched_at = 0.0
+        self._failed_at = None
+        self._load()
+
+    def _load(self):
+        """Loads quotes from the on-disk cache file, if there is one."""
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._quotes = [str(q) for q in data["quotes"]]
+            self._fetched_at = float(data["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._quotes = []
+            self._fetched_at = 0.0
+
+    def _save(self):
+        """Writes the current quotes to the on-disk cache file."""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": self._fetched_at, "quotes": self._quotes}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # The in-memory copy still works without the disk tier
+
+    def __len__(self):
+        return len(self._quotes)
+
+    def is_stale(self):
+        """Checks whether the cache is empty or older than its TTL.
+
+        Returns:
+            bool: True if the cache should be refilled.
+        """
+        return not self._quotes or time.time() - self._fetched_at >= self.ttl
+
+    def should_refill(self):
+        """Checks whether a refill should be attempted right now.
+
+        Returns:
+            bool: True if the cache is stale and not backing off after a failure.
+        """
+        if not self.is_stale():
+            return False
+        return self._failed_at is None or time.time() - self._failed_at >= self.retry_after
+
+    def random_quote(self):
+        """Picks a random quote from the cache.
+
+        Returns:
+            str or None: A quote in the format 'quote - author', or None if
+                the cache is empty.
+        """
+        quotes = self._quotes
+        return random.choice(quotes) if quotes else None
+
+    def refill(self, quotes):
+        """Replaces the cached quotes with a freshly fetched batch.
+
+        Args:
+            quotes (list of str): Quotes in the format 'quote - author'.
+        """
+        self._quotes = list(quotes)
+        self._fetched_at = time.time()
+        self._failed_at = None
+        self._save()
+
+    def mark_failed(self):
+        """Records a failed refill so the API is not retried immediately."""
+        self._failed_at = time.time()
+
 
 class QuoteFetcher:
     """Fetches motivational quotes from the ZenQuotes API."""
 
+    def __init__(self, api_url=ZENQUOTES_URL, timeout=DEFAULT_TIMEOUT, cache=None):
+        """Initializes the QuoteFetcher.
+
+        Args:
+            api_url (str, optional): Endpoint returning a JSON list of
+                {'q': quote, 'a': author} objects. Defaults to ZENQUOTES_URL.
+            timeout (float, optional): Request timeout in seconds.
+                Defaults to DEFAULT_TIMEOUT.
+            cache (QuoteCache, optional): Cache to serve quotes from.
+                Defaults to the shared cache returned by default_cache().
+        """
+        self.api_url = api_url
+        self.timeout = timeout
+        self.cache = cache if cache is not None else default_cache()
+
+    def fetch_quotes(self):
+        """Fetches a batch of quotes from the API, bypassing the cache.
+
+        Returns:
+            list of str: Quotes in the format 'quote - author'.
+
+        Raises:
+            requests.RequestException: If the request fails or times out.
+            ValueError: If the response is not a usable list of quotes.
+        """
+        res = get_session().get(self.api_url, timeout=self.timeout)
+        res.raise_for_status()
+        try:
+            quotes = [f"{quote['q']} - {quote['a']}" for quote in res.json()]
+        except (KeyError, TypeError) as err:
+            raise ValueError(f"Unexpected quote payload: {err}") from err
+        if not quotes:
+            raise ValueError("Quote API returned no quotes")
+        return quotes
+
+    def refill(self):
+        """Refills the cache from the API if it is still stale.
+
+        Concurrent callers wait for a single request instead of each
+        fetching their own batch.
+
+        Returns:
+            bool: True if the cache holds fresh quotes afterwards.
+        """
+        with self.cache.refill_lock:
+            if not self.cache.should_refill():
+                return not self.cache.is_stale()
+            try:
+                quotes = self.fetch_quotes()
+            except (requests.RequestException, ValueError):
+                QUOTE_REFILLS.inc(("error",))
+                self.cache.mark_failed()
+                return False
+            QUOTE_REFILLS.inc(("ok",))
+            self.cache.refill(quotes)
+            return True
+
+    @timed(QUOTE_SECONDS, ("sync",))
     def get_quote(self):
-        """Fetches a random quote from the ZenQuotes API.
+        """Returns a random quote, refilling the cache first if it is stale.
 
         Returns:
             str: A motivational quote in the format 'quote - author'.
-                 Returns an error message if the API request fails.
-        """
-        res = requests.get("https://zenquotes.io/api/random")
-        if res.status_code == 200:
-            quote = res.json()[0]
-            return f"{quote['q']} - {quote['a']}"
-        else:
-            return "Failed to fetch quote"
+                 Returns an error message if no quote could be fetched.
+        """
+        if self.cache.should_refill():
+            self.refill()
+        return self.cache.random_quote() or FALLBACK_QUOTE
+
+    async def get_quote_async(self):
+        """Returns a random quote without blocking the event loop.
+
+        Cached quotes are returned immediately. A stale cache is refilled in
+        the background, and only an empty cache waits for the request, which
+        runs in a worker thread.
+
+        Returns:
+            str: A motivational quote in the format 'quote - author'.
+                 Returns an error message if no quote could be fetched.
+        """
+        with QUOTE_SECONDS.time(("async",)):
+            if self.cache.should_refill():
+                refill = asyncio.get_running_loop().run_in_executor(None, self.refill)
+                if not len(self.cache):
+                    await refill
+            return self.cache.random_quote() or FALLBACK_QUOTE
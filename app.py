@@ -1,21 +1,53 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import Response, RedirectResponse
+from fastapi.responses import PlainTextResponse, Response, RedirectResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from reactpy.backend.fastapi import configure, Options
-import json
+import argparse
+import asyncio
+import os
+import secrets
 import uvicorn
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 
+from api.quotes import QuoteFetcher
 from exporter.file_exporter import FileExporter
+from exporter.http_cache import MIN_COMPRESS_BYTES, choose_encoding, compress, etag_matches, iter_compressed, strong_etag
+from exporter.schedule_store import SCHEDULE_STORE_ENV, schedule_store
 from frontend.ui import StudyBuddyUI
+from monitoring.metrics import metrics
+from monitoring.profiling import PROFILE_HEADER, PROFILE_PARAM, PROFILE_TOKEN_HEADER, PROFILE_TOKEN_PARAM, request_profiler
+from scheduler.charts import chart_cache, course_durations, render_pie_png, render_pie_svg
+from scheduler.registry import registry
+from scheduler.result_cache import RESULT_CACHE_ENV, result_cache
+from scheduler.scheduler_engine import SchedulerEngine
+from storage.sqlite_store import DEFAULT_DB_PATH, SESSION_COOKIE
 
 """Main application script for the StudyBuddy Scheduler.
 
 This script sets up a FastAPI application with ReactPy for the frontend
 and provides endpoints for downloading schedules in CSV or text format.
+
+Run it with --workers N to serve from N processes. Download tokens and
+generated schedules are then shared between the workers through SQLite
+files next to the database, and each worker warms up before it accepts
+requests.
 """
 
+@asynccontextmanager
+async def lifespan(app):
+    """Prepares the worker before it serves requests.
+
+    Warms the quote cache in the background so the first schedule doesn't
+    wait on it, and warms up the worker itself when main() asked for it.
+    """
+    asyncio.get_running_loop().run_in_executor(None, QuoteFetcher().refill)
+    if os.environ.get(WARM_UP_ENV):
+        await asyncio.to_thread(warm_up)
+    yield
+
 # Create FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,47 +63,232 @@ configure(app, StudyBuddyUI, options=Options(url_prefix="/app"))
 # Create exporter
 exporter = FileExporter()
 
+# The session cookie identifies a browser's saved courses and schedule
+SESSION_MAX_AGE = 365 * 24 * 60 * 60
+
+@app.middleware("http")
+async def assign_session(request: Request, call_next):
+    """Gives each browser a random user id cookie so its schedule can be saved."""
+    response = await call_next(request)
+    if SESSION_COOKIE not in request.cookies:
+        response.set_cookie(
+            SESSION_COOKIE, secrets.token_urlsafe(16),
+            max_age=SESSION_MAX_AGE, httponly=True, samesite="lax",
+        )
+    return response
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Profiles the request if it asked to be, see monitoring.profiling.
+
+    The profile covers the response body too, and its file name is sent
+    back in the X-StudyBuddy-Profile header.
+    """
+    if not request_profiler.enabled:
+        return await call_next(request)
+    mode = request_profiler.requested_mode(
+        request.query_params.get(PROFILE_PARAM) or request.headers.get(PROFILE_HEADER),
+        request.query_params.get(PROFILE_TOKEN_PARAM) or request.headers.get(PROFILE_TOKEN_HEADER),
+    )
+    session = request_profiler.start(f"{request.method} {request.url.path}", mode) if mode else None
+    if session is None:
+        return await call_next(request)
+    try:
+        response = await call_next(request)
+    except BaseException:
+        session.stop()
+        raise
+    response.body_iterator = stop_after(response.body_iterator, session)
+    response.headers[PROFILE_HEADER] = os.path.basename(session.path)
+    return response
+
+async def stop_after(body, session):
+    """Passes a response body through, then stops the profile session."""
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        session.stop()
+
+# Set by main() so workers warm up before serving; tests skip the warm-up
+WARM_UP_ENV = "STUDYBUDDY_WARM_UP"
+
+def warm_up(png=False):
+    """Runs every strategy, the SVG chart and the exporters once.
+
+    This loads the strategy modules, fills the date and calendar caches and
+    opens the result cache, so the first user of a fresh worker doesn't pay
+    for them. Workers started together share the warm-up schedules through
+    the result cache's disk tier.
+
+    Args:
+        png (bool, optional): Also render a PNG chart, which imports
+            matplotlib and builds its font cache. Defaults to False.
+    """
+    today = datetime.today().date()
+    courses = [{"course": "Warm-up", "deadline": str(today + timedelta(days=6)), "hours": 3}]
+    for name in registry.names():
+        schedule = SchedulerEngine(name).generate_schedule(courses, today)
+    durations = course_durations(schedule)
+    render_pie_svg(durations)
+    if png:
+        render_pie_png(durations)
+    for stream, _ in EXPORT_FORMATS.values():
+        "".join(stream(schedule))
+
+# Exports of schedules up to this many blocks are rendered once and cached;
+# longer schedules are streamed on every download to keep memory flat.
+MAX_CACHED_EXPORT_BLOCKS = 5000
+
+# Tokens are derived from the content, so a cached download never goes
+# stale; after an hour the browser revalidates it with If-None-Match.
+DOWNLOAD_CACHE_CONTROL = "private, max-age=3600"
+
+EXPORT_FORMATS = {
+    "csv": (exporter.iter_csv, "text/csv"),
+    "txt": (exporter.iter_txt, "text/plain"),
+}
+
+DOWNLOADS = metrics.counter("studybuddy_downloads", "Download requests by file type and status.", ("filetype", "status"))
+DOWNLOAD_SECONDS = metrics.histogram(
+    "studybuddy_download_seconds", "Time to answer a download, before the body is streamed.", ("filetype",)
+)
+
+metrics.callback(
+    "studybuddy_result_cache_lookups", "Result cache lookups by outcome.", "counter",
+    lambda: {(outcome,): result_cache.stats()[key] for outcome, key in
+             (("hit", "hits"), ("disk_hit", "disk_hits"), ("miss", "misses"))},
+    ("outcome",),
+)
+metrics.callback(
+    "studybuddy_chart_cache_lookups", "Chart cache lookups by outcome.", "counter",
+    lambda: {("hit",): chart_cache.stats()["hits"], ("miss",): chart_cache.stats()["misses"]},
+    ("outcome",),
+)
+metrics.callback("studybuddy_stored_schedules", "Schedules held for download.", "gauge", lambda: len(schedule_store))
+
 @app.get("/download/{filetype}")
-async def download_schedule(filetype: str, data: str):
-    """Endpoint to download the schedule in the specified file format.
+async def download_schedule(request: Request, filetype: str, token: str = ""):
+    """Endpoint to download a stored schedule in the specified file format.
+
+    Responses carry a strong ETag, so a repeat download with If-None-Match
+    gets a 304 without the export being looked at. Bodies are compressed
+    with gzip or brotli when the client accepts it. Exports of smaller
+    schedules are rendered and compressed once and then served from the
+    schedule store. Larger ones are compressed as they stream, with
+    chunked transfer encoding.
 
     Args:
+        request (Request): The request, for its conditional and
+            Accept-Encoding headers.
         filetype (str): The file format ('csv' or 'txt').
-        data (str): The schedule data in JSON format.
+        token (str): The download token returned by schedule_store.put().
 
     Returns:
-        Response: A file response with the schedule in the requested format.
+        Response: A file response with the schedule in the requested
+            format, or an empty 304 response.
     """
-    if not data:
-        return Response("No data provided", status_code=400)
-
-    try:
-        # Parse JSON data
-        schedule = json.loads(data)
-    except json.JSONDecodeError:
-        return Response("Invalid JSON data", status_code=400)
-    
-    if filetype == "csv":
-        content = exporter.export_to_csv(schedule)
-        return Response(
-            content,
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=schedule.csv"},
-        )
-    elif filetype == "txt":
-        content = exporter.export_to_txt(schedule)
-        return Response(
-            content,
-            media_type="text/plain",
-            headers={"Content-Disposition": "attachment; filename=schedule.txt"},
-        )
-    else:
+    if filetype not in EXPORT_FORMATS:
+        DOWNLOADS.inc(("invalid", "400"))
         return Response("Invalid file type", status_code=400)
+    if not token:
+        DOWNLOADS.inc((filetype, "400"))
+        return Response("No schedule token provided", status_code=400)
+
+    with DOWNLOAD_SECONDS.time((filetype,)):
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        headers = {
+            "Content-Disposition": f"attachment; filename=schedule.{filetype}",
+            "Cache-Control": DOWNLOAD_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        # Tags only depend on the token, so this needs no lookup. Small
+        # bodies are sent uncompressed, so the plain tag is current too.
+        if_none_match = request.headers.get("if-none-match")
+        for etag in {strong_etag(token, filetype, encoding), strong_etag(token, filetype)}:
+            if etag_matches(if_none_match, etag):
+                DOWNLOADS.inc((filetype, "304"))
+                return Response(status_code=304, headers={**headers, "ETag": etag})
+
+        schedule = schedule_store.get(token)
+        if schedule is None:
+            DOWNLOADS.inc((filetype, "404"))
+            return Response("Schedule not found or expired", status_code=404)
+
+        stream, media_type = EXPORT_FORMATS[filetype]
+        if len(schedule) <= MAX_CACHED_EXPORT_BLOCKS:
+            render = lambda s: "".join(stream(s)).encode("utf-8")
+            content = schedule_store.get_export(token, filetype, render)
+            # The entry can be evicted after get(); the schedule is still in hand
+            if content is None:
+                content = render(schedule)
+            if encoding and len(content) < MIN_COMPRESS_BYTES:
+                encoding = None
+            if encoding:
+                plain = content
+                content = schedule_store.get_export(token, f"{filetype}.{encoding}", lambda s: compress(plain, encoding))
+                if content is None:
+                    content = compress(plain, encoding)
+                headers["Content-Encoding"] = encoding
+            headers["ETag"] = strong_etag(token, filetype, encoding)
+            DOWNLOADS.inc((filetype, "200"))
+            return Response(content, media_type=media_type, headers=headers)
+
+        body = stream(schedule)
+        if encoding:
+            body = iter_compressed(body, encoding)
+            headers["Content-Encoding"] = encoding
+        headers["ETag"] = strong_etag(token, filetype, encoding)
+
+    DOWNLOADS.inc((filetype, "200"))
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Serves this worker's metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
     
 @app.get("/")
 async def root():
     """Redirects the root URL to the ReactPy application."""
     return RedirectResponse(url="/app")
     
+def share_caches(directory):
+    """Points the download token store and result cache at shared files.
+
+    Must run before the workers import the app. Paths already set in the
+    environment are kept.
+
+    Args:
+        directory (str): Directory for the cache files.
+    """
+    os.environ.setdefault(SCHEDULE_STORE_ENV, os.path.join(directory, "schedules.db"))
+    os.environ.setdefault(RESULT_CACHE_ENV, os.path.join(directory, "results.db"))
+
+def main(argv=None):
+    """Starts the server with one or more worker processes.
+
+    Args:
+        argv (list of str, optional): Command line arguments. Defaults to
+            sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Run the StudyBuddy Scheduler.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("STUDYBUDDY_WORKERS", 1)),
+                        help="worker processes (default: $STUDYBUDDY_WORKERS or 1)")
+    args = parser.parse_args(argv)
+
+    os.environ[WARM_UP_ENV] = "1"
+    if args.workers <= 1:
+        uvicorn.run(app, host=args.host, port=args.port)
+        return
+    share_caches(os.path.dirname(os.path.abspath(DEFAULT_DB_PATH)))
+    # Workers are spawned, not forked, so each imports the app itself. The
+    # parent builds the on-disk font cache first so they don't all race to.
+    warm_up(png=True)
+    uvicorn.run("app:app", host=args.host, port=args.port, workers=args.workers,
+                app_dir=os.path.dirname(os.path.abspath(__file__)))
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
+    main()
@@ -0,0 +1,89 @@
+"""Export benchmark for the StudyBuddy Scheduler.
+
+This script compares building a whole export in memory with streaming it
+in chunks through FileExporter, reporting peak memory and time to first
+byte for schedules of 10k, 100k and 1M blocks.
+
+Usage:
+    python benchmarks/bench_export.py [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from exporter.file_exporter import FileExporter
+
+
+def make_schedule(size):
+    """Builds a synthetic schedule with the given number of blocks.
+
+    Args:
+        size (int): Number of schedule blocks.
+
+    Returns:
+        list of dict: The schedule blocks.
+    """
+    start = date(2025, 1, 1)
+    return [
+        {
+            "course": f"Course {i % 40}",
+            "block": "study" if i % 2 == 0 else "break",
+            "duration": 25 if i % 2 == 0 else 5,
+            "date": str(start + timedelta(days=i // 200)),
+        }
+        for i in range(size)
+    ]
+
+
+def measure(schedule, export):
+    """Consumes an export and measures its cost.
+
+    Args:
+        schedule (list of dict): The schedule to export.
+        export (callable): Returns an iterable of string chunks for a schedule.
+
+    Returns:
+        tuple: Time to first chunk (s), total time (s), and peak memory
+            allocated while exporting (bytes).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    for _ in export(schedule):
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first or total, total, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    exporter = FileExporter()
+    modes = [
+        ("csv full", lambda s: [exporter.export_to_csv(s)]),
+        ("csv stream", exporter.iter_csv),
+        ("txt full", lambda s: [exporter.export_to_txt(s)]),
+        ("txt stream", exporter.iter_txt),
+    ]
+
+    print(f"{'blocks':>10}  {'mode':<11} {'ttfb ms':>9} {'total ms':>9} {'peak MiB':>9}")
+    for size in args.sizes:
+        schedule = make_schedule(size)
+        for name, export in modes:
+            ttfb, total, peak = measure(schedule, export)
+            print(f"{size:>10}  {name:<11} {ttfb * 1000:>9.1f} {total * 1000:>9.1f} {peak / 2**20:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Export format benchmark for the StudyBuddy Scheduler.
+
+This script writes a schedule to a file in every available FileExporter
+format, then loads it back, reporting the file size and the write and
+load throughput in blocks per second. Arrow and Parquet are included
+when pyarrow is installed.
+
+Usage:
+    python benchmarks/bench_formats.py [--sizes 100000 1000000] [--formats csv columns]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from exporter.file_exporter import FileExporter
+from scheduler.blocks import ScheduleBlocks
+
+
+def make_blocks(size):
+    """Builds a synthetic schedule with the given number of blocks.
+
+    Args:
+        size (int): Number of schedule blocks.
+
+    Returns:
+        ScheduleBlocks: The schedule blocks.
+    """
+    start = date(2025, 1, 1)
+    blocks = ScheduleBlocks()
+    for i in range(size):
+        blocks.append(
+            f"Course {i % 40}", "study" if i % 2 == 0 else "break",
+            25 if i % 2 == 0 else 5, start + timedelta(days=i // 200),
+        )
+    return blocks
+
+
+def measure(exporter, name, blocks, directory):
+    """Writes blocks to a file in one format and loads them back.
+
+    Args:
+        exporter (FileExporter): The exporter.
+        name (str): Format name.
+        blocks (ScheduleBlocks): The schedule.
+        directory (str): Where to write the file.
+
+    Returns:
+        tuple: File size (bytes), write time (s) and load time (s).
+    """
+    path = os.path.join(directory, f"schedule.{exporter.get_format(name).extension}")
+    start = time.perf_counter()
+    exporter.export(name, blocks, path)
+    written = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded = exporter.load(name, path)
+    read = time.perf_counter() - start
+    if len(loaded) != len(blocks):
+        raise AssertionError(f"{name} loaded {len(loaded)} of {len(blocks)} blocks")
+    size = os.path.getsize(path)
+    os.remove(path)
+    return size, written, read
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--formats", nargs="+", default=FileExporter.format_names())
+    args = parser.parse_args()
+
+    exporter = FileExporter()
+    print(f"{'blocks':>10}  {'format':<8} {'MiB':>8} {'write ms':>9} {'load ms':>9} {'write blk/s':>12} {'load blk/s':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        # Import each format's modules before timing it
+        for name in args.formats:
+            measure(exporter, name, make_blocks(10), directory)
+        for size in args.sizes:
+            blocks = make_blocks(size)
+            for name in args.formats:
+                nbytes, written, read = measure(exporter, name, blocks, directory)
+                print(
+                    f"{size:>10}  {name:<8} {nbytes / 2**20:>8.2f} {written * 1000:>9.1f} {read * 1000:>9.1f}"
+                    f" {size / written:>12,.0f} {size / read:>12,.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Metrics overhead benchmark for the StudyBuddy Scheduler.
+
+This script measures what instrumentation costs. It first times the bare
+recording primitives. It then times the instrumented hot paths with
+metrics enabled and disabled, and reports the overhead of enabling them
+as a share of each call.
+
+The measured difference is at the mercy of timing noise, which on shared
+machines exceeds the overhead itself. So the estimate column also
+multiplies the measured cost of one recording by the number of
+recordings a call makes.
+
+Usage:
+    python benchmarks/bench_metrics.py [--repeat 7]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from exporter.file_exporter import FileExporter
+from monitoring.metrics import MetricsRegistry, metrics, timed
+from scheduler.charts import render_pie_svg
+from scheduler.scheduler_engine import SchedulerEngine
+
+
+def best(run, number, repeat):
+    """Returns the best seconds per call of run."""
+    return min(timeit.repeat(run, number=number, repeat=repeat)) / number
+
+
+def primitives(repeat):
+    """Prints the cost of each recording primitive in nanoseconds.
+
+    Returns:
+        float: Seconds one timed call adds while metrics are enabled.
+    """
+    def bare():
+        return None
+
+    print(f"{'primitive':<28} {'enabled ns':>11} {'disabled ns':>12}")
+    for enabled in (True, False):
+        registry = MetricsRegistry(enabled=enabled)
+        counter = registry.counter("c", "Counter.", ("label",))
+        histogram = registry.histogram("h", "Histogram.", ("label",))
+        wrapped = timed(histogram, ("x",))(bare)
+
+        def with_timer():
+            with histogram.time(("x",)):
+                pass
+
+        cases = {
+            "call (no instrumentation)": bare,
+            "counter.inc": lambda: counter.inc(("x",)),
+            "histogram.observe": lambda: histogram.observe(0.003, ("x",)),
+            "with histogram.time()": with_timer,
+            "@timed call": wrapped,
+        }
+        for name, run in cases.items():
+            cases[name] = best(run, 200_000, repeat)
+        if enabled:
+            on = cases
+        else:
+            for name in cases:
+                print(f"{name:<28} {on[name] * 1e9:>11.0f} {cases[name] * 1e9:>12.0f}")
+    return on["@timed call"] - on["call (no instrumentation)"]
+
+
+def hot_paths(repeat, per_recording):
+    """Prints each instrumented path's time with metrics on and off.
+
+    Args:
+        repeat (int): Timed repeats per mode.
+        per_recording (float): Seconds one timed call adds, from primitives().
+    """
+    today = date(2025, 1, 6)
+    courses = [
+        {"course": f"Course {i}", "deadline": str(today + timedelta(days=7 + i)), "hours": 4 + i % 6}
+        for i in range(50)
+    ]
+    schedule = [
+        {"course": f"Course {i % 40}", "block": "study", "duration": 25, "date": str(today + timedelta(days=i // 200))}
+        for i in range(10_000)
+    ]
+    cached = SchedulerEngine("even")
+    uncached = SchedulerEngine("even", cache=None)
+    exporter = FileExporter()
+    durations = {f"Course {i}": 30 + i for i in range(8)}
+    cached.generate_schedule(courses, today)
+
+    chunks = -(-len(schedule) // exporter.chunk_size)
+    # (name, call, calls per timing, recordings per call); exports time
+    # every chunk and record once at the end
+    cases = [
+        ("schedule, cache hit", lambda: cached.generate_schedule(courses, today), 2000, 1),
+        ("schedule, 50 courses", lambda: uncached.generate_schedule(courses, today), 50, 1),
+        ("export csv, 10k blocks", lambda: "".join(exporter.iter_csv(schedule)), 5, chunks + 1),
+        ("export txt, 10k blocks", lambda: "".join(exporter.iter_txt(schedule)), 20, chunks + 1),
+        ("svg pie chart", lambda: render_pie_svg(durations), 2000, 1),
+    ]
+    print(f"\n{'hot path':<24} {'enabled us':>11} {'disabled us':>12} {'measured':>9} {'estimate':>9}")
+    for name, run, number, recordings in cases:
+        # Alternate the two modes so drift affects both alike
+        on, off = [], []
+        for _ in range(repeat):
+            metrics.enabled = True
+            on.append(best(run, number, 1))
+            metrics.enabled = False
+            off.append(best(run, number, 1))
+        metrics.enabled = True
+        on, off = min(on), min(off)
+        estimate = recordings * per_recording / off
+        print(f"{name:<24} {on * 1e6:>11.1f} {off * 1e6:>12.1f} {(on - off) / off:>9.2%} {estimate:>9.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    hot_paths(args.repeat, primitives(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
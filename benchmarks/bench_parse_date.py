@@ -0,0 +1,62 @@
+"""Date parsing microbenchmark for the StudyBuddy Scheduler.
+
+This script compares the original strptime-based parse_date with the
+cached parser in scheduler.utils, on ISO and US dates and on a mix
+of repeated deadlines.
+
+Usage:
+    python benchmarks/bench_parse_date.py [--number 200000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.utils import _parse_date_string, parse_date
+
+
+def legacy_parse_date(date_str):
+    """The strptime-based parse_date this module's parser replaced."""
+    try:
+        return datetime.strptime(date_str.strip(), "%Y-%m-%d").date()
+    except ValueError:
+        try:
+            return datetime.strptime(date_str.strip(), "%m/%d/%Y").date()
+        except Exception:
+            return datetime.today().date()
+
+
+def uncached_parse_date(date_str):
+    """The new parser with its cache bypassed, to show the fast path alone."""
+    return _parse_date_string.__wrapped__(date_str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    today = date.today()
+    deadlines = [str(today + timedelta(days=i % 90)) for i in range(1000)]
+    cases = [
+        ("iso", lambda parse: parse("2025-03-07")),
+        ("us", lambda parse: parse("03/07/2025")),
+        ("mix of 90", lambda parse: [parse(d) for d in deadlines]),
+    ]
+    parsers = [("legacy", legacy_parse_date), ("uncached", uncached_parse_date), ("cached", parse_date)]
+
+    print(f"{'case':<10} {'parser':<9} {'ns/date':>9}")
+    for case, run in cases:
+        per_call = len(deadlines) if case.startswith("mix") else 1
+        number = max(args.number // per_call, 1)
+        for name, parse in parsers:
+            seconds = min(timeit.repeat(lambda: run(parse), number=number, repeat=3))
+            print(f"{case:<10} {name:<9} {seconds / number / per_call * 1e9:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Memory-mapped reader benchmark for the StudyBuddy Scheduler.
+
+This script exports a large synthetic cohort schedule in the 'columns'
+format, then times MappedSchedule queries over it: building and reopening
+the date index, per-course totals over the whole file and over one week,
+one day's blocks and completion for a set of done blocks. For comparison
+it loads the same file into memory with FileExporter.load() and totals
+the courses from there. Private resident memory is reported after each
+step; the reader's queries shouldn't move it much.
+
+Usage:
+    python benchmarks/bench_reader.py [--blocks 10000000]
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from array import array
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from exporter.file_exporter import FileExporter
+from exporter.schedule_reader import MappedSchedule
+from scheduler.blocks import ScheduleBlocks
+
+
+def make_blocks(size, courses=500, days=365):
+    """Builds a cohort schedule course by course, so dates are out of order.
+
+    Args:
+        size (int): Number of schedule blocks.
+        courses (int, optional): Number of courses. Defaults to 500.
+        days (int, optional): Days the schedule spans. Defaults to 365.
+
+    Returns:
+        ScheduleBlocks: The schedule blocks.
+    """
+    rng = np.random.default_rng(0)
+    course_ids = np.sort(rng.integers(0, courses, size)).astype(np.uint32)
+    ordinals = (date(2025, 1, 1).toordinal() + rng.integers(0, days, size)).astype(np.int32)
+    block_types = (np.arange(size) % 2).astype(np.uint8)
+    durations = np.where(block_types == 0, 25, 5).astype(np.int16)
+    return ScheduleBlocks.from_columns(
+        [f"Course {i}" for i in range(courses)],
+        array("I", course_ids.tobytes()), array("i", ordinals.tobytes()), array("h", durations.tobytes()),
+        block_types=array("B", block_types.tobytes()),
+    )
+
+
+def private_mib():
+    """Returns the process's resident memory not backed by files, in MiB.
+
+    Pages of a memory-mapped file can be dropped and reread at any time, so
+    only anonymous memory shows what a query really holds. Falls back to
+    the peak resident memory where /proc isn't available.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) / 2**10
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def timed(label, run):
+    """Runs a step, printing its time and the private memory after it.
+
+    Args:
+        label (str): What the step does.
+        run (callable): The step.
+
+    Returns:
+        object: What the step returned.
+    """
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1000:>10.1f} ms {private_mib():>10.0f} MiB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    exporter = FileExporter()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cohort.sbc")
+        blocks = make_blocks(args.blocks)
+        exporter.export("columns", blocks, path)
+        del blocks
+        print(f"{args.blocks:,} blocks, {os.path.getsize(path) / 2**20:.0f} MiB file")
+        print(f"{'step':<36} {'time':>13} {'memory':>15}")
+        timed("baseline", lambda: None)
+
+        timed("open, building the index", lambda: MappedSchedule(path).close())
+        with timed("open, reusing the index", lambda: MappedSchedule(path)) as reader:
+            timed("course totals, whole file", lambda: reader.course_totals(block="study"))
+            timed("course totals, one week", lambda: reader.course_totals("2025-06-01", "2025-06-07"))
+            timed("date totals, whole file", reader.date_totals)
+            day = timed("blocks of one day", lambda: reader.blocks_on("2025-06-01"))
+            completed = [("2025-06-01", i) for i in range(0, len(day), 2)]
+            timed("completion, one day done", lambda: reader.completion(completed))
+
+        loaded = timed("load into memory (comparison)", lambda: exporter.load("columns", path))
+        timed("course totals in memory", lambda: loaded.sum_by_course("study"))
+
+
+if __name__ == "__main__":
+    main()
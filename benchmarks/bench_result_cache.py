@@ -0,0 +1,50 @@
+"""Result cache microbenchmark for the StudyBuddy Scheduler.
+
+This script times generating the same schedule again with and without the
+result cache, for each strategy, and reports the cache's hit rate.
+
+Usage:
+    python benchmarks/bench_result_cache.py [--courses 20] [--number 2000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.result_cache import ResultCache
+from scheduler.scheduler_engine import SchedulerEngine
+
+
+def make_courses(count):
+    """Builds courses with deadlines spread over the next two months."""
+    today = date.today()
+    return [
+        {"course": f"Course {i}", "deadline": str(today + timedelta(days=7 + i * 3 % 60)), "hours": 5 + i % 10}
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    courses = make_courses(args.courses)
+    print(f"{'strategy':<10} {'uncached us':>12} {'cached us':>10} {'hit rate':>9}")
+    for strategy in ("even", "pomodoro", "capacity"):
+        cache = ResultCache()
+        uncached = SchedulerEngine(strategy, cache=None)
+        cached = SchedulerEngine(strategy, cache=cache)
+        number = max(args.number // 20, 1)
+        cold = min(timeit.repeat(lambda: uncached.generate_schedule(courses), number=number, repeat=3)) / number
+        warm = min(timeit.repeat(lambda: cached.generate_schedule(courses), number=args.number, repeat=3)) / args.number
+        print(f"{strategy:<10} {cold * 1e6:>12.0f} {warm * 1e6:>10.1f} {cache.stats()['hit_rate']:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
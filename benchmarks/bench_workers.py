@@ -0,0 +1,116 @@
+"""Worker scaling benchmark for the StudyBuddy Scheduler.
+
+This script starts app.py with 1, 2, 4, ... worker processes and measures
+how many CSV downloads of a large schedule per second the server sustains
+under concurrent clients. Downloads above MAX_CACHED_EXPORT_BLOCKS are
+rendered on every request, so each one is CPU-bound. The schedule is put in
+the shared token store before the server starts, so every worker can
+serve it.
+
+Throughput can only scale up to the number of CPU cores.
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1 2 4] [--seconds 10] [--clients 16]
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from exporter.schedule_store import SCHEDULE_STORE_ENV, ScheduleStore
+
+
+def free_port():
+    """Returns a TCP port nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_schedule(blocks):
+    """Builds a schedule with the given number of blocks."""
+    today = date.today()
+    return [
+        {"course": f"Course {i % 20}", "block": "study", "duration": 25, "date": str(today + timedelta(days=i % 90))}
+        for i in range(blocks)
+    ]
+
+
+def start_server(workers, port, env):
+    """Starts app.py and waits until it answers."""
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "app.py"), "--workers", str(workers), "--port", str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"server with {workers} workers did not start")
+
+
+def measure(url, clients, seconds):
+    """Downloads url from concurrent clients and returns requests per second."""
+    counts = [0] * clients
+    stop = time.monotonic() + seconds
+
+    def client(index):
+        with httpx.Client(timeout=30) as http:
+            while time.monotonic() < stop:
+                http.get(url).raise_for_status()
+                counts[index] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / (time.monotonic() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--blocks", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, STUDYBUDDY_DB=os.path.join(directory, "studybuddy.db"))
+        env[SCHEDULE_STORE_ENV] = os.path.join(directory, "schedules.db")
+        token = ScheduleStore(path=env[SCHEDULE_STORE_ENV]).put(make_schedule(args.blocks))
+
+        print(f"{os.cpu_count()} CPUs, {args.blocks} blocks per download, {args.clients} clients")
+        print(f"{'workers':>7} {'req/s':>8} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            port = free_port()
+            server = start_server(workers, port, env)
+            try:
+                rate = measure(f"http://127.0.0.1:{port}/download/csv?token={token}", args.clients, args.seconds)
+            finally:
+                server.terminate()
+                server.wait()
+            baseline = baseline or rate
+            print(f"{workers:>7} {rate:>8.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Benchmark suite for the StudyBuddy Scheduler.
+
+This script times the hot paths: every strategy over a sweep of course
+counts and horizons, Pomodoro windows, exporting and loading every
+available FileExporter format, the pie chart and the /download endpoint
+through an in-process ASGI client. It writes the results as JSON and,
+given a baseline file, exits with status 1 when a case got slower than
+the baseline by more than the tolerance, so it can gate a build.
+
+Each case reports the best time per call over several repeats, which is
+the least noisy estimate of its cost. Timings depend on the machine, so
+regenerate benchmarks/baseline.json on the machine that runs the
+comparison:
+
+    python benchmarks/suite.py --json benchmarks/baseline.json
+
+Usage:
+    python benchmarks/suite.py [--quick] [--match pomodoro] [--json results.json]
+    python benchmarks/suite.py --baseline benchmarks/baseline.json [--tolerance 0.5]
+"""
+
+import argparse
+import asyncio
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+RESULTS_VERSION = 1
+
+
+def make_courses(count, horizon, today):
+    """Builds courses with deadlines spread evenly over the horizon.
+
+    Args:
+        count (int): Number of courses.
+        horizon (int): Days until the last deadline.
+        today (datetime.date): First day of the schedule.
+
+    Returns:
+        list of dict: The courses.
+    """
+    return [
+        {
+            "course": f"Course {i}",
+            "deadline": str(today + timedelta(days=1 + (i * horizon) // count)),
+            "hours": 2 + i % 10,
+        }
+        for i in range(count)
+    ]
+
+
+def make_schedule(size, today):
+    """Builds a schedule with the given number of blocks.
+
+    Args:
+        size (int): Number of schedule blocks.
+        today (datetime.date): Date of the first block.
+
+    Returns:
+        list of dict: The schedule blocks.
+    """
+    return [
+        {
+            "course": f"Course {i % 40}",
+            "block": "study" if i % 2 == 0 else "break",
+            "duration": 25 if i % 2 == 0 else 5,
+            "date": str(today + timedelta(days=i // 200)),
+        }
+        for i in range(size)
+    ]
+
+
+def build_cases(quick=False):
+    """Lists the benchmark cases.
+
+    Args:
+        quick (bool, optional): Use a smaller sweep. Defaults to False.
+
+    Returns:
+        list of tuple: (name, callable) pairs; each callable runs the case once.
+    """
+    import httpx
+
+    from app import app
+    from exporter.file_exporter import FileExporter
+    from exporter.schedule_store import schedule_store
+    from scheduler.blocks import ScheduleBlocks
+    from scheduler.charts import generate_pie_chart
+    from scheduler.pomodoro import PomodoroScheduler
+    from scheduler.registry import registry
+    from scheduler.scheduler_engine import SchedulerEngine
+
+    today = date(2025, 1, 6)
+    # The quick sweep is a subset of the full one, so one baseline covers both
+    course_counts = (10, 200) if quick else (10, 50, 200)
+    horizons = (14, 365) if quick else (14, 90, 365)
+    cases = []
+
+    for strategy in registry.names():
+        # Without the result cache, so every call schedules from scratch
+        engine = SchedulerEngine(strategy, cache=None)
+        for count in course_counts:
+            for horizon in horizons:
+                courses = make_courses(count, horizon, today)
+                cases.append((
+                    f"schedule/{strategy}/{count}c/{horizon}d",
+                    lambda engine=engine, courses=courses: engine.generate_schedule(courses, today),
+                ))
+
+    pomodoro = PomodoroScheduler()
+    courses = make_courses(course_counts[-1], horizons[-1], today)
+    cases.append(("pomodoro/window/7d", lambda: pomodoro.window(courses, 7, today, start=30)))
+
+    exporter = FileExporter()
+    schedule = make_schedule(10_000, today)
+    cases.append(("export/csv/10k", lambda: "".join(exporter.iter_csv(schedule))))
+    cases.append(("export/txt/10k", lambda: "".join(exporter.iter_txt(schedule))))
+    blocks = ScheduleBlocks.from_dicts(schedule)
+    for name in FileExporter.format_names():
+        binary = FileExporter.get_format(name).binary
+        if name not in ("csv", "txt"):
+            cases.append((f"export/{name}/10k", lambda name=name: exporter.export(name, blocks)))
+        content = exporter.export(name, blocks)
+        if binary:
+            cases.append((f"load/{name}/10k", lambda name=name, content=content: exporter.load(name, io.BytesIO(content))))
+        else:
+            cases.append((
+                f"load/{name}/10k",
+                lambda name=name, content=content: exporter.load(name, io.StringIO(content, newline="")),
+            ))
+
+    chart_schedule = make_schedule(2_000, today)
+    cases.append(("chart/pie/2k", lambda: generate_pie_chart(chart_schedule)))
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    for label, size in (("1k-cached", 1_000), ("20k-streamed", 20_000)):
+        token = schedule_store.put(make_schedule(size, today))
+        for filetype in ("csv", "txt"):
+            url = f"/download/{filetype}?token={token}"
+            cases.append((
+                f"http/download/{filetype}/{label}",
+                lambda url=url: loop.run_until_complete(client.get(url)).raise_for_status(),
+            ))
+        etag = loop.run_until_complete(client.get(f"/download/csv?token={token}")).headers["etag"]
+        cases.append((
+            f"http/download/csv/{label}-304",
+            lambda url=f"/download/csv?token={token}", etag=etag: loop.run_until_complete(
+                client.get(url, headers={"If-None-Match": etag})),
+        ))
+    return cases
+
+
+def time_case(run, repeat=5, min_time=0.1):
+    """Times a case, calling it often enough to measure reliably.
+
+    Args:
+        run (callable): Runs the case once.
+        repeat (int, optional): Number of timed repeats. Defaults to 5.
+        min_time (float, optional): Minimum seconds per repeat. Defaults to 0.1.
+
+    Returns:
+        tuple: Best seconds per call and calls per repeat.
+    """
+    timer = timeit.Timer(run)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / elapsed)) if elapsed < min_time else number
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number, number
+
+
+def run_suite(cases, repeat=5, min_time=0.1, out=sys.stdout):
+    """Times every case and prints a line per case as it finishes.
+
+    Args:
+        cases (list of tuple): (name, callable) pairs from build_cases().
+        repeat (int, optional): Timed repeats per case. Defaults to 5.
+        min_time (float, optional): Minimum seconds per repeat. Defaults to 0.1.
+        out (file, optional): Where progress goes. Defaults to stdout.
+
+    Returns:
+        dict: The results document, with machine details and the seconds
+            per call of each case.
+    """
+    results = {}
+    for name, run in cases:
+        # Start each case without garbage left over from the previous one
+        gc.collect()
+        seconds, number = time_case(run, repeat, min_time)
+        results[name] = {"seconds": seconds, "number": number}
+        print(f"{name:<40} {seconds * 1e6:>12.1f} us", file=out)
+    return {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance=0.5):
+    """Compares results with a baseline.
+
+    Args:
+        results (dict): Results document from run_suite().
+        baseline (dict): Results document to compare against.
+        tolerance (float, optional): Allowed slowdown as a fraction, e.g. 0.5
+            lets a case take up to 1.5 times its baseline. Defaults to 0.5.
+
+    Returns:
+        list of tuple: (name, baseline seconds or None, seconds, status) per
+            case, where status is 'regression', 'faster', 'ok' or 'new'.
+    """
+    rows = []
+    previous = baseline.get("results", {})
+    for name, result in results["results"].items():
+        seconds = result["seconds"]
+        base = previous.get(name, {}).get("seconds")
+        if base is None:
+            status = "new"
+        elif seconds > base * (1 + tolerance):
+            status = "regression"
+        elif seconds < base / (1 + tolerance):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, base, seconds, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sweep and fewer repeats")
+    parser.add_argument("--match", default="", help="only run cases whose name contains this")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against this results file")
+    # Shared CI runners vary by 30% or more between runs, so only larger
+    # slowdowns fail by default
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, help="timed repeats per case (default: 5, or 3 with --quick)")
+    args = parser.parse_args(argv)
+
+    cases = [(name, run) for name, run in build_cases(args.quick) if args.match in name]
+    repeat, min_time = (3, 0.05) if args.quick else (5, 0.1)
+    repeat = args.repeat or repeat
+    results = run_suite(cases, repeat, min_time)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.tolerance)
+    print(f"\n{'case':<40} {'baseline us':>12} {'now us':>12} {'ratio':>7}  status")
+    for name, base, seconds, status in rows:
+        base_us = f"{base * 1e6:.1f}" if base is not None else "-"
+        ratio = f"{seconds / base:.2f}" if base else "-"
+        print(f"{name:<40} {base_us:>12} {seconds * 1e6:>12.1f} {ratio:>7}  {status}")
+    regressions = [row[0] for row in rows if row[3] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+"""Columnar binary schedule files for the StudyBuddy Scheduler.
+
+This script defines the compact columnar file format, which stores the
+columns of a ScheduleBlocks as they are held in memory, and the
+conversion between ScheduleBlocks and Arrow tables used by the Arrow IPC
+and Parquet formats when the optional 'pyarrow' package is installed.
+
+A columns file is laid out as:
+
+- a 20-byte header: the magic b'SBCOL', the format version, the type code
+  of the duration column, the number of rows and the length of the name
+  table;
+- the name table, a UTF-8 JSON list of [course names, block type names];
+- the date ordinal (int32), course id (uint32), duration (int16, or int64
+  for durations that don't fit) and block type (uint8) columns, in that
+  order and little-endian.
+
+The name table and every column are padded to a multiple of 8 bytes, so
+each column starts aligned and can be read in place from a memory map.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from datetime import date
+from io import BytesIO
+
+from scheduler.blocks import ScheduleBlocks
+
+MAGIC = b"SBCOL"
+VERSION = 1
+
+# Magic, version, duration type code, padding, rows, name table bytes
+HEADER = struct.Struct("<5sBcxQI")
+ALIGNMENT = 8
+
+# Column attribute and array type code, in file order; None is the
+# duration type code given in the header
+COLUMNS = (("ordinals", "i"), ("course_ids", "I"), ("durations", None), ("block_types", "B"))
+DURATION_TYPECODES = ("h", "q")
+
+# Rows per Arrow record batch or Parquet row group
+ARROW_BATCH_ROWS = 65536
+
+# Arrow stores dates as days since the Unix epoch
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _padding(size):
+    """Returns the bytes needed to pad size to the next ALIGNMENT boundary."""
+    return -size % ALIGNMENT
+
+
+def _little_endian(column):
+    """Returns a column's bytes in little-endian order."""
+    if sys.byteorder == "big" and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return memoryview(column).cast("B")
+
+
+def parse_header(data):
+    """Parses the header at the start of a columns file.
+
+    Args:
+        data (bytes-like): The first HEADER.size bytes of the file.
+
+    Returns:
+        tuple: The number of rows, the duration type code and the length
+            of the name table in bytes.
+
+    Raises:
+        ValueError: If the data isn't the header of a columns file this
+            version can read.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Not a StudyBuddy columns file: too short")
+    magic, version, duration_typecode, rows, names_length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a StudyBuddy columns file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported StudyBuddy columns file version {version}")
+    duration_typecode = duration_typecode.decode("latin-1")
+    if duration_typecode not in DURATION_TYPECODES:
+        raise ValueError(f"Unsupported duration type code {duration_typecode!r} in StudyBuddy columns file")
+    return rows, duration_typecode, names_length
+
+
+def parse_names(data):
+    """Parses the name table of a columns file.
+
+    Args:
+        data (bytes-like): The name table, without its padding.
+
+    Returns:
+        tuple: The list of course names and the list of block type names.
+    """
+    course_names, block_names = json.loads(bytes(data).decode("utf-8"))
+    return course_names, block_names
+
+
+def column_offsets(rows, duration_typecode, names_length):
+    """Works out where each column starts in a columns file.
+
+    Args:
+        rows (int): Number of rows.
+        duration_typecode (str): Array type code of the duration column.
+        names_length (int): Length of the name table in bytes.
+
+    Returns:
+        dict: (byte offset, array type code) per column attribute name.
+    """
+    offset = HEADER.size + names_length + _padding(HEADER.size + names_length)
+    offsets = {}
+    for name, typecode in COLUMNS:
+        typecode = typecode or duration_typecode
+        offsets[name] = (offset, typecode)
+        size = rows * array(typecode).itemsize
+        offset += size + _padding(size)
+    return offsets
+
+
+def _duration_column(durations):
+    """Returns a duration column with one of the DURATION_TYPECODES.
+
+    Signed integer columns of other type codes, such as 'l', are converted
+    to 'h' if they are no wider than 16 bits and to 'q' otherwise.
+
+    Raises:
+        ValueError: If the column doesn't hold signed integers.
+    """
+    typecode = durations.typecode
+    if typecode in DURATION_TYPECODES:
+        return durations
+    if typecode not in "bhilq":
+        raise ValueError(f"Unsupported duration type code {typecode!r}: durations must be signed integers")
+    return array("h" if durations.itemsize <= 2 else "q", durations)
+
+
+def iter_columns_file(blocks):
+    """Writes blocks as a columns file, one piece at a time.
+
+    The columns are written straight from the blocks' arrays, without
+    building a row at a time.
+
+    Args:
+        blocks (ScheduleBlocks): The blocks.
+
+    Yields:
+        bytes or memoryview: Consecutive pieces of the file.
+
+    Raises:
+        ValueError: If the duration column doesn't hold signed integers.
+    """
+    durations = _duration_column(blocks.durations)
+    names = json.dumps([blocks.course_names, blocks.block_names], separators=(",", ":")).encode("utf-8")
+    header = HEADER.pack(MAGIC, VERSION, durations.typecode.encode("ascii"), len(blocks), len(names))
+    yield header + names + bytes(_padding(len(header) + len(names)))
+    for name, _ in COLUMNS:
+        column = _little_endian(durations if name == "durations" else getattr(blocks, name))
+        yield column
+        if _padding(len(column)):
+            yield bytes(_padding(len(column)))
+
+
+def read_columns_file(stream):
+    """Reads a columns file into memory.
+
+    Args:
+        stream (binary file): The file, positioned at its start.
+
+    Returns:
+        ScheduleBlocks: The blocks.
+
+    Raises:
+        ValueError: If the stream isn't a columns file or is truncated.
+    """
+    rows, duration_typecode, names_length = parse_header(stream.read(HEADER.size))
+    course_names, block_names = parse_names(stream.read(names_length))
+    stream.read(_padding(HEADER.size + names_length))
+    columns = {}
+    for name, typecode in COLUMNS:
+        column = array(typecode or duration_typecode)
+        try:
+            column.fromfile(stream, rows)
+        except EOFError:
+            raise ValueError("StudyBuddy columns file is truncated") from None
+        if sys.byteorder == "big":
+            column.byteswap()
+        stream.read(_padding(rows * column.itemsize))
+        columns[name] = column
+    return ScheduleBlocks.from_columns(
+        course_names, columns["course_ids"], columns["ordinals"], columns["durations"],
+        block_names=block_names, block_types=columns["block_types"],
+    )
+
+
+def to_arrow_table(blocks):
+    """Converts blocks to an Arrow table.
+
+    Course and block type names become dictionary-encoded string columns
+    that reuse the blocks' ids, and dates become date32 columns.
+
+    Args:
+        blocks (ScheduleBlocks): The blocks.
+
+    Returns:
+        pyarrow.Table: Columns 'course', 'block', 'duration' and 'date'.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    def dictionary(ids, names):
+        indices = pa.array(np.frombuffer(ids, dtype=ids.typecode).astype(np.int32))
+        return pa.DictionaryArray.from_arrays(indices, pa.array(names, pa.string()))
+
+    days = np.frombuffer(blocks.ordinals, dtype=np.int32) - np.int32(EPOCH_ORDINAL)
+    return pa.table({
+        "course": dictionary(blocks.course_ids, blocks.course_names),
+        "block": dictionary(blocks.block_types, blocks.block_names),
+        "duration": pa.array(np.frombuffer(blocks.durations, dtype=blocks.durations.typecode)),
+        "date": pa.array(days, pa.date32()),
+    })
+
+
+def from_arrow_table(table):
+    """Converts an Arrow table with schedule columns to blocks.
+
+    Args:
+        table (pyarrow.Table): Table with 'course', 'block', 'duration' and
+            'date' columns, as written by to_arrow_table() or any table
+            with string and date columns of those names.
+
+    Returns:
+        ScheduleBlocks: The blocks.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    def dictionary(name, typecode):
+        column = table.column(name).combine_chunks()
+        if not pa.types.is_dictionary(column.type):
+            column = column.dictionary_encode()
+        indices = column.indices.to_numpy(zero_copy_only=False).astype(typecode)
+        return column.dictionary.to_pylist(), array(typecode, indices.tobytes())
+
+    course_names, course_ids = dictionary("course", "I")
+    block_names, block_types = dictionary("block", "B")
+    days = table.column("date").combine_chunks().cast(pa.int32()).to_numpy(zero_copy_only=False)
+    ordinals = array("i", (days + np.int32(EPOCH_ORDINAL)).astype(np.int32).tobytes())
+    durations = table.column("duration").combine_chunks().to_numpy(zero_copy_only=False)
+    typecode = "h" if durations.size == 0 or (durations.min() >= -2**15 and durations.max() < 2**15) else "q"
+    return ScheduleBlocks.from_columns(
+        course_names, course_ids, ordinals, array(typecode, durations.astype(typecode).tobytes()),
+        block_names=block_names, block_types=block_types,
+    )
+
+
+def _drain(sink):
+    """Returns and clears what was written to a BytesIO."""
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def iter_arrow_stream(blocks):
+    """Writes blocks in the Arrow IPC streaming format, a batch at a time.
+
+    Args:
+        blocks (ScheduleBlocks): The blocks.
+
+    Yields:
+        bytes: Consecutive pieces of the stream.
+    """
+    import pyarrow as pa
+
+    table = to_arrow_table(blocks)
+    sink = BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=ARROW_BATCH_ROWS):
+            writer.write_batch(batch)
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+def iter_parquet(blocks):
+    """Writes blocks as a Parquet file, a row group at a time.
+
+    Args:
+        blocks (ScheduleBlocks): The blocks.
+
+    Yields:
+        bytes: Consecutive pieces of the file.
+    """
+    import pyarrow.parquet as pq
+
+    table = to_arrow_table(blocks)
+    sink = BytesIO()
+    with pq.ParquetWriter(sink, table.schema) as writer:
+        for start in range(0, len(blocks), ARROW_BATCH_ROWS):
+            writer.write_table(table.slice(start, ARROW_BATCH_ROWS))
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+def read_arrow_stream(stream):
+    """Reads blocks from the Arrow IPC streaming format.
+
+    Args:
+        stream (binary file): The stream.
+
+    Returns:
+        ScheduleBlocks: The blocks.
+    """
+    import pyarrow as pa
+
+    return from_arrow_table(pa.ipc.open_stream(stream).read_all())
+
+
+def read_parquet(stream):
+    """Reads blocks from a Parquet file.
+
+    Args:
+        stream (binary file): The file; it must be seekable.
+
+    Returns:
+        ScheduleBlocks: The blocks.
+    """
+    import pyarrow.parquet as pq
+
+    return from_arrow_table(pq.read_table(stream))
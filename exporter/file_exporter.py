@@ -1,14 +1,459 @@
 """File exporter for the StudyBuddy Scheduler.
 
-This script defines the FileExporter class, which exports schedules
-to CSV and plain text formats.
+This script defines the FileExporter class, which exports schedules to
+CSV, plain text, JSON Lines, iCalendar and columnar binary formats, either
+as one string or as a stream of chunks for large schedules, and loads the
+exported files back.
+
+Formats live in a registry on FileExporter, so another module can add
+one with FileExporter.register_format(). The columnar formats are:
+
+- 'columns', a compact file of the schedule's typed columns that needs
+  only the standard library (see exporter.columnar);
+- 'arrow' (Arrow IPC stream) and 'parquet', when the optional 'pyarrow'
+  package is installed.
 """
 
 import csv
+import importlib.util
+import itertools
+import json
+import re
+import uuid
+from datetime import datetime, timezone
 from io import StringIO
 
+from exporter import columnar
+from monitoring.metrics import metrics, timed_iter
+from scheduler.blocks import ScheduleBlocks
+
+CSV_FIELDS = ["course", "block", "duration", "date"]
+
+EXPORT_SECONDS = metrics.histogram(
+    "studybuddy_export_seconds", "Time spent rendering an export, excluding time spent sending it.", ("format",)
+)
+
+# Lines decoded at a time when loading JSON Lines
+JSONL_BATCH_LINES = 1000
+
+# Calendar events of a day are laid out back to back from this time
+ICS_DAY_START_MINUTES = 8 * 60
+ICS_PRODID = "-//StudyBuddy//Scheduler//EN"
+# Longest iCalendar content line in octets, before folding
+ICS_LINE_OCTETS = 75
+
+
+class ExportFormat:
+    """Describes one export format."""
+
+    def __init__(self, name, writer, loader=None, extension=None, media_type="application/octet-stream",
+                 binary=False, requires=None, description=""):
+        """Initializes the ExportFormat.
+
+        Args:
+            name (str): Name the format is selected by.
+            writer (callable): Takes a FileExporter and a schedule and
+                returns an iterable of str chunks, or bytes-like chunks for
+                binary formats.
+            loader (callable, optional): Takes an open file, text or binary
+                to match the format, and returns the ScheduleBlocks in it.
+                Defaults to None, for formats that can't be loaded.
+            extension (str, optional): File name extension. Defaults to name.
+            media_type (str, optional): MIME type. Defaults to
+                'application/octet-stream'.
+            binary (bool, optional): Whether the format is binary.
+                Defaults to False.
+            requires (str, optional): Optional package the format needs.
+                Defaults to None.
+            description (str, optional): Human-readable name. Defaults to "".
+        """
+        self.name = name
+        self.writer = writer
+        self.loader = loader
+        self.extension = extension or name
+        self.media_type = media_type
+        self.binary = binary
+        self.requires = requires
+        self.description = description or name
+
+    @property
+    def available(self):
+        """bool: Whether the packages the format needs are installed."""
+        return self.requires is None or importlib.util.find_spec(self.requires) is not None
+
+    def open(self, filename, mode):
+        """Opens a file for this format.
+
+        Args:
+            filename (str): Path of the file.
+            mode (str): 'r' or 'w'.
+
+        Returns:
+            file: The file, binary or text to match the format.
+        """
+        if self.binary:
+            return open(filename, mode + "b")
+        # newline="" keeps the CRLF line endings of CSV and iCalendar
+        return open(filename, mode, encoding="utf-8", newline="")
+
+
+def _chunk_lines(lines, chunk_size):
+    """Joins lines into chunks of chunk_size lines, each line ending in a newline."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == chunk_size:
+            batch.append("")
+            yield "\n".join(batch)
+            batch = []
+    if batch:
+        batch.append("")
+        yield "\n".join(batch)
+
+
+def _as_blocks(schedule):
+    """Returns the schedule as ScheduleBlocks, converting block dicts."""
+    return schedule if isinstance(schedule, ScheduleBlocks) else ScheduleBlocks.from_dicts(schedule)
+
+
 class FileExporter:
-    """Exports schedules to CSV or plain text formats."""
+    """Exports schedules to registered file formats and loads them back."""
+
+    _formats = {}
+
+    def __init__(self, chunk_size=1000):
+        """Initializes the FileExporter.
+
+        Args:
+            chunk_size (int, optional): Number of schedule blocks per chunk
+                yielded by the streaming exporters. Defaults to 1000.
+        """
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def register_format(cls, name, writer, loader=None, **metadata):
+        """Registers an export format.
+
+        Args:
+            name (str): Name the format is selected by.
+            writer (callable): Takes a FileExporter and a schedule and
+                returns an iterable of chunks.
+            loader (callable, optional): Takes an open file and returns the
+                ScheduleBlocks in it. Defaults to None.
+            **metadata: Extension, media type, binary flag, required package
+                and description, see ExportFormat.
+
+        Returns:
+            ExportFormat: The registered format.
+        """
+        spec = cls._formats[name] = ExportFormat(name, writer, loader, **metadata)
+        return spec
+
+    @classmethod
+    def get_format(cls, name):
+        """Looks up a registered format.
+
+        Args:
+            name (str): Format name.
+
+        Returns:
+            ExportFormat: The format.
+
+        Raises:
+            ValueError: If no format is registered under the name.
+        """
+        spec = cls._formats.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown export format: {name}")
+        return spec
+
+    @classmethod
+    def format_names(cls, available_only=True):
+        """Lists the registered format names.
+
+        Args:
+            available_only (bool, optional): Leave out formats whose optional
+                packages aren't installed. Defaults to True.
+
+        Returns:
+            list of str: Format names, in registration order.
+        """
+        return [name for name, spec in cls._formats.items() if spec.available or not available_only]
+
+    @timed_iter(EXPORT_SECONDS, ("csv",))
+    def iter_csv(self, schedule):
+        """Exports the schedule to CSV format as a stream of chunks.
+
+        Only one chunk of rows is held in memory at a time, so memory use
+        does not grow with the length of the schedule.
+
+        Args:
+            schedule (iterable of dict or ScheduleBlocks): The schedule to
+                export, where each dict contains 'course', 'block',
+                'duration', and 'date' keys.
+
+        Yields:
+            str: Consecutive pieces of the CSV content, starting with the header.
+        """
+        buffer = StringIO()
+        if isinstance(schedule, ScheduleBlocks):
+            # Write straight from the columns without building block dicts
+            writer = csv.writer(buffer)
+            writer.writerow(CSV_FIELDS)
+            entries = schedule.iter_rows()
+        else:
+            writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            entries = schedule
+        rows = 0
+        for entry in entries:
+            writer.writerow(entry)
+            rows += 1
+            if rows == self.chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                rows = 0
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @timed_iter(EXPORT_SECONDS, ("txt",))
+    def iter_txt(self, schedule):
+        """Exports the schedule to plain text format as a stream of chunks.
+
+        Args:
+            schedule (iterable of dict or ScheduleBlocks): The schedule to
+                export, where each dict contains 'course', 'block',
+                'duration', and 'date' keys.
+
+        Yields:
+            str: Consecutive pieces of the plain text content.
+        """
+        if isinstance(schedule, ScheduleBlocks):
+            entries = (
+                f"{day} | {course} | {block} | {duration} min"
+                for course, block, duration, day in schedule.iter_rows()
+            )
+        else:
+            entries = (
+                f"{entry['date']} | {entry['course']} | {entry['block']} | {entry['duration']} min"
+                for entry in schedule
+            )
+        lines = []
+        separator = ""
+        for line in entries:
+            lines.append(line)
+            if len(lines) == self.chunk_size:
+                yield separator + "\n".join(lines)
+                lines = []
+                separator = "\n"
+        if lines:
+            yield separator + "\n".join(lines)
+
+    @timed_iter(EXPORT_SECONDS, ("jsonl",))
+    def iter_jsonl(self, schedule):
+        """Exports the schedule to JSON Lines format as a stream of chunks.
+
+        Each block is one JSON object per line with 'course', 'block',
+        'duration' and 'date' keys.
+
+        Args:
+            schedule (iterable of dict or ScheduleBlocks): The schedule to
+                export, where each dict contains 'course', 'block',
+                'duration', and 'date' keys.
+
+        Yields:
+            str: Consecutive pieces of the JSON Lines content.
+        """
+        if isinstance(schedule, ScheduleBlocks):
+            # Encode each name once instead of once per block
+            courses = [json.dumps(name) for name in schedule.course_names]
+            blocks = [json.dumps(name) for name in schedule.block_names]
+            date_string = schedule.date_string
+            lines = (
+                f'{{"course":{courses[course_id]},"block":{blocks[block_type]},'
+                f'"duration":{duration},"date":"{date_string(ordinal)}"}}'
+                for course_id, block_type, duration, ordinal in zip(
+                    schedule.course_ids, schedule.block_types, schedule.durations, schedule.ordinals
+                )
+            )
+        else:
+            lines = (
+                json.dumps({field: entry[field] for field in CSV_FIELDS}, separators=(",", ":"))
+                for entry in schedule
+            )
+        yield from _chunk_lines(lines, self.chunk_size)
+
+    @timed_iter(EXPORT_SECONDS, ("ics",))
+    def iter_ics(self, schedule):
+        """Exports the schedule to iCalendar format as a stream of chunks.
+
+        Each block becomes an event titled with its course and categorized
+        by its block type. Blocks only have a date, so a day's events are
+        laid out back to back from 8:00, in floating local time.
+
+        Args:
+            schedule (iterable of dict or ScheduleBlocks): The schedule to
+                export, where each dict contains 'course', 'block',
+                'duration', and 'date' keys.
+
+        Yields:
+            str: Consecutive pieces of the iCalendar content.
+        """
+        if isinstance(schedule, ScheduleBlocks):
+            rows = schedule.iter_rows()
+        else:
+            rows = ((entry["course"], entry["block"], entry["duration"], entry["date"]) for entry in schedule)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        # Unique per export, so importing two schedules doesn't merge them
+        uid = uuid.uuid4().hex
+        yield f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{ICS_PRODID}\r\nCALSCALE:GREGORIAN\r\n"
+        summaries = {}
+        categories = {}
+        next_start = {}
+        events = []
+        for index, (course, block, duration, day) in enumerate(rows):
+            day = str(day).replace("-", "")
+            start = next_start.get(day, ICS_DAY_START_MINUTES)
+            next_start[day] = start + duration
+            # Keep the event on its own day, overlapping if the day is full
+            start = max(0, min(start, 24 * 60 - duration))
+            summary = summaries.get(course)
+            if summary is None:
+                summary = summaries[course] = _ics_line("SUMMARY", course)
+            category = categories.get(block)
+            if category is None:
+                category = categories[block] = _ics_line("CATEGORIES", block)
+            events.append(
+                f"BEGIN:VEVENT\r\nUID:{index}-{uid}@studybuddy\r\nDTSTAMP:{stamp}\r\n"
+                f"DTSTART:{day}T{start // 60:02d}{start % 60:02d}00\r\nDURATION:PT{duration}M\r\n"
+                f"{summary}{category}END:VEVENT\r\n"
+            )
+            if len(events) == self.chunk_size:
+                yield "".join(events)
+                events = []
+        events.append("END:VCALENDAR\r\n")
+        yield "".join(events)
+
+    @timed_iter(EXPORT_SECONDS, ("columns",))
+    def iter_columns(self, schedule):
+        """Exports the schedule to the compact columnar binary format.
+
+        Block dicts are converted to ScheduleBlocks first; a ScheduleBlocks
+        is written straight from its column arrays.
+
+        Args:
+            schedule (iterable of dict or ScheduleBlocks): The schedule to
+                export, where each dict contains 'course', 'block',
+                'duration', and 'date' keys.
+
+        Yields:
+            bytes-like: Consecutive pieces of the file.
+        """
+        yield from columnar.iter_columns_file(_as_blocks(schedule))
+
+    @timed_iter(EXPORT_SECONDS, ("arrow",))
+    def iter_arrow(self, schedule):
+        """Exports the schedule to the Arrow IPC streaming format.
+
+        Needs the optional 'pyarrow' package.
+
+        Args:
+            schedule (iterable of dict or ScheduleBlocks): The schedule to
+                export, where each dict contains 'course', 'block',
+                'duration', and 'date' keys.
+
+        Yields:
+            bytes: Consecutive pieces of the stream, one record batch each.
+        """
+        yield from columnar.iter_arrow_stream(_as_blocks(schedule))
+
+    @timed_iter(EXPORT_SECONDS, ("parquet",))
+    def iter_parquet(self, schedule):
+        """Exports the schedule to Parquet format.
+
+        Needs the optional 'pyarrow' package.
+
+        Args:
+            schedule (iterable of dict or ScheduleBlocks): The schedule to
+                export, where each dict contains 'course', 'block',
+                'duration', and 'date' keys.
+
+        Yields:
+            bytes: Consecutive pieces of the file, one row group each.
+        """
+        yield from columnar.iter_parquet(_as_blocks(schedule))
+
+    def iter_export(self, name, schedule):
+        """Exports the schedule to a registered format as a stream of chunks.
+
+        Args:
+            name (str): Format name, e.g. 'csv' or 'columns'.
+            schedule (iterable of dict or ScheduleBlocks): The schedule to
+                export.
+
+        Returns:
+            iterable: Consecutive pieces of the content, str for text formats
+                and bytes-like for binary ones.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        return self.get_format(name).writer(self, schedule)
+
+    def export(self, name, schedule, filename=None):
+        """Exports the schedule to a registered format.
+
+        With a filename, the export is streamed to the file chunk by chunk
+        instead of being built in memory.
+
+        Args:
+            name (str): Format name, e.g. 'csv' or 'columns'.
+            schedule (iterable of dict or ScheduleBlocks): The schedule to
+                export.
+            filename (str or file, optional): Path to save the export to, or
+                an open file to write it to, binary for binary formats.
+                Defaults to None.
+
+        Returns:
+            str or bytes or file: The content, or filename if one was given.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        spec = self.get_format(name)
+        chunks = spec.writer(self, schedule)
+        if filename is None:
+            return (b"" if spec.binary else "").join(chunks)
+        if hasattr(filename, "write"):
+            filename.writelines(chunks)
+            return filename
+        with spec.open(filename, "w") as f:
+            f.writelines(chunks)
+        return filename
+
+    def load(self, name, source):
+        """Loads a schedule from an exported file.
+
+        Args:
+            name (str): Format name, e.g. 'csv' or 'columns'.
+            source (str or file): Path of the file, or an open file, binary
+                for binary formats.
+
+        Returns:
+            ScheduleBlocks: The schedule.
+
+        Raises:
+            ValueError: If the format is unknown or can't be loaded, or the
+                file isn't valid.
+        """
+        spec = self.get_format(name)
+        if spec.loader is None:
+            raise ValueError(f"Export format '{name}' can't be loaded")
+        if hasattr(source, "read"):
+            return spec.loader(source)
+        with spec.open(source, "r") as f:
+            return spec.loader(f)
 
     def export_to_csv(self, schedule, filename=None):
         """Exports the schedule to a CSV format.
@@ -19,14 +464,10 @@ class FileExporter:
             filename (str, optional): Filename to save the CSV. Defaults to None.
 
         Returns:
-            str: The CSV content as a string.
+            str: The CSV content as a string, or filename if one was given.
         """
-        output = StringIO()
-        writer = csv.DictWriter(output, fieldnames=["course", "block", "duration", "date"])
-        writer.writeheader()
-        writer.writerows(schedule)
-        return output.getvalue()
-    
+        return self.export("csv", schedule, filename)
+
     def export_to_txt(self, schedule, filename=None):
         """Exports the schedule to a plain text format.
 
@@ -36,10 +477,242 @@ class FileExporter:
             filename (str, optional): Filename to save the text file. Defaults to None.
 
         Returns:
-            str: The plain text content as a string.
+            str: The plain text content as a string, or filename if one was given.
+        """
+        return self.export("txt", schedule, filename)
+
+    def export_to_jsonl(self, schedule, filename=None):
+        """Exports the schedule to a JSON Lines format.
+
+        Args:
+            schedule (list of dict): The schedule to export, where each dict
+                contains 'course', 'block', 'duration', and 'date' keys.
+            filename (str, optional): Filename to save the JSON Lines file.
+                Defaults to None.
+
+        Returns:
+            str: The JSON Lines content as a string, or filename if one was given.
+        """
+        return self.export("jsonl", schedule, filename)
+
+    def export_to_ics(self, schedule, filename=None):
+        """Exports the schedule to an iCalendar format.
+
+        Args:
+            schedule (list of dict): The schedule to export, where each dict
+                contains 'course', 'block', 'duration', and 'date' keys.
+            filename (str, optional): Filename to save the .ics file.
+                Defaults to None.
+
+        Returns:
+            str: The iCalendar content as a string, or filename if one was given.
         """
-        lines = [
-            f"{entry['date']} | {entry['course']} | {entry['block']} | {entry['duration']} min"
-            for entry in schedule
-        ]
-        return "\n".join(lines)
\ No newline at end of file
+        return self.export("ics", schedule, filename)
+
+    def export_to_columnar(self, schedule, filename=None):
+        """Exports the schedule to the best available columnar binary format.
+
+        That is Arrow IPC when pyarrow is installed and the 'columns' format
+        otherwise; see columnar_format().
+
+        Args:
+            schedule (list of dict): The schedule to export, where each dict
+                contains 'course', 'block', 'duration', and 'date' keys.
+            filename (str, optional): Filename to save the file. Defaults to None.
+
+        Returns:
+            bytes: The file content, or filename if one was given.
+        """
+        return self.export(self.columnar_format(), schedule, filename)
+
+    @classmethod
+    def columnar_format(cls):
+        """Picks the columnar binary format to use.
+
+        Returns:
+            str: 'arrow' when pyarrow is installed, otherwise 'columns'.
+        """
+        return "arrow" if cls.get_format("arrow").available else "columns"
+
+
+def _ics_escape(text):
+    """Escapes a value for an iCalendar TEXT property."""
+    return (
+        str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def _ics_line(name, value):
+    """Formats an iCalendar content line, folding it at ICS_LINE_OCTETS octets.
+
+    Returns:
+        str: The line, ending in CRLF.
+    """
+    line = f"{name}:{_ics_escape(value)}"
+    if len(line.encode("utf-8")) <= ICS_LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    part = ""
+    size = 0
+    limit = ICS_LINE_OCTETS
+    for char in line:
+        octets = len(char.encode("utf-8"))
+        if size + octets > limit:
+            parts.append(part)
+            # Continuation lines start with a space, which counts
+            part, size, limit = "", 0, ICS_LINE_OCTETS - 1
+        part += char
+        size += octets
+    parts.append(part)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+_ICS_ESCAPES = re.compile(r"\\([\\;,nN])")
+_ICS_LIST_SEPARATOR = re.compile(r"(?<!\\),")
+_ICS_DURATION = re.compile(r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+def _ics_unescape(text):
+    """Reverses _ics_escape()."""
+    if "\\" not in text:
+        return text
+    return _ICS_ESCAPES.sub(lambda match: "\n" if match.group(1) in "nN" else match.group(1), text)
+
+
+def _ics_minutes(duration):
+    """Converts an iCalendar DURATION value to whole minutes."""
+    match = _ICS_DURATION.match(duration)
+    if match is None:
+        raise ValueError(f"Invalid iCalendar duration: {duration}")
+    weeks, days, hours, minutes, seconds = (int(value or 0) for value in match.groups()[1:])
+    return (((weeks * 7 + days) * 24 + hours) * 60 + minutes) + seconds // 60
+
+
+def _load_csv(stream):
+    """Loads a CSV export."""
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return ScheduleBlocks()
+    try:
+        course, block, duration, day = (header.index(field) for field in CSV_FIELDS)
+    except ValueError:
+        raise ValueError(f"CSV header must include {', '.join(CSV_FIELDS)}") from None
+    blocks = ScheduleBlocks()
+    blocks.extend_rows((row[course], row[block], int(row[duration]), row[day]) for row in reader if row)
+    return blocks
+
+
+def _load_txt(stream):
+    """Loads a plain text export.
+
+    Course names are split off from the right, so they may contain ' | '.
+    """
+    def rows():
+        for line in stream:
+            line = line.rstrip("\r\n")
+            if line:
+                day, _, rest = line.partition(" | ")
+                course, block, minutes = rest.rsplit(" | ", 2)
+                yield course, block, int(minutes.removesuffix(" min")), day
+
+    blocks = ScheduleBlocks()
+    blocks.extend_rows(rows())
+    return blocks
+
+
+def _load_jsonl(stream):
+    """Loads a JSON Lines export."""
+    def entries():
+        # Decoding a JSON array of many lines is several times faster than
+        # decoding each line on its own
+        lines = (line for line in stream if line.strip())
+        while True:
+            batch = list(itertools.islice(lines, JSONL_BATCH_LINES))
+            if not batch:
+                return
+            yield from json.loads("[" + ",".join(batch) + "]")
+
+    blocks = ScheduleBlocks()
+    blocks.extend_rows((entry["course"], entry["block"], entry["duration"], entry["date"]) for entry in entries())
+    return blocks
+
+
+def _unfold_ics(stream):
+    """Yields the unfolded content lines of an iCalendar file."""
+    line = None
+    for raw in stream:
+        raw = raw.rstrip("\r\n")
+        if raw[:1] in (" ", "\t") and line is not None:
+            line += raw[1:]
+            continue
+        if line is not None:
+            yield line
+        line = raw
+    if line is not None:
+        yield line
+
+
+def _load_ics(stream):
+    """Loads the events of an iCalendar file as blocks.
+
+    Reads the events written by iter_ics(), and events from other
+    calendars that have a DTSTART and a DURATION or DTEND. Events without
+    a category are loaded as study blocks.
+    """
+    def rows():
+        event = None
+        for line in _unfold_ics(stream):
+            if line == "BEGIN:VEVENT":
+                event = {}
+            elif line == "END:VEVENT" and event is not None:
+                start = event["DTSTART"]
+                if "DURATION" in event:
+                    minutes = _ics_minutes(event["DURATION"])
+                else:
+                    minutes = (_ics_datetime(event["DTEND"]) - _ics_datetime(start)).total_seconds() // 60
+                # Only the first category, which is the block type
+                category = _ICS_LIST_SEPARATOR.split(event.get("CATEGORIES", "study"), 1)[0]
+                day = f"{start[:4]}-{start[4:6]}-{start[6:8]}"
+                yield _ics_unescape(event.get("SUMMARY", "")), _ics_unescape(category), int(minutes), day
+                event = None
+            elif event is not None:
+                name, _, value = line.partition(":")
+                event[name.partition(";")[0].upper()] = value
+
+    blocks = ScheduleBlocks()
+    blocks.extend_rows(rows())
+    return blocks
+
+
+def _ics_datetime(value):
+    """Parses an iCalendar DATE or DATE-TIME value, ignoring any time zone."""
+    value = value.rstrip("Z")
+    return datetime.strptime(value, "%Y%m%dT%H%M%S" if "T" in value else "%Y%m%d")
+
+
+FileExporter.register_format(
+    "csv", FileExporter.iter_csv, _load_csv, media_type="text/csv", description="CSV",
+)
+FileExporter.register_format(
+    "txt", FileExporter.iter_txt, _load_txt, media_type="text/plain", description="Plain text",
+)
+FileExporter.register_format(
+    "jsonl", FileExporter.iter_jsonl, _load_jsonl, media_type="application/jsonl", description="JSON Lines",
+)
+FileExporter.register_format(
+    "ics", FileExporter.iter_ics, _load_ics, media_type="text/calendar", description="iCalendar",
+)
+FileExporter.register_format(
+    "columns", FileExporter.iter_columns, columnar.read_columns_file, extension="sbc",
+    binary=True, description="StudyBuddy columns",
+)
+FileExporter.register_format(
+    "arrow", FileExporter.iter_arrow, columnar.read_arrow_stream,
+    extension="arrows", media_type="application/vnd.apache.arrow.stream", binary=True,
+    requires="pyarrow", description="Arrow IPC stream",
+)
+FileExporter.register_format(
+    "parquet", FileExporter.iter_parquet, columnar.read_parquet,
+    media_type="application/vnd.apache.parquet", binary=True, requires="pyarrow", description="Parquet",
+)
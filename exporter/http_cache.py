@@ -0,0 +1,144 @@
+"""HTTP caching and compression helpers for the StudyBuddy Scheduler.
+
+This script defines the helpers the download endpoint uses to answer
+repeat downloads cheaply: strong ETags derived from the schedule's
+content token, If-None-Match matching for 304 responses, and gzip or
+brotli content negotiation with one-shot and streaming compressors.
+
+Brotli is used when the optional 'brotli' package is installed; without
+it only gzip is offered.
+"""
+
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip covers every browser
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed, where the headers and
+# CPU would cost more than the bytes saved
+MIN_COMPRESS_BYTES = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Preferred first when the client accepts several equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def strong_etag(token, filetype, encoding=None):
+    """Builds the ETag of one representation of a stored schedule's export.
+
+    The token already identifies the schedule's content, so the tag is
+    known without rendering the export. Each content coding is a different
+    representation and gets its own tag.
+
+    Args:
+        token (str): The schedule's download token.
+        filetype (str): The export format, e.g. 'csv'.
+        encoding (str, optional): 'gzip' or 'br'. Defaults to identity.
+
+    Returns:
+        str: A quoted strong ETag.
+    """
+    suffix = f".{encoding}" if encoding else ""
+    return f'"{token}.{filetype}{suffix}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Checks an If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+
+    Args:
+        if_none_match (str or None): The request header.
+        etag (str): The current representation's ETag.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be sent.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def choose_encoding(accept_encoding):
+    """Picks the content coding for a response from Accept-Encoding.
+
+    Args:
+        accept_encoding (str or None): The request header.
+
+    Returns:
+        str or None: 'br' or 'gzip', or None to send the body as is.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data, encoding):
+    """Compresses a whole body.
+
+    Args:
+        data (bytes): The body.
+        encoding (str): 'gzip' or 'br'.
+
+    Returns:
+        bytes: The compressed body.
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    # mtime=0 makes equal bodies compress to equal bytes, matching the ETag
+    return gzip.compress(data, GZIP_LEVEL, mtime=0)
+
+
+def iter_compressed(chunks, encoding):
+    """Compresses a stream of text chunks as they are produced.
+
+    Args:
+        chunks (iterable of str): The body, in pieces.
+        encoding (str): 'gzip' or 'br'.
+
+    Yields:
+        bytes: Pieces of the compressed body.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        compress_chunk, finish = compressor.process, compressor.finish
+    else:
+        # wbits=31 writes the gzip header and trailer
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        compress_chunk, finish = compressor.compress, compressor.flush
+    for chunk in chunks:
+        data = compress_chunk(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield finish()
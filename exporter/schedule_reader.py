@@ -0,0 +1,456 @@
+"""Memory-mapped reader for exported schedule files.
+
+This script defines the MappedSchedule class, which answers queries over a
+schedule exported in the 'columns' format (see exporter.columnar) without
+loading it: the file is memory-mapped and its columns are read in place
+as NumPy arrays, so a cohort export larger than RAM can be scanned a
+chunk at a time.
+
+Range and per-day queries use a sidecar date index, written next to the
+file as '<file>.idx' the first time it's opened and rebuilt when the file
+changes. The index holds the row numbers sorted by date, keeping the
+original order within a day, and where each day starts among them, so
+the blocks of any date range are one contiguous run of row numbers. It is
+laid out as:
+
+- a 48-byte header: the magic b'SBIDX', the format version, the type code
+  of the row numbers, the number of rows and of days, the first date's
+  ordinal, and the size and modification time of the indexed file;
+- the start of each day from the first date to the last, plus the end, as
+  uint64;
+- the row numbers, as uint32 (uint64 for more than 2**32 rows).
+
+All integers are little-endian.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from datetime import date
+
+import numpy as np
+
+from exporter import columnar
+from scheduler.blocks import BLOCK_TYPES, STUDY, ScheduleBlocks
+from scheduler.utils import parse_date
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"SBIDX"
+INDEX_VERSION = 1
+
+# Magic, version, row number type code, padding, rows, days, first date
+# ordinal, indexed file size, indexed file modification time in ns
+INDEX_HEADER = struct.Struct("<5sBcxQQqQQ")
+
+# Rows processed at a time, which bounds the memory a query uses
+CHUNK_ROWS = 1 << 20
+
+# Only study time counts toward completion, as in ProgressIndex
+STUDY_BLOCK = BLOCK_TYPES[STUDY]
+
+# Column dtypes per array type code, as stored in the file
+_DTYPES = {"i": "<i4", "I": "<u4", "h": "<i2", "q": "<i8", "B": "u1", "Q": "<u8"}
+
+# Array type code per column dtype. dtype.char can't be used instead: it
+# names int64 'l' on platforms where that is the C long.
+_TYPECODES = {np.dtype(dtype): typecode for typecode, dtype in _DTYPES.items()}
+
+
+def index_path(path):
+    """Returns the path of a schedule file's sidecar date index.
+
+    Args:
+        path (str): Path of the schedule file.
+
+    Returns:
+        str: Path of its index.
+    """
+    return path + INDEX_SUFFIX
+
+
+def _ordinal(day):
+    """Converts a 'YYYY-MM-DD' string or datetime.date to a date ordinal."""
+    return parse_date(day).toordinal()
+
+
+class MappedSchedule:
+    """A memory-mapped schedule file in the 'columns' format.
+
+    Query results are small Python values; the blocks themselves are only
+    read a chunk at a time. Use it as a context manager, or call close(),
+    to release the file.
+    """
+
+    def __init__(self, path, index=None, chunk_rows=CHUNK_ROWS):
+        """Opens a schedule file, building its date index if needed.
+
+        Args:
+            path (str): Path of a file exported in the 'columns' format.
+            index (str, optional): Path of the sidecar date index. Defaults
+                to the file's path plus '.idx'.
+            chunk_rows (int, optional): Rows processed at a time. Defaults
+                to CHUNK_ROWS.
+
+        Raises:
+            ValueError: If the file isn't a columns file or is truncated.
+        """
+        self.path = path
+        self.index_path = index or index_path(path)
+        self.chunk_rows = chunk_rows
+        self._file = open(path, "rb")
+        self._index_file = None
+        self._index_map = None
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map_columns()
+            self._open_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def _map_columns(self):
+        """Reads the header and name table and views each column in place."""
+        data = self._map
+        rows, duration_typecode, names_length = columnar.parse_header(data[:columnar.HEADER.size])
+        start = columnar.HEADER.size
+        self.course_names, self.block_names = columnar.parse_names(data[start:start + names_length])
+        offsets = columnar.column_offsets(rows, duration_typecode, names_length)
+        self.rows = rows
+        self._columns = {}
+        for name, (offset, typecode) in offsets.items():
+            dtype = np.dtype(_DTYPES[typecode])
+            if offset + rows * dtype.itemsize > len(data):
+                raise ValueError("StudyBuddy columns file is truncated")
+            self._columns[name] = np.frombuffer(data, dtype=dtype, count=rows, offset=offset)
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Releases the file and its index."""
+        # Views into the maps must go before the maps can close
+        self._columns = self._starts = self._order = None
+        for handle in (getattr(self, "_map", None), self._index_map, self._index_file, self._file):
+            if handle is not None:
+                handle.close()
+        self._map = self._index_map = self._index_file = None
+
+    def _source_stamp(self):
+        """Returns the size and modification time the index must match."""
+        stat = os.fstat(self._file.fileno())
+        return stat.st_size, stat.st_mtime_ns
+
+    def _open_index(self):
+        """Maps the sidecar index, building it first if it's missing or stale."""
+        if not self._read_index():
+            self._build_index()
+            if not self._read_index():
+                raise ValueError(f"Could not read the date index {self.index_path}")
+
+    def _read_index(self):
+        """Maps the sidecar index if it matches the file.
+
+        Returns:
+            bool: False if the index is missing, invalid or stale.
+        """
+        try:
+            index_file = open(self.index_path, "rb")
+        except FileNotFoundError:
+            return False
+        try:
+            header = index_file.read(INDEX_HEADER.size)
+            if len(header) < INDEX_HEADER.size:
+                index_file.close()
+                return False
+            magic, version, typecode, rows, days, first, size, mtime_ns = INDEX_HEADER.unpack(header)
+            typecode = typecode.decode("ascii")
+            if (magic != INDEX_MAGIC or version != INDEX_VERSION or typecode not in ("I", "Q")
+                    or rows != self.rows or (size, mtime_ns) != self._source_stamp()):
+                index_file.close()
+                return False
+            index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            index_file.close()
+            raise
+        order_dtype = np.dtype(_DTYPES[typecode])
+        order_offset = INDEX_HEADER.size + 8 * (days + 1)
+        if len(index_map) < order_offset + rows * order_dtype.itemsize:
+            index_map.close()
+            index_file.close()
+            return False
+        self._index_file, self._index_map = index_file, index_map
+        self.first_ordinal = first
+        self.days = days
+        self._starts = np.frombuffer(index_map, dtype="<u8", count=days + 1, offset=INDEX_HEADER.size)
+        self._order = np.frombuffer(index_map, dtype=order_dtype, count=rows, offset=order_offset)
+        return True
+
+    def _build_index(self):
+        """Writes the sidecar index with a counting sort by date.
+
+        Three passes over the date column find the date range, count the
+        blocks per day and place each row number, each a chunk at a time;
+        the row numbers are written through a memory map of the new index
+        file, so building it never holds them all in memory.
+        """
+        ordinals = self._columns["ordinals"]
+        first, last = 0, -1
+        for chunk in self._slices(0, self.rows):
+            values = ordinals[chunk]
+            low, high = int(values.min()), int(values.max())
+            first, last = (low, high) if last < first else (min(first, low), max(last, high))
+        days = last - first + 1
+
+        counts = np.zeros(days, dtype=np.int64)
+        for chunk in self._slices(0, self.rows):
+            counts += np.bincount(ordinals[chunk] - first, minlength=days)
+        starts = np.zeros(days + 1, dtype="<u8")
+        np.cumsum(counts, out=starts[1:])
+
+        typecode = "I" if self.rows <= 2**32 else "Q"
+        order_dtype = np.dtype(_DTYPES[typecode])
+        order_offset = INDEX_HEADER.size + starts.nbytes
+        size, mtime_ns = self._source_stamp()
+        temporary = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as f:
+                f.write(INDEX_HEADER.pack(
+                    INDEX_MAGIC, INDEX_VERSION, typecode.encode("ascii"), self.rows, days, first, size, mtime_ns
+                ))
+                f.write(starts.tobytes())
+                f.truncate(order_offset + self.rows * order_dtype.itemsize)
+            if self.rows:
+                order = np.memmap(temporary, dtype=order_dtype, mode="r+", offset=order_offset, shape=(self.rows,))
+                cursor = starts[:-1].astype(np.int64)
+                for chunk in self._slices(0, self.rows):
+                    day = (ordinals[chunk] - first).astype(np.int64)
+                    # Sorting each chunk stably keeps a day's rows in file order
+                    sort = np.argsort(day, kind="stable")
+                    chunk_counts = np.bincount(day, minlength=days)
+                    chunk_starts = np.cumsum(chunk_counts) - chunk_counts
+                    sorted_day = day[sort]
+                    rank = np.arange(len(day)) - chunk_starts[sorted_day]
+                    order[cursor[sorted_day] + rank] = sort + chunk.start
+                    cursor += chunk_counts
+                order.flush()
+                del order
+            os.replace(temporary, self.index_path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def _slices(self, start, stop):
+        """Yields slices covering positions start to stop, a chunk at a time."""
+        for position in range(start, stop, self.chunk_rows):
+            yield slice(position, min(position + self.chunk_rows, stop))
+
+    def _positions(self, start=None, end=None):
+        """Finds the run of date-sorted positions that covers a date range.
+
+        Args:
+            start (str or datetime.date, optional): First date, inclusive.
+                Defaults to the first date in the file.
+            end (str or datetime.date, optional): Last date, inclusive.
+                Defaults to the last date in the file.
+
+        Returns:
+            tuple: The first and one past the last position in the index.
+        """
+        low = 0 if start is None else max(_ordinal(start) - self.first_ordinal, 0)
+        high = self.days - 1 if end is None else min(_ordinal(end) - self.first_ordinal, self.days - 1)
+        if low > high:
+            return 0, 0
+        return int(self._starts[low]), int(self._starts[high + 1])
+
+    def _selections(self, start=None, end=None):
+        """Yields the rows of a date range a chunk at a time.
+
+        Without a range, the file is read in order, one slice at a time.
+        Otherwise the rows come from the date index.
+
+        Yields:
+            slice or numpy.ndarray: Rows to select from the columns.
+        """
+        if start is None and end is None:
+            yield from self._slices(0, self.rows)
+            return
+        low, high = self._positions(start, end)
+        for chunk in self._slices(low, high):
+            yield self._order[chunk]
+
+    def _group(self, keys, size, start, end, block):
+        """Totals minutes and counts blocks per group key.
+
+        Args:
+            keys (callable): Maps a selection of rows to their group keys,
+                integers from 0 to size - 1.
+            size (int): Number of groups.
+            start (str or datetime.date): First date, inclusive, or None.
+            end (str or datetime.date): Last date, inclusive, or None.
+            block (str): Only count blocks of this type, or None for all.
+
+        Returns:
+            tuple: Minutes and block counts per key, as int64 arrays.
+        """
+        minutes = np.zeros(size, dtype=np.int64)
+        counts = np.zeros(size, dtype=np.int64)
+        if block is not None and block not in self.block_names:
+            return minutes, counts
+        code = None if block is None else self.block_names.index(block)
+        durations = self._columns["durations"]
+        block_types = self._columns["block_types"]
+        for selection in self._selections(start, end):
+            group = keys(selection)
+            weights = durations[selection]
+            if code is not None:
+                mask = block_types[selection] == code
+                group, weights = group[mask], weights[mask]
+            minutes += np.bincount(group, weights=weights, minlength=size).astype(np.int64)
+            counts += np.bincount(group, minlength=size)
+        return minutes, counts
+
+    def course_totals(self, start=None, end=None, block=None):
+        """Totals the minutes per course.
+
+        Args:
+            start (str or datetime.date, optional): First date, inclusive.
+                Defaults to the first date in the file.
+            end (str or datetime.date, optional): Last date, inclusive.
+                Defaults to the last date in the file.
+            block (str, optional): Only count blocks of this type, e.g.
+                'study'. Defaults to counting every block.
+
+        Returns:
+            dict: Minutes per course that has matching blocks, in course
+                id order.
+        """
+        course_ids = self._columns["course_ids"]
+        minutes, counts = self._group(
+            lambda selection: course_ids[selection], len(self.course_names), start, end, block
+        )
+        return {self.course_names[i]: int(minutes[i]) for i in np.flatnonzero(counts)}
+
+    def date_totals(self, start=None, end=None, block=None):
+        """Totals the minutes per day.
+
+        Args:
+            start (str or datetime.date, optional): First date, inclusive.
+                Defaults to the first date in the file.
+            end (str or datetime.date, optional): Last date, inclusive.
+                Defaults to the last date in the file.
+            block (str, optional): Only count blocks of this type, e.g.
+                'study'. Defaults to counting every block.
+
+        Returns:
+            dict: Minutes per 'YYYY-MM-DD' date that has matching blocks,
+                in date order.
+        """
+        ordinals = self._columns["ordinals"]
+        first = self.first_ordinal
+        minutes, counts = self._group(
+            lambda selection: ordinals[selection] - first, self.days, start, end, block
+        )
+        return {date.fromordinal(first + int(i)).isoformat(): int(minutes[i]) for i in np.flatnonzero(counts)}
+
+    def block_counts(self, start=None, end=None):
+        """Counts the blocks per day from the index alone.
+
+        Args:
+            start (str or datetime.date, optional): First date, inclusive.
+                Defaults to the first date in the file.
+            end (str or datetime.date, optional): Last date, inclusive.
+                Defaults to the last date in the file.
+
+        Returns:
+            dict: Number of blocks per 'YYYY-MM-DD' date that has any, in
+                date order.
+        """
+        low, high = self._positions(start, end)
+        counts = np.diff(self._starts.astype(np.int64))
+        days = np.flatnonzero(counts)
+        return {
+            date.fromordinal(self.first_ordinal + int(day)).isoformat(): int(counts[day])
+            for day in days if low <= self._starts[day] < high
+        }
+
+    def blocks_between(self, start=None, end=None):
+        """Reads the blocks of a date range.
+
+        Args:
+            start (str or datetime.date, optional): First date, inclusive.
+                Defaults to the first date in the file.
+            end (str or datetime.date, optional): Last date, inclusive.
+                Defaults to the last date in the file.
+
+        Returns:
+            ScheduleBlocks: The blocks in date order, keeping the file's
+                order within each day.
+        """
+        low, high = self._positions(start, end)
+        rows = self._order[low:high]
+        columns = self._columns
+
+        def column(name, typecode):
+            return array(typecode, np.ascontiguousarray(columns[name][rows], dtype=typecode).tobytes())
+
+        return ScheduleBlocks.from_columns(
+            self.course_names, column("course_ids", "I"), column("ordinals", "i"),
+            column("durations", _TYPECODES[columns["durations"].dtype]),
+            block_names=self.block_names, block_types=column("block_types", "B"),
+        )
+
+    def blocks_on(self, day):
+        """Reads one day's blocks.
+
+        Args:
+            day (str or datetime.date): The date.
+
+        Returns:
+            ScheduleBlocks: The day's blocks in file order, the same as
+                ScheduleBlocks.group_by_date() gives for that date.
+        """
+        return self.blocks_between(day, day)
+
+    def completion(self, completed, start=None, end=None):
+        """Reports each course's study time done, like ProgressIndex.course_progress().
+
+        Args:
+            completed (iterable of tuple): Ids of the blocks done, as
+                (date, position within the day) pairs. Ids that don't exist
+                in the file are ignored.
+            start (str or datetime.date, optional): First date, inclusive.
+                Defaults to the first date in the file.
+            end (str or datetime.date, optional): Last date, inclusive.
+                Defaults to the last date in the file.
+
+        Returns:
+            dict: (done minutes, total minutes) per course with study blocks
+                in the range.
+        """
+        size = len(self.course_names)
+        course_ids = self._columns["course_ids"]
+        minutes, counts = self._group(lambda selection: course_ids[selection], size, start, end, STUDY_BLOCK)
+        low, high = self._positions(start, end)
+        positions = []
+        for day, index in set(completed):
+            offset = _ordinal(day) - self.first_ordinal
+            if 0 <= offset < self.days:
+                position = int(self._starts[offset]) + index
+                if 0 <= index and low <= position < min(int(self._starts[offset + 1]), high):
+                    positions.append(position)
+        done = np.zeros(size, dtype=np.int64)
+        if positions:
+            rows = self._order[np.array(positions, dtype=np.int64)]
+            rows = rows[self._columns["block_types"][rows] == self.block_names.index(STUDY_BLOCK)]
+            done = np.bincount(course_ids[rows], weights=self._columns["durations"][rows], minlength=size)
+            done = done.astype(np.int64)
+        return {self.course_names[i]: (int(done[i]), int(minutes[i])) for i in np.flatnonzero(counts)}
@@ -0,0 +1,216 @@
+"""Server-side schedule storage for the StudyBuddy Scheduler.
+
+This script defines the ScheduleStore class, which keeps generated
+schedules on the server so download links only need to carry a short
+token instead of the whole schedule.
+
+With a path, stored schedules are also written to a SQLite file, so a
+download can be served by any worker process, not only the one that
+generated the schedule.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from scheduler.blocks import ScheduleBlocks
+
+# Set to a file path to share download tokens between processes
+SCHEDULE_STORE_ENV = "STUDYBUDDY_SCHEDULE_STORE"
+
+
+class ScheduleStore:
+    """Bounded LRU store of schedules keyed by a hash of their content.
+
+    Entries expire after a TTL, and each entry also caches the exports that
+    have been rendered for it, so a schedule is exported at most once per
+    file type. Schedules read back from the shared file come back as
+    ScheduleBlocks.
+    """
+
+    def __init__(self, max_entries=256, ttl=60 * 60, clock=time.monotonic, path=None):
+        """Initializes an empty ScheduleStore.
+
+        Args:
+            max_entries (int, optional): Maximum number of schedules kept
+                before the least recently used one is evicted. Defaults to 256.
+            ttl (float, optional): Seconds a schedule stays downloadable after
+                it was last stored or read. Defaults to one hour.
+            clock (callable, optional): Returns the current time in seconds.
+                Defaults to time.monotonic.
+            path (str, optional): SQLite file shared with other processes.
+                Entries there expire by wall-clock time, a TTL after they
+                were last stored. Defaults to keeping schedules in memory only.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._disk().execute(
+                "CREATE TABLE IF NOT EXISTS schedules (token TEXT PRIMARY KEY, expires REAL NOT NULL, rows TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def make_token(schedule):
+        """Computes the download token for a schedule.
+
+        Args:
+            schedule (list of dict or ScheduleBlocks): The schedule blocks.
+
+        Returns:
+            str: A short URL-safe token derived from the schedule content.
+        """
+        if isinstance(schedule, ScheduleBlocks):
+            digest = schedule.digest()
+        else:
+            payload = json.dumps(schedule, sort_keys=True, separators=(",", ":")).encode("utf-8")
+            digest = hashlib.sha256(payload).digest()
+        return base64.urlsafe_b64encode(digest[:12]).decode("ascii")
+
+    def put(self, schedule):
+        """Stores a schedule and returns its download token.
+
+        Storing the same schedule again returns the same token and keeps
+        any exports already rendered for it.
+
+        Args:
+            schedule (list of dict or ScheduleBlocks): The schedule blocks.
+
+        Returns:
+            str: The download token for the schedule.
+        """
+        token = self.make_token(schedule)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                entry = {"schedule": schedule, "exports": {}}
+                self._entries[token] = entry
+            entry["expires"] = now + self.ttl
+            self._entries.move_to_end(token)
+            self._evict(now)
+        if self.path:
+            self._disk_put(token, schedule)
+        return token
+
+    def get(self, token):
+        """Looks up a schedule by its download token.
+
+        Args:
+            token (str): The download token.
+
+        Returns:
+            list of dict, ScheduleBlocks or None: The schedule, or None if the token is
+                unknown or has expired.
+        """
+        entry = self._get_entry(token)
+        return entry["schedule"] if entry else None
+
+    def get_export(self, token, filetype, render):
+        """Returns the export of a stored schedule, rendering it only once.
+
+        Args:
+            token (str): The download token.
+            filetype (str): Cache key for the export format, e.g. 'csv'.
+            render (callable): Called with the schedule to produce the export
+                the first time it is requested.
+
+        Returns:
+            str or None: The exported content, or None if the token is
+                unknown or has expired.
+        """
+        entry = self._get_entry(token)
+        if entry is None:
+            return None
+        exports = entry["exports"]
+        if filetype not in exports:
+            exports[filetype] = render(entry["schedule"])
+        return exports[filetype]
+
+    def __len__(self):
+        with self._lock:
+            self._evict(self.clock())
+            return len(self._entries)
+
+    def _get_entry(self, token):
+        """Returns the live entry for a token and marks it recently used."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry["expires"] <= now:
+                del self._entries[token]
+                entry = None
+            if entry is not None:
+                entry["expires"] = now + self.ttl
+                self._entries.move_to_end(token)
+                return entry
+        schedule = self._disk_get(token) if self.path else None
+        if schedule is None:
+            return None
+        with self._lock:
+            entry = self._entries.setdefault(token, {"schedule": schedule, "exports": {}})
+            entry["expires"] = now + self.ttl
+            self._entries.move_to_end(token)
+            self._evict(now)
+            return entry
+
+    def _evict(self, now):
+        """Drops expired entries and trims the store to max_entries."""
+        # Every touch moves an entry to the end with a fresh expiry, so the
+        # oldest expiries are always at the front.
+        while self._entries:
+            token, entry = next(iter(self._entries.items()))
+            if entry["expires"] > now:
+                break
+            del self._entries[token]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk(self):
+        """Returns this thread's connection to the shared file."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _disk_put(self, token, schedule):
+        """Writes a schedule to the shared file and drops expired ones."""
+        rows = schedule.iter_rows() if isinstance(schedule, ScheduleBlocks) else (
+            (b["course"], b["block"], b["duration"], b["date"]) for b in schedule
+        )
+        now = time.time()
+        connection = self._disk()
+        connection.execute("DELETE FROM schedules WHERE expires <= ?", (now,))
+        connection.execute(
+            "INSERT OR REPLACE INTO schedules (token, expires, rows) VALUES (?, ?, ?)",
+            (token, now + self.ttl, json.dumps(list(rows), separators=(",", ":"))),
+        )
+
+    def _disk_get(self, token):
+        """Reads a live schedule from the shared file."""
+        row = self._disk().execute(
+            "SELECT rows FROM schedules WHERE token = ? AND expires > ?", (token, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        blocks = ScheduleBlocks()
+        for course, block, duration, date in json.loads(row[0]):
+            blocks.append(course, block, duration, date)
+        return blocks
+
+
+# Store shared by the UI, which puts schedules in, and the download endpoint
+schedule_store = ScheduleStore(path=os.environ.get(SCHEDULE_STORE_ENV))
@@ -5,17 +5,36 @@ application. It includes the main UI for inputting courses, generating
 schedules, and displaying results.
 """
 
-from reactpy import component, html, use_state, event
-from collections import defaultdict
+from reactpy import component, html, use_state, use_memo, use_effect, use_ref, use_scope, use_location, event
 from datetime import datetime
+from http.cookies import SimpleCookie
+import asyncio
+import itertools
 import random
-import json
-import urllib.parse
 
 from exporter.file_exporter import FileExporter
+from exporter.schedule_store import schedule_store
+from scheduler.registry import registry
 from scheduler.scheduler_engine import SchedulerEngine
-from scheduler.utils import generate_pie_chart
+from scheduler.blocks import ScheduleBlocks
+from scheduler.progress import ProgressIndex
+from scheduler.charts import chart_cache, chart_pool, svg_data_uri
+from storage.sqlite_store import SESSION_COOKIE, SavedSchedule, default_store
 from api.quotes import QuoteFetcher
+from monitoring.metrics import metrics
+from monitoring.profiling import request_profiler
+
+RENDERS = metrics.counter("studybuddy_renders", "ReactPy component renders.", ("component",))
+
+# Calendar pages: 'week' shows Monday to Sunday, 'month' a calendar month
+CALENDAR_PERIODS = {"week": "Week", "month": "Month"}
+
+# Format of the per-day pie charts: 'svg' renders in-process from the chart
+# cache, 'png' renders with matplotlib on the chart process pool.
+CHART_FORMAT = "svg"
+
+# Ids of course entry rows; unlike id() of the entry dicts, they are never reused
+ROW_IDS = itertools.count()
 
 
 def radial_gradient(hovered):
@@ -40,21 +59,58 @@ def StudyBuddyUI():
     strategy, and generate a study schedule. Users can also export the schedule
     and view motivational quotes.
     """
+    RENDERS.inc(("StudyBuddyUI",))
     course_entries, set_course_entries = use_state([
         {"course": "", "deadline": "", "hours": ""}
     ])
+    row_ids, set_row_ids = use_state(lambda: [next(ROW_IDS)])
     generated_schedule, set_generated_schedule = use_state([])
+    download_token, set_download_token = use_state("")
     strategy, set_strategy = use_state("even")
+    daily_hours, set_daily_hours = use_state("4")
     result, set_result = use_state("")
     quote, set_quote = use_state("")
     hovered, set_hovered = use_state(False)
     bg_hovered, set_bg_hovered = use_state(False)
     show_modal, set_show_modal = use_state(False)
     pending_delete_index, set_pending_delete_index = use_state(None)
+    planner = use_ref(None)
+    saved = use_ref(None)
+    user = session_user(use_scope())
+    location = use_location()
+
+    @use_effect(dependencies=[])
+    async def restore_session():
+        """Reloads this browser's saved courses, schedule and progress."""
+        if not user:
+            return
+        courses, schedule = await asyncio.to_thread(load_session, user)
+        if courses:
+            set_course_entries(courses)
+            set_row_ids([next(ROW_IDS) for _ in courses])
+        if len(schedule):
+            # Only the first page is loaded; the calendar loads the others
+            # as they are shown
+            saved.current = schedule
+            set_result(calendar(schedule))
+
+    def save_progress(block_id, done):
+        """Saves a checkmark in the background.
+
+        Args:
+            block_id (tuple): (date, position within the day) of the block.
+            done (bool): Whether the block is now done.
+        """
+        asyncio.get_running_loop().run_in_executor(None, default_store().set_completed, user, [block_id], done)
+
+    def calendar(schedule_blocks, changed_days=(), completed=()):
+        """Creates the calendar for a schedule, saving checkmarks if there is a user."""
+        return CalendarView(schedule_blocks, changed_days, completed, save_progress if user else None)
 
     def add_course_entry():
         """Adds a new empty course entry."""
         set_course_entries(course_entries + [{"course": "", "deadline": "", "hours": ""}])
+        set_row_ids(row_ids + [next(ROW_IDS)])
 
     def update_course_field(index, field, value):
         """Updates a specific field in a course entry.
@@ -82,6 +138,7 @@ def StudyBuddyUI():
         if pending_delete_index is not None and len(course_entries) > 1:
             updated = course_entries[:pending_delete_index] + course_entries[pending_delete_index + 1:]
             set_course_entries(updated)
+            set_row_ids(row_ids[:pending_delete_index] + row_ids[pending_delete_index + 1:])
         set_pending_delete_index(None)
         set_show_modal(False)
 
@@ -99,29 +156,68 @@ def StudyBuddyUI():
         Returns:
             str: Download link.
         """
-        if not generated_schedule or len(generated_schedule) == 0:
+        if not generated_schedule or not download_token:
             return "#"
-        encoded = urllib.parse.quote(json.dumps(generated_schedule))
-        return f"/download/{filetype}?data={encoded}"
+        return f"/download/{filetype}?token={download_token}"
     
     @event(prevent_default=True)
     async def handle_submit(event):
         """Handles form submission to generate a schedule.
 
+        When the page was opened with a 'profile' parameter, the whole
+        submit, including the renders it triggers while it waits, is
+        profiled (see monitoring.profiling).
+
         Args:
             event: The form submission event.
         """
+        mode = request_profiler.mode_for_query(location.search) if request_profiler.enabled else None
+        session = request_profiler.start("ui submit", mode) if mode else None
+        try:
+            await generate_schedule()
+        finally:
+            if session is not None:
+                session.stop()
+
+    async def generate_schedule():
+        """Generates and shows the schedule for the current course entries."""
         # Check if all entries are filled
         if not all(entry["course"] and entry["deadline"] and entry["hours"] for entry in course_entries):
             set_result("Please fill in all fields.")
             return
         
-        scheduler = SchedulerEngine(strategy=strategy)
-        schedule_blocks = scheduler.generate_schedule(course_entries)
+        # Only courses edited since the last submit are rescheduled; the
+        # planner starts over when the strategy, its options or the day change.
+        options = {"daily_hours": daily_hours or 0} if strategy == "capacity" else None
+        today = datetime.today().date()
+        current = planner.current
+        fresh = current is None or (current.strategy_name, current.options, current.today) != (strategy, options or {}, today)
+        if fresh:
+            current = planner.current = SchedulerEngine(strategy=strategy, options=options).incremental_scheduler(today)
+        diff = current.update(course_entries, keys=row_ids)
+        schedule_blocks = current.blocks()
+        # A new planner doesn't know the schedule shown so far, and a
+        # restored schedule has only loaded the pages that were shown
+        previous, completed = generated_schedule, ()
+        if fresh and saved.current is not None:
+            previous, completed = await asyncio.to_thread(load_saved, saved.current)
+            saved.current = None
+        days = changed_days(previous, schedule_blocks) if fresh else diff.days
         
         set_generated_schedule(schedule_blocks)
-        set_result(CalendarView(schedule_blocks))
-        set_quote(QuoteFetcher().get_quote())
+        set_download_token(schedule_store.put(schedule_blocks))
+        # The capacity strategy also reports time that didn't fit
+        # The calendar patches the days the planner rebuilt instead of
+        # regrouping the whole schedule
+        if current.unscheduled:
+            set_result(html.div(capacity_warning(current.unscheduled), calendar(current.grouped(), days, completed)))
+        else:
+            set_result(calendar(current.grouped(), days, completed))
+        if user:
+            courses = [dict(entry) for entry in course_entries]
+            await asyncio.to_thread(save_session, user, courses, {date: current.day(date) for date in days})
+        # Render the schedule first; the quote fills in once it is available
+        set_quote(await QuoteFetcher().get_quote_async())
 
     return html.div(
         {
@@ -225,7 +321,7 @@ def StudyBuddyUI():
 
                 *[
                     html.div(
-                        {"style": {
+                        {"key": row_ids[i], "style": {
                             "marginBottom": "30px",
                             "padding": "15px",
                             "border": "1px solid #e0e0e0",
@@ -284,12 +380,19 @@ def StudyBuddyUI():
                             "on_change": lambda e: set_strategy(e["target"]["value"]),
                             "style": input_style()
                         },
-                        html.option({"value": "even"}, "Even Distribution"),
-                        html.option({"value": "urgency"}, "Urgency-Based"),
-                        html.option({"value": "pomodoro"}, "Pomodoro")
+                        *[
+                            html.option({"value": name}, registry.get(name).description)
+                            for name in registry.names()
+                        ]
                     )
                 ),
 
+                form_input(
+                    "Daily Hours Cap", daily_hours,
+                    lambda val: set_daily_hours(max(0, float(val)) if val else ""),
+                    "number", "e.g. 4", min_val="0"
+                ) if strategy == "capacity" else None,
+
                 html.div(
                     {"style": {"marginTop": "20px", "textAlign": "center"}},
                     html.button(
@@ -353,22 +456,108 @@ def StudyBuddyUI():
     )
 
 @component
-def CalendarView(schedule_blocks):
+def CalendarView(schedule_blocks, changed_days=(), completed=(), on_toggle=None):
     """Displays the generated schedule in a calendar view.
 
     Args:
-        schedule_blocks (list): List of schedule blocks.
+        schedule_blocks (ScheduleBlocks, list, dict or SavedSchedule): The
+            schedule blocks, or the live ScheduleBlocks per day of an
+            IncrementalScheduler (see IncrementalScheduler.grouped()). When
+            the same dict comes back, only the days whose blocks were
+            replaced are regrouped. A SavedSchedule has its days loaded a
+            page at a time, as the pages are shown.
+        changed_days (list of str, optional): Days rescheduled since the
+            previous schedule; their completed checkmarks are cleared, and
+            every other day keeps its progress. Defaults to none.
+        completed (iterable of tuple, optional): Ids of blocks already done,
+            such as saved progress of days the calendar hasn't loaded. Ids
+            on changed days are ignored. Defaults to none.
+        on_toggle (function, optional): Called with a block id and whether
+            it is now done whenever a checkbox is toggled. Defaults to None.
 
     Returns:
         ReactPy component: Rendered calendar view.
     """
+    RENDERS.inc(("CalendarView",))
     expanded_days, set_expanded_days = use_state(set())
-    completed_tasks, set_completed_tasks = use_state(set())
+    _, set_progress_version = use_state(0)
+    state = use_ref(None)
     modal_day, set_modal_day = use_state(None)
+    period, set_period = use_state("week")
+    page, set_page = use_state(0)
 
-    grouped = defaultdict(list)
-    for block in schedule_blocks:
-        grouped[block["date"]].append(block)
+    def build_view():
+        """Groups the schedule and indexes its progress, patching the days
+        that changed when the schedule is the same per-day dict as before.
+
+        Returns:
+            tuple: The blocks per date, the per-course minutes per date, the
+                ProgressIndex, and the dates in date order.
+        """
+        previous = state.current
+        if previous is not None and isinstance(schedule_blocks, dict) and previous["source"] is schedule_blocks:
+            grouped, day_durations, progress = previous["grouped"], previous["day_durations"], previous["progress"]
+            # Replaced days are new objects, so spotting them takes one
+            # identity check per day instead of comparing blocks
+            replaced = [date for date in grouped.keys() - schedule_blocks.keys()]
+            replaced.extend(date for date, blocks in schedule_blocks.items() if grouped.get(date) is not blocks)
+            for date in replaced:
+                blocks = schedule_blocks.get(date)
+                progress.set_day(date, blocks)
+                if blocks:
+                    grouped[date] = blocks
+                    day_durations[date] = blocks.sum_by_course()
+                else:
+                    del grouped[date], day_durations[date]
+            dates = previous["dates"]
+            if grouped.keys() != set(dates):
+                dates = sorted(grouped)
+        elif isinstance(schedule_blocks, SavedSchedule):
+            # Pages load as they are shown; the rest count toward progress
+            # through the saved per-course totals
+            grouped = dict(schedule_blocks.grouped)
+            day_durations = {date: blocks.sum_by_course() for date, blocks in grouped.items()}
+            progress = ProgressIndex({}, outside=schedule_blocks.course_progress)
+            for date, blocks in grouped.items():
+                progress.load_day(date, blocks, [block_id for block_id in schedule_blocks.completed if block_id[0] == date])
+            dates = schedule_blocks.dates
+        else:
+            if isinstance(schedule_blocks, dict):
+                grouped = dict(schedule_blocks)
+                day_durations = {date: blocks.sum_by_course() for date, blocks in grouped.items()}
+            else:
+                grouped, day_durations = group_schedule(schedule_blocks)
+            carried = set(completed)
+            if previous is not None:
+                carried |= previous["progress"].completed
+            changed = set(changed_days)
+            progress = ProgressIndex(grouped, [block_id for block_id in carried if block_id[0] not in changed])
+            dates = sorted(grouped)
+        state.current = {
+            "source": schedule_blocks, "grouped": grouped, "day_durations": day_durations,
+            "progress": progress, "dates": dates,
+        }
+        return grouped, day_durations, progress, dates
+
+    # Grouping and paging run once per schedule, and a patched schedule
+    # only regroups its changed days; each render only builds the days on
+    # the current page.
+    grouped, day_durations, progress, dates = use_memo(build_view, [schedule_blocks, changed_days])
+    pages = use_memo(lambda: calendar_pages(dates, period), [dates, period])
+    page = min(page, len(pages) - 1) if pages else 0
+    shown = pages[page] if pages else []
+
+    @use_effect(dependencies=[schedule_blocks, period, page])
+    async def load_page():
+        """Loads the days of the page shown, if the schedule is a saved one."""
+        if not isinstance(schedule_blocks, SavedSchedule) or all(date in grouped for date in shown):
+            return
+        days, done = await asyncio.to_thread(schedule_blocks.load, shown)
+        for date, blocks in days.items():
+            grouped[date] = blocks
+            day_durations[date] = blocks.sum_by_course()
+            progress.load_day(date, blocks, [block_id for block_id in done if block_id[0] == date])
+        set_progress_version(lambda version: version + 1)
 
     def toggle_day(date):
         """Toggles the expansion of a day's schedule.
@@ -385,19 +574,17 @@ def CalendarView(schedule_blocks):
             set_expanded_days(expanded)
         return handler
 
-    def toggle_complete(block_key):
+    def toggle_complete(block_id):
         """Marks a schedule block as complete or incomplete.
 
         Args:
-            block_key (str): Unique key for the schedule block.
+            block_id (tuple): (date, position within the day) of the block.
         """
         def handler(_):
-            updated = set(completed_tasks)
-            if block_key in updated:
-                updated.remove(block_key)
-            else:
-                updated.add(block_key)
-            set_completed_tasks(updated)
+            done = progress.toggle(block_id)
+            set_progress_version(lambda version: version + 1)
+            if on_toggle is not None:
+                on_toggle(block_id, done)
         return handler
 
     def open_modal(date):
@@ -414,21 +601,25 @@ def CalendarView(schedule_blocks):
         """Closes the modal."""
         set_modal_day(None)
 
-    view = []
-    for date in sorted(grouped.keys()):
-        blocks = grouped[date]
-        total = sum(b["duration"] for b in blocks if b["block"] == "study")
-        done = sum(
-            b["duration"] for i, b in enumerate(blocks)
-            if f"{date}-{i}" in completed_tasks and b["block"] == "study"
-        )
-        percent = int((done / total) * 100) if total else 0
+    def change_period(event):
+        """Switches between week and month pages, back to the first page."""
+        set_period(event["target"]["value"])
+        set_page(0)
+
+    view = [
+        course_progress_summary(progress),
+        calendar_pager(pages, page, period, set_page, change_period)
+    ] if pages else []
+    for date in shown:
+        # A saved schedule's day is empty until its page has loaded
+        blocks = grouped.get(date, ())
+        percent = progress.day_percent(date)
 
         is_expanded = date in expanded_days
-        chart_base64 = generate_pie_chart(blocks) if is_expanded else ""
 
         view.append(html.div(
             {
+                "key": date,
                 "style": {
                     "backgroundColor": "#f8f9fa",
                     "border": "1px solid #e0e0e0",
@@ -484,6 +675,7 @@ def CalendarView(schedule_blocks):
                 *[
                     html.div(
                         {
+                            "key": f"{date}-{i}-{b['course']}",
                             "style": {
                                 "marginTop": "10px",
                                 "padding": "10px 14px",
@@ -498,29 +690,19 @@ def CalendarView(schedule_blocks):
                         },
                         html.input({
                             "type": "checkbox",
-                            "checked": f"{date}-{i}" in completed_tasks,
-                            "on_change": toggle_complete(f"{date}-{i}")
+                            "checked": progress.is_done((date, i)),
+                            "on_change": toggle_complete((date, i))
                         }),
                         html.span({}, f"{b['course']}: {b['block']} for {b['duration']} min")
                     )
                     for i, b in enumerate(blocks)
                 ] if is_expanded else []
             ),
-            html.div(
-                html.img({
-                    "src": f"data:image/png;base64,{chart_base64}",
-                    "style": {
-                        "marginTop": "15px",
-                        "borderRadius": "6px",
-                        "maxWidth": "100%",
-                        "boxShadow": "0 2px 6px rgba(0,0,0,0.1)"
-                    }
-                })
-            ) if chart_base64 else None
+            DayChart(day_durations[date], key=f"chart-{date}") if is_expanded and date in day_durations else None
         ))
 
     # Modal
-    if (modal_day):
+    if modal_day in grouped:
         view.append(
             html.div(
                 {
@@ -571,6 +753,250 @@ def CalendarView(schedule_blocks):
 
     return html.div({}, *view)
 
+def capacity_warning(unscheduled):
+    """Lists the study time that didn't fit under the daily hours cap.
+
+    Args:
+        unscheduled (dict): Minutes per course that couldn't be scheduled
+            before the course's deadline.
+
+    Returns:
+        ReactPy component: Rendered warning.
+    """
+    return html.div(
+        {
+            "style": {
+                "backgroundColor": "#fff3cd",
+                "border": "1px solid #ffe69c",
+                "borderRadius": "8px",
+                "padding": "12px 16px",
+                "marginBottom": "20px",
+                "color": "#664d03"
+            }
+        },
+        html.strong("Not everything fits before the deadlines:"),
+        html.ul(
+            *[html.li({}, f"{course}: {minutes} min unscheduled") for course, minutes in unscheduled.items()]
+        )
+    )
+
+@component
+def DayChart(durations):
+    """Displays the pie chart of a day's study time per course.
+
+    SVG charts come straight from the shared chart cache. PNG charts are
+    rendered on the chart process pool and shown once they are ready, so
+    the calendar never waits on matplotlib.
+
+    Args:
+        durations (dict): Minutes per course for the day.
+
+    Returns:
+        ReactPy component: Rendered chart.
+    """
+    RENDERS.inc(("DayChart",))
+    png, set_png = use_state("")
+
+    @use_effect(dependencies=[durations])
+    async def render_png():
+        if CHART_FORMAT == "png":
+            set_png(await chart_pool.render_png(durations))
+
+    if CHART_FORMAT == "png":
+        if not png:
+            return html.div({"style": {"marginTop": "15px", "color": "#888"}}, "Loading chart...")
+        src = f"data:image/png;base64,{png}"
+    else:
+        src = svg_data_uri(chart_cache.get_svg(durations))
+
+    return html.div(
+        html.img({
+            "src": src,
+            "style": {
+                "marginTop": "15px",
+                "borderRadius": "6px",
+                "maxWidth": "100%",
+                "boxShadow": "0 2px 6px rgba(0,0,0,0.1)"
+            }
+        })
+    )
+
+def course_progress_summary(progress):
+    """Shows the overall and per-course share of study time done.
+
+    Args:
+        progress (ProgressIndex): Progress of the schedule.
+
+    Returns:
+        ReactPy component: Rendered summary.
+    """
+    return html.div(
+        {"style": {"marginBottom": "16px", "color": "#343a40"}},
+        html.strong(f"Overall progress: {progress.overall_percent()}%"),
+        html.ul(
+            {"style": {"margin": "6px 0 0", "paddingLeft": "20px", "fontSize": "14px"}},
+            *[
+                html.li({"key": course}, f"{course}: {done} of {total} min")
+                for course, (done, total) in progress.course_progress().items()
+            ]
+        )
+    )
+
+def calendar_pages(grouped, period="week"):
+    """Splits the days of a schedule into calendar pages.
+
+    Args:
+        grouped (dict or list): Schedule blocks per 'YYYY-MM-DD' date, or
+            just the dates.
+        period (str, optional): 'week' for Monday-to-Sunday pages or
+            'month' for calendar months. Defaults to 'week'.
+
+    Returns:
+        list of list of str: The dates on each page, in date order.
+    """
+    pages = []
+    last_key = None
+    for date in sorted(grouped):
+        key = date[:7] if period == "month" else datetime.strptime(date, "%Y-%m-%d").isocalendar()[:2]
+        if key != last_key:
+            pages.append([])
+            last_key = key
+        pages[-1].append(date)
+    return pages
+
+def calendar_pager(pages, page, period, set_page, change_period):
+    """Creates the calendar's page navigation.
+
+    Args:
+        pages (list of list of str): The dates on each page.
+        page (int): Index of the page shown.
+        period (str): 'week' or 'month'.
+        set_page (function): Function to show another page.
+        change_period (function): Event handler for the period select.
+
+    Returns:
+        ReactPy component: Rendered navigation bar.
+    """
+    first = datetime.strptime(pages[page][0], "%Y-%m-%d")
+    if period == "month":
+        label = first.strftime("%B %Y")
+    else:
+        last = datetime.strptime(pages[page][-1], "%Y-%m-%d")
+        label = f"{first.strftime('%b %d')} – {last.strftime('%b %d, %Y')}"
+    nav_style = {
+        "border": "none",
+        "borderRadius": "6px",
+        "padding": "6px 12px",
+        "backgroundColor": "#007acc",
+        "color": "white",
+        "cursor": "pointer"
+    }
+    return html.div(
+        {"style": {"display": "flex", "alignItems": "center", "justifyContent": "space-between", "marginBottom": "16px"}},
+        html.button(
+            {"on_click": lambda _: set_page(page - 1), "disabled": page == 0, "style": nav_style},
+            "◀ Prev"
+        ),
+        html.span(
+            {"style": {"fontWeight": "bold", "color": "#343a40"}},
+            f"{label} ({page + 1} of {len(pages)})"
+        ),
+        html.select(
+            {"value": period, "on_change": change_period, "style": {"padding": "6px", "borderRadius": "6px"}},
+            *[html.option({"value": value}, name) for value, name in CALENDAR_PERIODS.items()]
+        ),
+        html.button(
+            {"on_click": lambda _: set_page(page + 1), "disabled": page == len(pages) - 1, "style": nav_style},
+            "Next ▶"
+        )
+    )
+
+def changed_days(old, new):
+    """Lists the days whose blocks differ between two schedules.
+
+    Args:
+        old (ScheduleBlocks or list): The previous schedule blocks.
+        new (ScheduleBlocks or list): The new schedule blocks.
+
+    Returns:
+        list of str: The dates that were added, removed or changed.
+    """
+    old_days = group_schedule(old)[0]
+    new_days = group_schedule(new)[0]
+    return sorted(date for date in old_days.keys() | new_days.keys() if old_days.get(date) != new_days.get(date))
+
+def session_user(scope):
+    """Reads the user id from the session cookie of a connection.
+
+    Args:
+        scope (dict): The ASGI scope of the websocket connection.
+
+    Returns:
+        str or None: The user id, or None if the browser has no cookie.
+    """
+    for name, value in scope.get("headers", ()):
+        if name == b"cookie":
+            morsel = SimpleCookie(value.decode("latin-1")).get(SESSION_COOKIE)
+            if morsel is not None:
+                return morsel.value
+    return None
+
+def load_session(user):
+    """Loads a user's saved courses and the first calendar page of their schedule.
+
+    Args:
+        user (str): The user id.
+
+    Returns:
+        tuple: The course entries and the SavedSchedule, with the blocks
+            and checkmarks of its first week loaded.
+    """
+    store = default_store()
+    schedule = SavedSchedule(store, user)
+    pages = calendar_pages(schedule.dates)
+    schedule.load(pages[0] if pages else [])
+    return store.load_courses(user), schedule
+
+def load_saved(schedule):
+    """Loads all of a saved schedule, to compare a new schedule against.
+
+    Args:
+        schedule (SavedSchedule): The saved schedule.
+
+    Returns:
+        tuple: The ScheduleBlocks and the set of completed block ids.
+    """
+    return schedule.store.load_schedule(schedule.user), schedule.store.load_completed(schedule.user)
+
+def save_session(user, courses, days):
+    """Saves a user's courses and the days of their schedule that changed.
+
+    Args:
+        user (str): The user id.
+        courses (list of dict): The course entries.
+        days (dict): Lists of block dicts per changed date.
+    """
+    store = default_store()
+    store.save_courses(user, courses)
+    if days:
+        store.save_days(user, days)
+
+def group_schedule(schedule_blocks):
+    """Groups schedule blocks by date and totals each day's minutes per course.
+
+    Args:
+        schedule_blocks (ScheduleBlocks or list): The schedule blocks.
+
+    Returns:
+        tuple: A dict of ScheduleBlocks per date and a dict of per-course minute
+            totals per date, used as the day's pie chart key.
+    """
+    if not isinstance(schedule_blocks, ScheduleBlocks):
+        schedule_blocks = ScheduleBlocks.from_dicts(schedule_blocks)
+    grouped = schedule_blocks.group_by_date()
+    day_durations = {date: blocks.sum_by_course() for date, blocks in grouped.items()}
+    return grouped, day_durations
+
 def form_input(label, value, setter, input_type, placeholder="", min_val=None):
     """Creates a form input field.
 
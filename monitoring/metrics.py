@@ -0,0 +1,407 @@
+"""Metrics for the StudyBuddy Scheduler.
+
+This script defines counters, histograms and timers for the hot paths,
+and the MetricsRegistry that renders them in the Prometheus text format
+for the /metrics endpoint.
+
+Every thread records into its own shard of each metric, so recording is
+a dict update with no lock; the shards are only summed when the metrics
+are rendered. Setting STUDYBUDDY_METRICS=0 turns recording off, leaving
+one attribute check per instrumented call.
+
+Each worker process keeps its own metrics, so with several workers
+/metrics reports the worker that served the scrape.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+METRICS_ENV = "STUDYBUDDY_METRICS"
+
+# Upper bounds in seconds, from sub-millisecond cache hits to slow exports
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class _Metric:
+    """A named metric whose values are kept per thread and label values."""
+
+    kind = None
+
+    def __init__(self, registry, name, help, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+
+    def _shard(self):
+        """Creates this thread's values on the thread's first recording."""
+        shard = self._local.shard = {}
+        with self.registry._lock:
+            self._shards.append(shard)
+        return shard
+
+    def _merged(self):
+        """Returns the values summed over every thread's shard."""
+        raise NotImplementedError
+
+    def reset(self):
+        """Zeroes the values recorded by every thread."""
+        with self.registry._lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def samples(self):
+        """Lists the samples to render.
+
+        Returns:
+            list of tuple: (suffix, labels dict, value) per sample.
+        """
+        raise NotImplementedError
+
+    def _labels(self, values):
+        return dict(zip(self.labelnames, values))
+
+
+class Counter(_Metric):
+    """A count that only goes up, such as requests served."""
+
+    kind = "counter"
+
+    def inc(self, labels=(), amount=1):
+        """Adds to the count.
+
+        Args:
+            labels (tuple, optional): Label values, in labelnames order.
+                Defaults to none.
+            amount (float, optional): Amount to add. Defaults to 1.
+        """
+        if not self.registry.enabled:
+            return
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        """Returns the count summed over all threads.
+
+        Args:
+            labels (tuple, optional): Label values. Defaults to none.
+
+        Returns:
+            float: The count.
+        """
+        return self._merged().get(labels, 0)
+
+    def _merged(self):
+        totals = {}
+        for shard in list(self._shards):
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def samples(self):
+        return [("_total", self._labels(labels), value) for labels, value in sorted(self._merged().items())]
+
+
+class Histogram(_Metric):
+    """A distribution of observed values, such as call durations in seconds."""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, labels=()):
+        """Records one value.
+
+        Args:
+            value (float): The observed value.
+            labels (tuple, optional): Label values, in labelnames order.
+                Defaults to none.
+        """
+        if not self.registry.enabled:
+            return
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            # One count per bucket plus +Inf, then the sum of values
+            row = shard[labels] = [0] * (len(self.buckets) + 2)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def time(self, labels=()):
+        """Returns a context manager that observes the seconds its block takes.
+
+        Args:
+            labels (tuple, optional): Label values. Defaults to none.
+
+        Returns:
+            context manager: The timer.
+        """
+        return _Timer(self, labels) if self.registry.enabled else _NULL_TIMER
+
+    def count(self, labels=()):
+        """Returns the number of values observed.
+
+        Args:
+            labels (tuple, optional): Label values. Defaults to none.
+
+        Returns:
+            int: The count.
+        """
+        row = self._merged().get(labels)
+        return sum(row[:-1]) if row else 0
+
+    def _merged(self):
+        totals = {}
+        for shard in list(self._shards):
+            for labels, row in list(shard.items()):
+                total = totals.get(labels)
+                totals[labels] = list(row) if total is None else [a + b for a, b in zip(total, row)]
+        return totals
+
+    def samples(self):
+        samples = []
+        for labels, row in sorted(self._merged().items()):
+            names = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), row):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                samples.append(("_bucket", {**names, "le": le}, cumulative))
+            samples.append(("_sum", names, row[-1]))
+            samples.append(("_count", names, cumulative))
+        return samples
+
+
+class CallbackMetric:
+    """A metric read from a callback when rendered, such as a cache's stats."""
+
+    def __init__(self, name, help, kind, callback, labelnames=()):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+
+    def reset(self):
+        pass
+
+    def samples(self):
+        values = self.callback()
+        if not isinstance(values, dict):
+            values = {(): values}
+        suffix = "_total" if self.kind == "counter" else ""
+        return [(suffix, dict(zip(self.labelnames, labels)), value) for labels, value in sorted(values.items())]
+
+
+class _Timer:
+    """Observes the seconds spent in a with block."""
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, self.labels)
+        return False
+
+
+class _NullTimer:
+    """Stands in for _Timer while metrics are disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Creates metrics and renders them in the Prometheus text format."""
+
+    def __init__(self, enabled=True):
+        """Initializes an empty MetricsRegistry.
+
+        Args:
+            enabled (bool, optional): Whether metrics record anything.
+                Defaults to True.
+        """
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        """Registers a metric, or returns the one already under its name."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help, labelnames=()):
+        """Returns the counter with a name, creating it if needed.
+
+        Args:
+            name (str): Metric name, without the '_total' suffix.
+            help (str): One-line description.
+            labelnames (tuple of str, optional): Label names. Defaults to none.
+
+        Returns:
+            Counter: The counter.
+        """
+        return self._add(Counter(self, name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Returns the histogram with a name, creating it if needed.
+
+        Args:
+            name (str): Metric name.
+            help (str): One-line description.
+            labelnames (tuple of str, optional): Label names. Defaults to none.
+            buckets (tuple of float, optional): Bucket upper bounds.
+                Defaults to DEFAULT_BUCKETS, in seconds.
+
+        Returns:
+            Histogram: The histogram.
+        """
+        return self._add(Histogram(self, name, help, labelnames, buckets))
+
+    def callback(self, name, help, kind, callback, labelnames=()):
+        """Registers a metric whose value is read from a callback.
+
+        Args:
+            name (str): Metric name, without the '_total' suffix for counters.
+            help (str): One-line description.
+            kind (str): 'counter' or 'gauge'.
+            callback (callable): Returns the value, or a dict of values per
+                tuple of label values.
+            labelnames (tuple of str, optional): Label names. Defaults to none.
+
+        Returns:
+            CallbackMetric: The metric.
+        """
+        return self._add(CallbackMetric(name, help, kind, callback, labelnames))
+
+    def reset(self):
+        """Zeroes every metric's recorded values."""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render(self):
+        """Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            # Counter samples end in _total, and the text format names the family after them
+            family = f"{name}_total" if metric.kind == "counter" else name
+            lines.append(f"# HELP {family} {metric.help}")
+            lines.append(f"# TYPE {family} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                if labels:
+                    pairs = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                    lines.append(f"{name}{suffix}{{{pairs}}} {_number(value)}")
+                else:
+                    lines.append(f"{name}{suffix} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    """Escapes a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    """Formats a sample value for the text format."""
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def timed(histogram, labels=()):
+    """Decorator that observes how long each call of a function takes.
+
+    Args:
+        histogram (Histogram): Where to record the seconds.
+        labels (tuple, optional): Label values. Defaults to none.
+
+    Returns:
+        callable: The decorator.
+    """
+    registry = histogram.registry
+    observe = histogram.observe
+    perf_counter = time.perf_counter
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(perf_counter() - start, labels)
+        return wrapper
+    return decorator
+
+
+def timed_iter(histogram, labels=()):
+    """Decorator that observes the seconds a generator spends producing items.
+
+    Time the consumer spends between items is not counted, so a streamed
+    download records the cost of rendering it, not of sending it. The
+    total is recorded once the generator is exhausted or closed.
+
+    Args:
+        histogram (Histogram): Where to record the seconds.
+        labels (tuple, optional): Label values. Defaults to none.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not histogram.registry.enabled:
+                yield from func(*args, **kwargs)
+                return
+            items = func(*args, **kwargs)
+            elapsed = 0.0
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        elapsed += time.perf_counter() - start
+                        return
+                    elapsed += time.perf_counter() - start
+                    yield item
+            finally:
+                items.close()
+                histogram.observe(elapsed, labels)
+        return wrapper
+    return decorator
+
+
+# Registry shared by every instrumented module and the /metrics endpoint
+metrics = MetricsRegistry(enabled=os.environ.get(METRICS_ENV, "1") != "0")
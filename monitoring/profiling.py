@@ -0,0 +1,251 @@
+"""Per-request profiling for the StudyBuddy Scheduler.
+
+This script defines the RequestProfiler class, which profiles a single
+request when it asks for it, so a slow case seen in production can be
+diagnosed where it happens. A request opts in with the 'profile' query
+parameter or the X-StudyBuddy-Profile header:
+
+- 'cprofile' (or '1') runs it under cProfile and saves a .pstats file;
+- 'sample' samples the stacks of every thread and saves a .collapsed
+  file, which flame graph tools read.
+
+Profiling is off unless STUDYBUDDY_PROFILE_DIR names the output directory.
+At most one profile runs at a time, profiles are at least min_interval
+seconds apart, and only the newest max_files profiles are kept. If
+STUDYBUDDY_PROFILE_TOKEN is set, requests must also pass it as the
+'profile_token' parameter or the X-StudyBuddy-Profile-Token header.
+
+Both collectors see everything on the threads they watch, so a profile
+of an async handler includes whatever else the event loop ran meanwhile.
+"""
+
+import cProfile
+import itertools
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qs
+
+PROFILE_DIR_ENV = "STUDYBUDDY_PROFILE_DIR"
+PROFILE_TOKEN_ENV = "STUDYBUDDY_PROFILE_TOKEN"
+PROFILE_PARAM = "profile"
+PROFILE_TOKEN_PARAM = "profile_token"
+PROFILE_HEADER = "x-studybuddy-profile"
+PROFILE_TOKEN_HEADER = "x-studybuddy-profile-token"
+
+# Flag values that select each collector, and the file each one saves
+PROFILE_MODES = {"1": "cprofile", "true": "cprofile", "cprofile": "cprofile", "sample": "sample"}
+PROFILE_SUFFIXES = {"cprofile": ".pstats", "sample": ".collapsed"}
+
+
+class RequestProfiler:
+    """Profiles requests that ask for it, within a rate and disk budget."""
+
+    def __init__(self, directory=None, max_files=50, min_interval=10.0, sample_interval=0.005,
+                 token=None, clock=time.monotonic):
+        """Initializes the RequestProfiler.
+
+        Args:
+            directory (str, optional): Where profiles are saved. Defaults to
+                None, which turns profiling off.
+            max_files (int, optional): Profiles kept before the oldest are
+                deleted. Defaults to 50.
+            min_interval (float, optional): Seconds between the starts of
+                two profiles. Defaults to 10.0.
+            sample_interval (float, optional): Seconds between stack samples
+                in 'sample' mode. Defaults to 0.005.
+            token (str, optional): Secret requests must present. Defaults to
+                None, which accepts any request.
+            clock (callable, optional): Returns the current time in seconds.
+                Defaults to time.monotonic.
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self.min_interval = min_interval
+        self.sample_interval = sample_interval
+        self.token = token
+        self.clock = clock
+        self._busy = threading.Lock()
+        self._last_start = None
+        self._ids = itertools.count()
+
+    @property
+    def enabled(self):
+        """bool: Whether profiles can be taken at all."""
+        return bool(self.directory)
+
+    def requested_mode(self, flag, token=None):
+        """Works out which collector a request asked for.
+
+        Args:
+            flag (str or None): The 'profile' parameter or header value.
+            token (str, optional): The token the request presented.
+
+        Returns:
+            str or None: 'cprofile' or 'sample', or None if the request
+                didn't ask, asked for an unknown mode or lacks the token.
+        """
+        mode = PROFILE_MODES.get((flag or "").strip().lower())
+        if mode is None or not self.enabled:
+            return None
+        if self.token and not secrets.compare_digest(token or "", self.token):
+            return None
+        return mode
+
+    def mode_for_query(self, query):
+        """Works out the requested collector from a URL query string.
+
+        Args:
+            query (str): The query string, with or without the leading '?'.
+
+        Returns:
+            str or None: See requested_mode().
+        """
+        params = parse_qs(query.lstrip("?"))
+        flag = params.get(PROFILE_PARAM, [None])[-1]
+        token = params.get(PROFILE_TOKEN_PARAM, [None])[-1]
+        return self.requested_mode(flag, token)
+
+    def start(self, label, mode):
+        """Starts a profile, unless another is running or one started too recently.
+
+        Args:
+            label (str): What is being profiled, used in the file name.
+            mode (str): 'cprofile' or 'sample'.
+
+        Returns:
+            ProfileSession or None: The running profile, or None if it was
+                refused.
+        """
+        if not self.enabled or mode not in PROFILE_SUFFIXES:
+            return None
+        if not self._busy.acquire(blocking=False):
+            return None
+        now = self.clock()
+        if self._last_start is not None and now - self._last_start < self.min_interval:
+            self._busy.release()
+            return None
+        self._last_start = now
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            session = ProfileSession(self, label, mode)
+        except BaseException:
+            self._busy.release()
+            raise
+        if not session.start():
+            # Another profiler, such as a debugger's, already owns the thread
+            self._busy.release()
+            return None
+        return session
+
+    def _path(self, label, mode):
+        """Returns a new file path for a profile."""
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-")[:60] or "request"
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(self._ids)}-{slug}"
+        return os.path.join(self.directory, name + PROFILE_SUFFIXES[mode])
+
+    def _finished(self):
+        """Deletes the oldest profiles beyond max_files and frees the profiler."""
+        try:
+            paths = [
+                os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith(tuple(PROFILE_SUFFIXES.values()))
+            ]
+            paths.sort(key=os.path.getmtime)
+            for path in paths[:max(len(paths) - self.max_files, 0)]:
+                os.remove(path)
+        except OSError:
+            pass  # Another worker pruned the same files first
+        finally:
+            self._busy.release()
+
+
+class ProfileSession:
+    """One running profile; stop() saves it."""
+
+    def __init__(self, profiler, label, mode):
+        self.profiler = profiler
+        self.label = label
+        self.mode = mode
+        self.path = profiler._path(label, mode)
+        self._profile = None
+        self._sampler = None
+        self._stopped = False
+
+    def start(self):
+        """Starts collecting.
+
+        Returns:
+            bool: False if cProfile couldn't be enabled on this thread.
+        """
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError:
+                return False
+        else:
+            self._sampler = _StackSampler(self.profiler.sample_interval)
+            self._sampler.start()
+        return True
+
+    def stop(self):
+        """Stops collecting and saves the profile. Later calls do nothing.
+
+        cProfile sessions must be stopped on the thread that started them.
+
+        Returns:
+            str: Path of the saved profile.
+        """
+        if self._stopped:
+            return self.path
+        self._stopped = True
+        try:
+            if self._profile is not None:
+                self._profile.disable()
+                self._profile.dump_stats(self.path)
+            else:
+                self._sampler.stop()
+                with open(self.path, "w", encoding="utf-8") as f:
+                    for stack, count in self._sampler.counts.most_common():
+                        f.write(f"{stack} {count}\n")
+        finally:
+            self.profiler._finished()
+        return self.path
+
+
+class _StackSampler(threading.Thread):
+    """Counts the stacks of every other thread at a fixed interval."""
+
+    def __init__(self, interval):
+        super().__init__(name="studybuddy-profile-sampler", daemon=True)
+        self.interval = interval
+        self.counts = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self._done.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+# Profiler shared by the HTTP middleware and the UI's event handlers
+request_profiler = RequestProfiler(os.environ.get(PROFILE_DIR_ENV), token=os.environ.get(PROFILE_TOKEN_ENV))
@@ -0,0 +1,107 @@
+"""Batch schedule generation for the StudyBuddy Scheduler.
+
+This script generates schedules for many students in one call, such as a
+whole cohort overnight. The start date is fixed once for the batch, each
+distinct deadline string is parsed once for all students, and students
+are fanned out in chunks across a pool of worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from scheduler.registry import registry
+from scheduler.utils import DateParseError, calendar_for, parse_date
+
+# Per-process scheduler set up by _init_worker
+_worker = {}
+
+
+def resolve_deadlines(students):
+    """Replaces deadline strings with dates, parsing each distinct string once.
+
+    Args:
+        students (list of list of dict): Each student's list of courses.
+
+    Returns:
+        list of list of dict: The same courses, with string deadlines
+            replaced by datetime.date objects where they are valid. Input
+            dicts are not modified.
+    """
+    parsed = {}
+    resolved_students = []
+    for courses in students:
+        resolved = []
+        for course in courses:
+            deadline = course.get("deadline")
+            if isinstance(deadline, str):
+                day = parsed.get(deadline)
+                if day is None:
+                    try:
+                        day = parse_date(deadline)
+                    except DateParseError:
+                        day = deadline  # Left for the strategy to skip
+                    parsed[deadline] = day
+                course = {**course, "deadline": day}
+            resolved.append(course)
+        resolved_students.append(resolved)
+    return resolved_students
+
+
+def _init_worker(strategy, backend, options, today, columnar):
+    """Creates the scheduler a worker process uses for every student."""
+    _worker["strategy"] = registry.create(strategy, backend, options)
+    _worker["today"] = today
+    _worker["columnar"] = columnar
+    calendar_for(today)
+
+
+def _schedule_student(courses):
+    """Schedules one student's courses with the worker's scheduler."""
+    if _worker["columnar"]:
+        return _worker["strategy"].schedule_blocks(courses, _worker["today"])
+    return _worker["strategy"].schedule(courses, _worker["today"])
+
+
+def generate_batch(students, strategy="even", backend="python", options=None,
+                   workers=None, chunksize=64, columnar=False, today=None):
+    """Generates schedules for many students.
+
+    Args:
+        students (list of list of dict): Each student's list of courses,
+            where each course is a dictionary containing 'course',
+            'deadline', and 'hours' keys.
+        strategy (str, optional): Strategy name. Defaults to 'even'.
+        backend (str, optional): Strategy backend. Defaults to 'python'.
+        options (dict, optional): Keyword arguments for the strategy.
+            Defaults to None.
+        workers (int, optional): Worker processes; 0 or 1 runs in this
+            process. Defaults to the number of CPUs.
+        chunksize (int, optional): Students sent to a worker at a time.
+            Defaults to 64.
+        columnar (bool, optional): Return ScheduleBlocks, which are much
+            cheaper to send back from workers than lists of dicts.
+            Defaults to False.
+        today (datetime.date, optional): First day of every schedule.
+            Defaults to the current date.
+
+    Returns:
+        list: One schedule per student, in input order.
+
+    Raises:
+        ValueError: If the strategy or backend is unknown.
+    """
+    today = today or datetime.today().date()
+    registry.create(strategy, backend, options)  # Fail fast on bad names
+    students = resolve_deadlines(students)
+    init_args = (strategy, backend, options, today, columnar)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, -(-len(students) // max(chunksize, 1)))
+    if workers <= 1:
+        _init_worker(*init_args)
+        return [_schedule_student(courses) for courses in students]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as executor:
+        return list(executor.map(_schedule_student, students, chunksize=chunksize))
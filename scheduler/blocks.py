@@ -0,0 +1,401 @@
+"""Columnar schedule storage for the StudyBuddy Scheduler.
+
+This script defines the ScheduleBlocks class, a compact container for
+schedule blocks that stores each field in a typed array instead of one
+dict per block, while still iterating like a list of block dicts.
+"""
+
+import hashlib
+import json
+from array import array
+from collections import defaultdict
+from datetime import date
+
+# Block types known up front; any other type gets the next free code
+STUDY = 0
+BREAK = 1
+BLOCK_TYPES = ("study", "break")
+
+# Range of the 16-bit duration column; longer blocks widen it to 64 bits
+DURATION_MIN = -2**15
+DURATION_MAX = 2**15 - 1
+
+
+class ScheduleBlocks:
+    """Schedule blocks stored as columns.
+
+    Course names and block types are interned once and referenced by small
+    integer ids, dates are stored as ordinals and durations as 16-bit
+    integers, which takes about 11 bytes per block instead of a dict with
+    four keys and a date string.
+
+    Iterating yields the same dicts the strategies produce, so code written
+    for a list of block dicts keeps working.
+    """
+
+    def __init__(self):
+        """Initializes an empty ScheduleBlocks."""
+        self.course_names = []
+        self.block_names = list(BLOCK_TYPES)
+        self._course_ids = {}
+        self._block_ids = {name: i for i, name in enumerate(BLOCK_TYPES)}
+        self._date_strings = {}
+        # Set while the lookup tables are shared with a slice or its parent
+        self._shared = False
+        self.course_ids = array("I")
+        self.ordinals = array("i")
+        self.durations = array("h")
+        self.block_types = array("B")
+
+    @classmethod
+    def from_dicts(cls, blocks):
+        """Builds a ScheduleBlocks from block dicts.
+
+        Args:
+            blocks (iterable of dict): Blocks with 'course', 'block',
+                'duration', and 'date' keys, dates in 'YYYY-MM-DD' format.
+
+        Returns:
+            ScheduleBlocks: The blocks in columnar form.
+        """
+        result = cls()
+        for block in blocks:
+            result.append(block["course"], block["block"], block["duration"], block["date"])
+        return result
+
+    @classmethod
+    def from_columns(cls, course_names, course_ids, ordinals, durations, block_type=STUDY,
+                     block_names=None, block_types=None):
+        """Builds a ScheduleBlocks directly from column values.
+
+        Args:
+            course_names (list of str): Course name for each course id. A
+                name may repeat; its ids are merged.
+            course_ids (iterable of int): Course id of each block.
+            ordinals (iterable of int): Date of each block as a proleptic
+                Gregorian ordinal.
+            durations (iterable of int): Minutes of each block. A typed
+                array keeps its width.
+            block_type (int, optional): Block type code shared by all blocks.
+                Defaults to STUDY.
+            block_names (list of str, optional): Block type name for each
+                code in block_types. Defaults to BLOCK_TYPES.
+            block_types (iterable of int, optional): Block type code of each
+                block, used instead of block_type. Defaults to None.
+
+        Returns:
+            ScheduleBlocks: The blocks in columnar form.
+        """
+        result = cls()
+        ids = [result._intern_course(name) for name in course_names]
+        if ids != list(range(len(ids))):
+            # Repeated names share one id, so recode the blocks that use them
+            course_ids = [ids[course_id] for course_id in course_ids]
+        result.course_ids.extend(course_ids)
+        result.ordinals.extend(ordinals)
+        if isinstance(durations, array):
+            result.durations = array(durations.typecode, durations)
+        else:
+            result._extend_durations(durations)
+        if block_types is None:
+            result.block_types.extend([block_type] * len(result.course_ids))
+            return result
+        codes = [result._intern_block(name) for name in block_names or ()]
+        if codes != list(range(len(codes))):
+            # The names are in a different order than ours, so recode
+            block_types = [codes[code] for code in block_types]
+        result.block_types.extend(block_types)
+        return result
+
+    @classmethod
+    def concat(cls, parts):
+        """Joins ScheduleBlocks end to end without going through block dicts.
+
+        Names are interned in the order the parts list them, so joining the
+        days of a schedule built with from_dicts() gives the same tables and
+        digest as building the whole schedule with from_dicts().
+
+        Args:
+            parts (iterable of ScheduleBlocks): The blocks to join, in order.
+
+        Returns:
+            ScheduleBlocks: The blocks of all parts.
+        """
+        result = cls()
+        for part in parts:
+            courses = [result._intern_course(name) for name in part.course_names]
+            codes = [result._intern_block(name) for name in part.block_names]
+            if courses == list(range(len(courses))):
+                result.course_ids.extend(part.course_ids)
+            else:
+                result.course_ids.extend(map(courses.__getitem__, part.course_ids))
+            if codes == list(range(len(codes))):
+                result.block_types.extend(part.block_types)
+            else:
+                result.block_types.extend(map(codes.__getitem__, part.block_types))
+            result.ordinals.extend(part.ordinals)
+            durations = part.durations
+            if durations.typecode != result.durations.typecode:
+                if result.durations.typecode == "h":
+                    # A wide part widens the result, as from_dicts() would
+                    result.durations = array(durations.typecode, result.durations)
+                else:
+                    durations = array(result.durations.typecode, durations)
+            result.durations.extend(durations)
+        return result
+
+    def _intern_course(self, name):
+        """Returns the id of a course name, adding it if it's new."""
+        course_id = self._course_ids.get(name)
+        if course_id is None:
+            self._unshare()
+            course_id = self._course_ids[name] = len(self.course_names)
+            self.course_names.append(name)
+        return course_id
+
+    def _intern_block(self, name):
+        """Returns the code of a block type, adding it if it's new."""
+        code = self._block_ids.get(name)
+        if code is None:
+            self._unshare()
+            code = self._block_ids[name] = len(self.block_names)
+            self.block_names.append(name)
+        return code
+
+    def _unshare(self):
+        """Copies the lookup tables before adding to them, if they're shared."""
+        if self._shared:
+            self.course_names = list(self.course_names)
+            self.block_names = list(self.block_names)
+            self._course_ids = dict(self._course_ids)
+            self._block_ids = dict(self._block_ids)
+            self._shared = False
+
+    def _extend_durations(self, durations):
+        """Appends durations, widening the column if one doesn't fit in 16 bits."""
+        durations = list(durations)
+        # Widen before extending: a failed extend keeps the items before the
+        # one that overflowed
+        if self.durations.typecode == "h" and durations and (
+            max(durations) > DURATION_MAX or min(durations) < DURATION_MIN
+        ):
+            self.durations = array("q", self.durations)
+        self.durations.extend(durations)
+
+    def date_string(self, ordinal):
+        """Formats a date ordinal as 'YYYY-MM-DD', caching the result.
+
+        Args:
+            ordinal (int): A proleptic Gregorian ordinal.
+
+        Returns:
+            str: The ISO date string.
+        """
+        text = self._date_strings.get(ordinal)
+        if text is None:
+            text = self._date_strings[ordinal] = date.fromordinal(ordinal).isoformat()
+        return text
+
+    def append(self, course, block, duration, day):
+        """Appends one block.
+
+        Args:
+            course (str): Course name.
+            block (str): Block type, e.g. 'study' or 'break'.
+            duration (int): Minutes.
+            day (str or datetime.date): Date of the block.
+        """
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        self.course_ids.append(self._intern_course(course))
+        self.ordinals.append(day.toordinal())
+        self._extend_durations([duration])
+        self.block_types.append(self._intern_block(block))
+
+    def extend_rows(self, rows):
+        """Appends blocks in bulk, parsing each distinct date only once.
+
+        Args:
+            rows (iterable of tuple): (course, block, duration, date) per
+                block, dates as 'YYYY-MM-DD' strings or datetime.date.
+        """
+        ordinals = {}
+        course_ids = self._course_ids
+        block_ids = self._block_ids
+        course_column = array("I")
+        ordinal_column = array("i")
+        block_column = array("B")
+        durations = []
+        for course, block, duration, day in rows:
+            course_id = course_ids.get(course)
+            if course_id is None:
+                course_id = self._intern_course(course)
+                course_ids = self._course_ids
+            code = block_ids.get(block)
+            if code is None:
+                code = self._intern_block(block)
+                block_ids = self._block_ids
+            ordinal = ordinals.get(day)
+            if ordinal is None:
+                ordinal = ordinals[day] = (date.fromisoformat(day) if isinstance(day, str) else day).toordinal()
+            course_column.append(course_id)
+            ordinal_column.append(ordinal)
+            block_column.append(code)
+            durations.append(duration)
+        self.course_ids.extend(course_column)
+        self.ordinals.extend(ordinal_column)
+        self._extend_durations(durations)
+        self.block_types.extend(block_column)
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def row(self, index):
+        """Returns one block as a tuple.
+
+        Args:
+            index (int): Block index.
+
+        Returns:
+            tuple: (course, block, duration, date) for the block.
+        """
+        return (
+            self.course_names[self.course_ids[index]],
+            self.block_names[self.block_types[index]],
+            self.durations[index],
+            self.date_string(self.ordinals[index]),
+        )
+
+    def iter_rows(self):
+        """Iterates over the blocks as (course, block, duration, date) tuples.
+
+        Yields:
+            tuple: One block per row, in order.
+        """
+        courses = self.course_names
+        blocks = self.block_names
+        date_string = self.date_string
+        for course_id, block_type, duration, ordinal in zip(
+            self.course_ids, self.block_types, self.durations, self.ordinals
+        ):
+            yield courses[course_id], blocks[block_type], duration, date_string(ordinal)
+
+    def __iter__(self):
+        for course, block, duration, day in self.iter_rows():
+            yield {"course": course, "block": block, "duration": duration, "date": day}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._with_columns(
+                self.course_ids[index], self.ordinals[index],
+                self.durations[index], self.block_types[index],
+            )
+        course, block, duration, day = self.row(index)
+        return {"course": course, "block": block, "duration": duration, "date": day}
+
+    def __eq__(self, other):
+        if isinstance(other, ScheduleBlocks):
+            return len(self) == len(other) and all(a == b for a, b in zip(self.iter_rows(), other.iter_rows()))
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ScheduleBlocks({len(self)} blocks, {len(self.course_names)} courses)"
+
+    def _with_columns(self, course_ids, ordinals, durations, block_types):
+        """Returns a ScheduleBlocks over new columns sharing this one's lookup tables.
+
+        Both copy the tables before adding a name to them, so appending to
+        one never changes the other's names or digest.
+        """
+        self._shared = True
+        result = ScheduleBlocks.__new__(ScheduleBlocks)
+        result._shared = True
+        result.course_names = self.course_names
+        result.block_names = self.block_names
+        result._course_ids = self._course_ids
+        result._block_ids = self._block_ids
+        result._date_strings = self._date_strings
+        result.course_ids = course_ids
+        result.ordinals = ordinals
+        result.durations = durations
+        result.block_types = block_types
+        return result
+
+    def take(self, indices):
+        """Selects blocks by index.
+
+        Args:
+            indices (iterable of int): Indices of the blocks to keep, in order.
+
+        Returns:
+            ScheduleBlocks: The selected blocks.
+        """
+        indices = list(indices)
+        return self._with_columns(
+            array(self.course_ids.typecode, [self.course_ids[i] for i in indices]),
+            array(self.ordinals.typecode, [self.ordinals[i] for i in indices]),
+            array(self.durations.typecode, [self.durations[i] for i in indices]),
+            array(self.block_types.typecode, [self.block_types[i] for i in indices]),
+        )
+
+    def group_by_date(self):
+        """Groups the blocks by date in one pass over the date column.
+
+        Returns:
+            dict: ScheduleBlocks per 'YYYY-MM-DD' date, in date order, each
+                keeping the original order of that day's blocks.
+        """
+        indices = defaultdict(list)
+        for i, ordinal in enumerate(self.ordinals):
+            indices[ordinal].append(i)
+        return {self.date_string(ordinal): self.take(indices[ordinal]) for ordinal in sorted(indices)}
+
+    def sum_by_course(self, block=None):
+        """Totals the minutes per course.
+
+        Args:
+            block (str, optional): Only count blocks of this type, e.g.
+                'study'. Defaults to counting every block.
+
+        Returns:
+            dict: Minutes per course, in order of first appearance.
+        """
+        totals = {}
+        code = self._block_ids.get(block) if block is not None else None
+        if block is not None and code is None:
+            return totals
+        for course_id, block_type, duration in zip(self.course_ids, self.block_types, self.durations):
+            if code is None or block_type == code:
+                totals[course_id] = totals.get(course_id, 0) + duration
+        return {self.course_names[course_id]: minutes for course_id, minutes in totals.items()}
+
+    def to_dicts(self):
+        """Converts the blocks to a list of block dicts.
+
+        Returns:
+            list of dict: Blocks with 'course', 'block', 'duration', and 'date' keys.
+        """
+        return list(self)
+
+    def digest(self):
+        """Hashes the schedule content.
+
+        Returns:
+            bytes: A SHA-256 digest of the lookup tables and columns.
+        """
+        h = hashlib.sha256()
+        h.update(json.dumps([self.course_names, self.block_names]).encode("utf-8"))
+        for column in (self.course_ids, self.ordinals, self.durations, self.block_types):
+            h.update(column.typecode.encode("ascii"))
+            h.update(column.tobytes())
+        return h.digest()
+
+    @property
+    def nbytes(self):
+        """int: Bytes used by the column arrays."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.course_ids, self.ordinals, self.durations, self.block_types)
+        )
@@ -0,0 +1,131 @@
+"""Capacity-aware scheduling for the StudyBuddy Scheduler.
+
+This script defines the CapacityStrategy class, which fits study time for
+all courses into a limited number of hours per day, skipping blackout
+dates and unavailable weekdays, and reports any time that can't be
+scheduled before its deadline.
+"""
+
+import heapq
+from datetime import date, datetime, timedelta
+
+from scheduler.strategy import SchedulingStrategy
+from scheduler.utils import calendar_for, parse_deadlines
+
+
+class CapacityStrategy(SchedulingStrategy):
+    """Schedules study blocks earliest-deadline-first under a daily cap.
+
+    Each available day is filled with the course whose deadline is closest,
+    moving on to the next course once one is fully scheduled. With C courses
+    and D days until the last deadline this runs in O((C + D) log C).
+    """
+
+    def __init__(self, daily_hours=4, blackout_dates=(), weekdays=range(7)):
+        """Initializes the CapacityStrategy.
+
+        Args:
+            daily_hours (float, optional): Maximum study hours per day.
+                Defaults to 4.
+            blackout_dates (iterable, optional): Dates with no study time, as
+                datetime.date objects or 'YYYY-MM-DD' strings. Defaults to none.
+            weekdays (iterable of int, optional): Weekdays available for
+                studying, 0 for Monday through 6 for Sunday. Defaults to all.
+
+        Raises:
+            ValueError: If the cap is negative or a date or weekday is invalid.
+        """
+        self.daily_minutes = int(round(float(daily_hours) * 60))
+        if self.daily_minutes < 0:
+            raise ValueError("daily_hours must not be negative")
+        self.blackout_dates = {
+            d if isinstance(d, date) else date.fromisoformat(str(d).strip())
+            for d in blackout_dates
+        }
+        self.weekdays = frozenset(int(w) for w in weekdays)
+        if not self.weekdays <= set(range(7)):
+            raise ValueError(f"Weekdays must be between 0 and 6: {sorted(self.weekdays)}")
+
+    def is_available(self, day):
+        """Checks whether study time can be scheduled on a day.
+
+        Args:
+            day (datetime.date): The day to check.
+
+        Returns:
+            bool: True if the day is an available weekday and not blacked out.
+        """
+        return day.weekday() in self.weekdays and day not in self.blackout_dates
+
+    def plan(self, courses, today=None):
+        """Generates a capacity-limited schedule and reports what didn't fit.
+
+        Courses whose deadline has passed are due today.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+
+        Returns:
+            tuple: The list of scheduled blocks in date order, and a dict of
+                minutes per course that could not be scheduled before the
+                course's deadline (empty if the schedule is feasible).
+        """
+        today = today or datetime.today().date()
+        calendar = calendar_for(today)
+        heap = []
+        for index, (deadline, course) in enumerate(parse_deadlines(courses)):
+            try:
+                total_minutes = int(float(course["hours"])) * 60
+                deadline = max(deadline, today)
+            except (ValueError, KeyError):
+                continue
+            if total_minutes > 0:
+                heap.append(((deadline - today).days, index, course["course"], total_minutes))
+        heapq.heapify(heap)
+
+        schedule = []
+        unscheduled = {}
+        day_offset = 0
+        while heap:
+            day = today + timedelta(days=day_offset)
+            capacity = self.daily_minutes if self.is_available(day) else 0
+            date_str = None
+
+            while heap and heap[0][0] < day_offset:
+                _, _, name, remaining = heapq.heappop(heap)
+                unscheduled[name] = unscheduled.get(name, 0) + remaining
+
+            while heap and capacity > 0:
+                last_day, index, name, remaining = heap[0]
+                duration = min(remaining, capacity)
+                if date_str is None:
+                    date_str = calendar.date_string(day_offset)
+                schedule.append({"course": name, "block": "study", "duration": duration, "date": date_str})
+                capacity -= duration
+                if duration == remaining:
+                    heapq.heappop(heap)
+                else:
+                    heapq.heapreplace(heap, (last_day, index, name, remaining - duration))
+
+            day_offset += 1
+
+        return schedule, unscheduled
+
+    def schedule(self, courses, today=None):
+        """Generates a capacity-limited schedule.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+
+        Returns:
+            list of dict: A list of scheduled blocks, sorted by date. Time
+                that doesn't fit before a deadline is left out; use plan()
+                to find out how much.
+        """
+        return self.plan(courses, today)[0]
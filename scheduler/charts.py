@@ -0,0 +1,368 @@
+"""Chart rendering for the StudyBuddy Scheduler.
+
+This script generates pie charts of study durations by course. Charts are
+drawn as SVG in pure Python; the PNG renderer imports matplotlib only when
+it is called, so importing the scheduler never pays for matplotlib.
+"""
+
+import asyncio
+import base64
+import functools
+import math
+import os
+import threading
+import urllib.parse
+import weakref
+from collections import OrderedDict, defaultdict
+from html import escape
+from io import BytesIO
+
+from monitoring.metrics import metrics, timed
+
+# Matplotlib's Set3 palette, so SVG and PNG charts use the same colors
+SET3_COLORS = [
+    "#8dd3c7", "#ffffb3", "#bebada", "#fb8072", "#80b1d3", "#fdb462",
+    "#b3de69", "#fccde5", "#d9d9d9", "#bc80bd", "#ccebc5", "#ffed6f",
+]
+
+CHART_SECONDS = metrics.histogram(
+    "studybuddy_chart_render_seconds", "Time to render a pie chart that wasn't cached.", ("format",)
+)
+
+def course_durations(blocks):
+    """Totals the scheduled minutes per course.
+
+    Args:
+        blocks (list of dict): List of schedule blocks, where each block
+            contains 'course' and 'duration' keys.
+
+    Returns:
+        dict: Minutes per course, in order of first appearance.
+    """
+    durations = defaultdict(int)
+    for block in blocks:
+        durations[block["course"]] += block["duration"]
+    return dict(durations)
+
+def generate_pie_chart(blocks, size=300):
+    """Generates an SVG pie chart for study durations by course.
+
+    Args:
+        blocks (list of dict): List of schedule blocks, where each block
+            contains 'course' and 'duration' keys.
+        size (int, optional): Width and height of the chart in pixels.
+            Defaults to 300.
+
+    Returns:
+        str: SVG markup of the pie chart.
+    """
+    return render_pie_svg(course_durations(blocks), size)
+
+@timed(CHART_SECONDS, ("svg",))
+def render_pie_svg(durations, size=300):
+    """Renders an SVG pie chart from per-course totals.
+
+    Slices start at 140 degrees and run counterclockwise, with percentage
+    labels inside each slice and course labels outside, like matplotlib's
+    ax.pie(..., autopct='%1.0f%%', startangle=140).
+
+    Args:
+        durations (dict): Minutes per course.
+        size (int, optional): Width and height of the chart in pixels.
+            Defaults to 300.
+
+    Returns:
+        str: SVG markup of the pie chart.
+    """
+    total = sum(durations.values())
+    center = size / 2
+    radius = size * 0.3
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {size} {size}" font-family="sans-serif" font-size="{size / 25:.0f}">'
+    ]
+
+    angle = math.radians(140)
+    for i, (label, minutes) in enumerate(durations.items()):
+        if total <= 0 or minutes <= 0:
+            continue
+        fraction = minutes / total
+        color = SET3_COLORS[i % len(SET3_COLORS)]
+        sweep = 2 * math.pi * fraction
+        end = angle + sweep
+
+        if fraction >= 1:
+            parts.append(f'<circle cx="{center:.2f}" cy="{center:.2f}" r="{radius:.2f}" fill="{color}"/>')
+        else:
+            x1, y1 = _point(center, radius, angle)
+            x2, y2 = _point(center, radius, end)
+            large_arc = 1 if sweep > math.pi else 0
+            parts.append(
+                f'<path d="M{center:.2f},{center:.2f} L{x1:.2f},{y1:.2f} '
+                f'A{radius:.2f},{radius:.2f} 0 {large_arc} 0 {x2:.2f},{y2:.2f} Z" fill="{color}"/>'
+            )
+
+        middle = angle + sweep / 2
+        px, py = _point(center, radius * 0.6, middle)
+        lx, ly = _point(center, radius * 1.1, middle)
+        anchor = "start" if math.cos(middle) >= 0 else "end"
+        parts.append(f'<text x="{px:.2f}" y="{py:.2f}" text-anchor="middle" dominant-baseline="middle">{fraction * 100:.0f}%</text>')
+        parts.append(f'<text x="{lx:.2f}" y="{ly:.2f}" text-anchor="{anchor}" dominant-baseline="middle">{escape(str(label))}</text>')
+        angle = end
+
+    parts.append("</svg>")
+    return "".join(parts)
+
+def _point(center, radius, angle):
+    """Returns the SVG coordinates of a point on a circle (y grows downward)."""
+    return center + radius * math.cos(angle), center - radius * math.sin(angle)
+
+@functools.lru_cache(maxsize=512)
+def svg_data_uri(svg):
+    """Wraps SVG markup in a data URI usable as an image source.
+
+    Args:
+        svg (str): SVG markup.
+
+    Returns:
+        str: A 'data:image/svg+xml' URI.
+    """
+    return "data:image/svg+xml;charset=utf-8," + urllib.parse.quote(svg)
+
+class ChartCache:
+    """Size-bounded LRU cache of rendered pie charts.
+
+    Charts are keyed on the per-course minute totals they show, so any day
+    with the same totals, in any session, reuses the same chart.
+    """
+
+    def __init__(self, max_entries=512):
+        """Initializes an empty ChartCache.
+
+        Args:
+            max_entries (int, optional): Maximum number of charts kept before
+                the least recently used one is evicted. Defaults to 512.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._charts = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(durations, fmt="svg", size=300):
+        """Builds the cache key for a chart.
+
+        Args:
+            durations (dict): Minutes per course, in slice order.
+            fmt (str, optional): Chart format, 'svg' or 'png'. Defaults to 'svg'.
+            size (int, optional): Chart size in pixels. Defaults to 300.
+
+        Returns:
+            tuple: A hashable key.
+        """
+        return (fmt, size, tuple(durations.items()))
+
+    def lookup(self, key):
+        """Returns a cached chart and counts the hit or miss.
+
+        Args:
+            key (tuple): Key from make_key().
+
+        Returns:
+            str or None: The cached chart, or None on a miss.
+        """
+        with self._lock:
+            chart = self._charts.get(key)
+            if chart is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._charts.move_to_end(key)
+            return chart
+
+    def store(self, key, chart):
+        """Adds a chart to the cache, evicting the least recently used one if full.
+
+        Args:
+            key (tuple): Key from make_key().
+            chart (str): The rendered chart.
+        """
+        with self._lock:
+            self._charts[key] = chart
+            self._charts.move_to_end(key)
+            while len(self._charts) > self.max_entries:
+                self._charts.popitem(last=False)
+
+    def get_svg(self, durations, size=300):
+        """Returns the SVG chart for per-course totals, rendering it on a miss.
+
+        Args:
+            durations (dict): Minutes per course, in slice order.
+            size (int, optional): Width and height of the chart in pixels.
+                Defaults to 300.
+
+        Returns:
+            str: SVG markup of the pie chart.
+        """
+        key = self.make_key(durations, "svg", size)
+        svg = self.lookup(key)
+        if svg is None:
+            svg = render_pie_svg(durations, size)
+            self.store(key, svg)
+        return svg
+
+    def stats(self):
+        """Reports the cache size and hit/miss counters.
+
+        Returns:
+            dict: 'hits', 'misses' and 'size' counts.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._charts)}
+
+    def clear(self):
+        """Empties the cache and resets its counters."""
+        with self._lock:
+            self._charts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Cache shared by every CalendarView session
+chart_cache = ChartCache()
+
+def cached_pie_chart(blocks, size=300):
+    """Generates an SVG pie chart like generate_pie_chart, using chart_cache.
+
+    Args:
+        blocks (list of dict): List of schedule blocks, where each block
+            contains 'course' and 'duration' keys.
+        size (int, optional): Width and height of the chart in pixels.
+            Defaults to 300.
+
+    Returns:
+        str: SVG markup of the pie chart.
+    """
+    return chart_cache.get_svg(course_durations(blocks), size)
+
+def render_pie_png(durations):
+    """Renders a PNG pie chart from per-course totals with matplotlib.
+
+    Uses the object-oriented Figure and Agg canvas API rather than pyplot's
+    global state, so it is safe to call from threads and worker processes.
+
+    Args:
+        durations (dict): Minutes per course.
+
+    Returns:
+        str: Base64-encoded PNG image of the pie chart.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    labels = list(durations.keys())
+    sizes = list(durations.values())
+    colors = [SET3_COLORS[i % len(SET3_COLORS)] for i in range(len(labels))]
+
+    fig = Figure(figsize=(3, 3), dpi=100)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.pie(sizes, labels=labels, autopct='%1.0f%%', startangle=140, colors=colors)
+    ax.axis('equal')  # Equal aspect ratio for a perfect circle
+
+    buf = BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight', transparent=True)
+    return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+def generate_pie_chart_png(blocks):
+    """Generates a PNG pie chart for study durations by course with matplotlib.
+
+    Args:
+        blocks (list of dict): List of schedule blocks, where each block
+            contains 'course' and 'duration' keys.
+
+    Returns:
+        str: Base64-encoded PNG image of the pie chart.
+    """
+    return render_pie_png(course_durations(blocks))
+
+class ChartRenderPool:
+    """Renders PNG charts on a bounded pool of worker processes.
+
+    Callers await the result without blocking the event loop. At most
+    max_pending renders are queued per event loop; further callers wait
+    for a slot, so a burst of requests can't pile up unbounded work.
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, cache=None):
+        """Initializes the pool. Worker processes start on first use.
+
+        Args:
+            max_workers (int, optional): Number of worker processes.
+                Defaults to the number of CPUs, capped at 4.
+            max_pending (int, optional): Renders allowed in flight per event
+                loop before callers wait. Defaults to 4 per worker.
+            cache (ChartCache, optional): Cache for rendered charts.
+                Defaults to chart_cache.
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending or self.max_workers * 4
+        self.cache = cache if cache is not None else chart_cache
+        self._executor = None
+        self._slots = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """Returns the process pool, starting it if needed."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers don't inherit the server's threads or locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _get_slots(self):
+        """Returns the semaphore bounding pending renders for the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._slots.get(loop)
+            if slots is None:
+                slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+            return slots
+
+    async def render_png(self, durations):
+        """Renders a PNG chart in a worker process, or returns it from the cache.
+
+        Args:
+            durations (dict): Minutes per course, in slice order.
+
+        Returns:
+            str: Base64-encoded PNG image of the pie chart.
+        """
+        key = self.cache.make_key(durations, "png")
+        png = self.cache.lookup(key)
+        if png is not None:
+            return png
+        async with self._get_slots():
+            loop = asyncio.get_running_loop()
+            with CHART_SECONDS.time(("png",)):
+                png = await loop.run_in_executor(self._get_executor(), render_pie_png, dict(durations))
+        self.cache.store(key, png)
+        return png
+
+    def shutdown(self):
+        """Stops the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+# Pool shared by every CalendarView session
+chart_pool = ChartRenderPool()
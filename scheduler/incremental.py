@@ -0,0 +1,326 @@
+"""Incremental rescheduling for the StudyBuddy Scheduler.
+
+This script defines the IncrementalScheduler class, which keeps a schedule
+up to date as single courses are added, edited or removed, and the
+ScheduleDiff class, which describes what each change did to the schedule
+so a calendar can be patched instead of rebuilt.
+"""
+
+from datetime import datetime
+
+from scheduler.blocks import ScheduleBlocks
+from scheduler.registry import registry
+from scheduler.result_cache import result_cache
+
+
+class ScheduleDiff:
+    """The per-day changes made to a schedule by one update.
+
+    Each change is a (date, key, blocks) tuple that replaces the blocks the
+    segment under key contributes to that day, or removes them when blocks
+    is None.
+    """
+
+    def __init__(self, changes=None):
+        """Initializes the ScheduleDiff.
+
+        Args:
+            changes (list of tuple, optional): (date, key, blocks) changes.
+                Defaults to no changes.
+        """
+        self.changes = changes or []
+
+    @property
+    def days(self):
+        """list of str: The dates whose blocks changed, in date order."""
+        return sorted({date for date, _, _ in self.changes})
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def __len__(self):
+        return len(self.changes)
+
+    def extend(self, other):
+        """Appends the changes of a later diff to this one.
+
+        Args:
+            other (ScheduleDiff): The later diff.
+
+        Returns:
+            ScheduleDiff: This diff.
+        """
+        self.changes.extend(other.changes)
+        return self
+
+    def apply(self, days):
+        """Patches a schedule grouped by date and segment in place.
+
+        Args:
+            days (dict): Maps date strings to dicts of segment key to the
+                blocks that segment has on that day.
+
+        Returns:
+            dict: The patched days.
+        """
+        for date, key, blocks in self.changes:
+            if blocks is None:
+                segments = days.get(date)
+                if segments is not None:
+                    segments.pop(key, None)
+                    if not segments:
+                        del days[date]
+            else:
+                days.setdefault(date, {})[key] = blocks
+        return days
+
+
+class IncrementalScheduler:
+    """Keeps a schedule current as courses change, one course at a time.
+
+    Strategies flagged 'incremental' in the registry schedule every course
+    on its own, so a change only reschedules that course: editing one course
+    out of 200 costs as much as the days that course covers. Other
+    strategies, such as 'capacity', share days between courses and are
+    replanned as a whole, but the diff still only lists the days whose
+    blocks actually changed. Each day lists its courses in the order the
+    strategy's course_order() gives, as a full run does, and is also kept
+    as a ScheduleBlocks that is rebuilt only when that day changes.
+
+    Per-course schedules and replans go through the result cache, so
+    students who share a course, or a page that is generated again, reuse
+    them.
+    """
+
+    def __init__(self, strategy="even", backend="python", options=None, today=None, cache=result_cache):
+        """Initializes an empty IncrementalScheduler.
+
+        Args:
+            strategy (str, optional): Strategy name. Defaults to 'even'.
+            backend (str, optional): Strategy backend. Defaults to 'python'.
+            options (dict, optional): Keyword arguments for the strategy.
+                Defaults to None.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+            cache (ResultCache, optional): Cache of generated schedules, or
+                None to always recompute. Defaults to the process-wide cache.
+
+        Raises:
+            ValueError: If the strategy or backend is unknown.
+        """
+        self.strategy_name = strategy
+        self.backend = backend
+        self.options = options or {}
+        self.cache = cache
+        self.today = today or datetime.today().date()
+        self.strategy = registry.create(strategy, backend, self.options)
+        self.incremental = registry.capabilities(strategy)["incremental"]
+        self.unscheduled = {}
+        self._courses = {}
+        self._segments = {}
+        self._days = {}
+        self._day_blocks = {}
+        self._rank = {}
+
+    def set_course(self, key, course):
+        """Adds a course or replaces the course stored under a key.
+
+        Args:
+            key: Any hashable that identifies the course across edits.
+            course (dict): Dictionary containing 'course', 'deadline', and
+                'hours' keys.
+
+        Returns:
+            ScheduleDiff: The days that changed.
+        """
+        if key in self._courses and self._courses[key] == course:
+            return ScheduleDiff()
+        self._courses[key] = dict(course)
+        if self.incremental:
+            # Only this course changed, so its days hold every reordered pair
+            moved = self._rerank()
+            return self._patch_days(self._reschedule(key, force=key in moved))
+        return self._patch_days(self._replan())
+
+    def remove_course(self, key):
+        """Removes the course stored under a key.
+
+        Args:
+            key: The key the course was added with.
+
+        Returns:
+            ScheduleDiff: The days that changed.
+        """
+        if key not in self._courses:
+            return ScheduleDiff()
+        del self._courses[key]
+        if self.incremental:
+            self._rerank()
+            return self._patch_days(self._replace(key, {}))
+        return self._patch_days(self._replan())
+
+    def update(self, courses, keys=None):
+        """Brings the schedule in line with a full list of courses.
+
+        Only courses that were added, edited or removed since the last call
+        are rescheduled.
+
+        Args:
+            courses (list of dict): The current courses.
+            keys (list, optional): One unique key per course that stays the
+                same while the course is edited, such as a row id. Defaults to
+                the course positions, which makes deleting a row look like
+                editing every row after it.
+
+        Returns:
+            ScheduleDiff: The days that changed.
+        """
+        if keys is None:
+            keys = range(len(courses))
+        current = dict(zip(keys, courses))
+        changed = [key for key, course in current.items() if self._courses.get(key, None) != course]
+        removed = [key for key in self._courses if key not in current]
+        # Reordering rows can change where courses come within a day
+        reordered = list(current) != list(self._courses)
+        self._courses = {key: dict(course) for key, course in current.items()}
+        if not changed and not removed and not reordered:
+            return ScheduleDiff()
+        if not self.incremental:
+            return self._patch_days(self._replan())
+
+        moved = self._rerank()
+        diff = ScheduleDiff()
+        for key in removed:
+            diff.extend(self._replace(key, {}))
+        for key in changed:
+            diff.extend(self._reschedule(key, force=key in moved))
+        for key in moved.difference(changed):
+            diff.extend(self._replace(key, self._segments.get(key, {}), force=True))
+        return self._patch_days(diff)
+
+    def day(self, date):
+        """Returns the blocks scheduled on one day.
+
+        Args:
+            date (str): The date in 'YYYY-MM-DD' format.
+
+        Returns:
+            list of dict: The day's blocks, course by course in the
+                strategy's order.
+        """
+        segments = self._days.get(date, {})
+        keys = sorted(segments, key=lambda key: self._rank.get(key, -1)) if len(segments) > 1 else segments
+        return [block for key in keys for block in segments[key]]
+
+    def dates(self):
+        """Lists the days that have blocks.
+
+        Returns:
+            list of str: Dates in 'YYYY-MM-DD' format, in date order.
+        """
+        return sorted(self._days)
+
+    def schedule(self):
+        """Returns the whole schedule.
+
+        Returns:
+            list of dict: The blocks a full run of the strategy gives, in
+                the same order once sorted by date.
+        """
+        return [block for date in self.dates() for block in self.day(date)]
+
+    def grouped(self):
+        """Returns the schedule's blocks per day.
+
+        The dict is patched in place by every change, and only the days a
+        change touches are rebuilt, so holding on to it keeps a view of the
+        current schedule. It must not be modified.
+
+        Returns:
+            dict: ScheduleBlocks per 'YYYY-MM-DD' date, like
+                ScheduleBlocks.group_by_date() but not in date order.
+        """
+        return self._day_blocks
+
+    def blocks(self):
+        """Returns the whole schedule in columnar form.
+
+        Returns:
+            ScheduleBlocks: The blocks of schedule(), joined from the
+                columnar days without going through block dicts.
+        """
+        return ScheduleBlocks.concat(self._day_blocks[date] for date in self.dates())
+
+    def _rerank(self):
+        """Records where each course comes within a day, after courses change.
+
+        Returns:
+            set: Keys of courses that now come before or after another course
+                than they did, so their days are reordered even if their
+                blocks stay the same. New courses aren't included.
+        """
+        previous = self._rank
+        keys = list(self._courses)
+        order = self.strategy.course_order([self._courses[key] for key in keys])
+        self._rank = {keys[position]: rank for rank, position in enumerate(order)}
+        kept = [key for key in self._rank if key in previous]
+        before = sorted(kept, key=previous.__getitem__)
+        after = sorted(kept, key=self._rank.__getitem__)
+        return {key for key, moved in zip(before, after) if key != moved}
+
+    def _reschedule(self, key, force=False):
+        """Reschedules the one course stored under a key."""
+        courses = [self._courses[key]]
+        schedule = self._cached(lambda: self.strategy.schedule(courses, self.today), courses)
+        return self._replace(key, self._by_date(schedule), force)
+
+    def _replan(self):
+        """Reschedules all courses together, for non-incremental strategies."""
+        courses = list(self._courses.values())
+        if hasattr(self.strategy, "plan"):
+            schedule, self.unscheduled = self._cached(lambda: self.strategy.plan(courses, self.today), courses, "plan")
+        else:
+            schedule = self._cached(lambda: self.strategy.schedule(courses, self.today), courses)
+        # The whole schedule is one segment, so changes are per day
+        return self._replace(None, self._by_date(schedule))
+
+    def _cached(self, compute, courses, kind="schedule"):
+        """Runs a strategy computation for courses through the result cache."""
+        if self.cache is None:
+            return compute()
+        return self.cache.get_or_compute(
+            compute, self.strategy_name, self.backend, self.options, courses, self.today, kind
+        )
+
+    def _replace(self, key, segment, force=False):
+        """Swaps in a segment's new blocks and records the days that differ.
+
+        With force, every day of the segment is recorded, for a course that
+        moved within its days without its blocks changing.
+        """
+        old = self._segments.pop(key, {})
+        if segment:
+            self._segments[key] = segment
+        changes = [(date, key, None) for date in old if date not in segment]
+        changes.extend((date, key, blocks) for date, blocks in segment.items() if force or old.get(date) != blocks)
+        diff = ScheduleDiff(changes)
+        diff.apply(self._days)
+        return diff
+
+    def _patch_days(self, diff):
+        """Rebuilds the columnar blocks of the days a diff touched."""
+        for date in diff.days:
+            blocks = self.day(date)
+            if blocks:
+                self._day_blocks[date] = ScheduleBlocks.from_dicts(blocks)
+            else:
+                self._day_blocks.pop(date, None)
+        return diff
+
+    @staticmethod
+    def _by_date(schedule):
+        """Groups schedule blocks by date, keeping their order."""
+        segment = {}
+        for block in schedule:
+            segment.setdefault(block["date"], []).append(block)
+        return segment
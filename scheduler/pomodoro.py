@@ -1,76 +1,163 @@
 """Pomodoro scheduling for the StudyBuddy Scheduler.
 
 This script defines the PomodoroScheduler class, which generates study
-schedules using the Pomodoro technique.
+schedules using the Pomodoro technique. Blocks are generated lazily, one
+day at a time, so a window of days can be taken from a long plan without
+building the rest of it.
 """
 
-from datetime import datetime, timedelta
-from scheduler.utils import parse_date
+import heapq
+from datetime import datetime
+from scheduler.strategy import SchedulingStrategy
+from scheduler.utils import calendar_for, deadline_order, parse_deadlines
 
-class PomodoroScheduler:
+class PomodoroScheduler(SchedulingStrategy):
     """Schedules study sessions using the Pomodoro technique.
 
     Breaks study time into 25-minute study blocks followed by 5-minute breaks.
+    Each course's blocks are dealt round-robin over the days until its
+    deadline. Block lengths are configurable, and a longer break can replace
+    every Nth short break of a course on a day.
     """
 
-    def schedule(self, courses):
+    def __init__(self, work_minutes=25, break_minutes=5, long_break_minutes=15, long_break_every=0):
+        """Initializes the PomodoroScheduler.
+
+        Args:
+            work_minutes (int, optional): Length of a study block. Defaults to 25.
+            break_minutes (int, optional): Length of a short break. Defaults to 5.
+            long_break_minutes (int, optional): Length of a long break.
+                Defaults to 15.
+            long_break_every (int, optional): Take a long break after every
+                this many study blocks of a course on a day; 0 never does.
+                Defaults to 0.
+
+        Raises:
+            ValueError: If a length is not positive or long_break_every is
+                negative.
+        """
+        self.work_minutes = int(work_minutes)
+        self.break_minutes = int(break_minutes)
+        self.long_break_minutes = int(long_break_minutes)
+        self.long_break_every = int(long_break_every)
+        if min(self.work_minutes, self.break_minutes, self.long_break_minutes) <= 0:
+            raise ValueError("Pomodoro block lengths must be positive")
+        if self.long_break_every < 0:
+            raise ValueError("long_break_every must not be negative")
+
+    def schedule(self, courses, today=None):
         """Generates a Pomodoro-style schedule for the given courses.
 
         Args:
             courses (list of dict): List of courses, where each course is a
                 dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
 
         Returns:
             list of dict: A sorted list of schedule blocks, where each block
                 contains 'course', 'block', 'duration', and 'date' keys.
         """
-        schedule = []
-        
-        for course in sorted(courses, key=lambda c: parse_date(c['deadline'])):
+        return list(self.iter_schedule(courses, today))
+
+    def iter_schedule(self, courses, today=None, start=0, days=None):
+        """Generates the Pomodoro schedule lazily, in date order.
+
+        Each course yields its blocks day by day, and the courses are merged
+        by day with a heap, so only one pending block per course is held at
+        a time. Days before start are skipped without being generated.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+            start (int, optional): Offset in days from today of the first
+                day to yield. Defaults to 0.
+            days (int, optional): Number of days to yield. Defaults to all
+                days until the last deadline.
+
+        Yields:
+            dict: Schedule blocks with 'course', 'block', 'duration', and
+                'date' keys, sorted by date.
+        """
+        start_date = today or datetime.today().date()
+        calendar = calendar_for(start_date)
+        stop = None if days is None else start + days
+        course_blocks = [
+            self._course_blocks(name, total_minutes, span, calendar, start, stop)
+            for name, total_minutes, span in self._plan_courses(courses, start_date)
+        ]
+        # heapq.merge is stable, so courses sharing a day stay in deadline order
+        for _, block in heapq.merge(*course_blocks, key=lambda item: item[0]):
+            yield block
+
+    def window(self, courses, days=7, today=None, start=0):
+        """Returns the blocks of a window of days, such as the next week.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+            days (int, optional): Number of days in the window. Defaults to 7.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+            start (int, optional): Offset in days from today of the first
+                day of the window. Defaults to 0.
+
+        Returns:
+            list of dict: The window's blocks, sorted by date.
+        """
+        return list(self.iter_schedule(courses, today, start, days))
+
+    def course_order(self, courses):
+        """Lists courses by deadline, the order blocks sharing a day come in.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+
+        Returns:
+            list of int: Positions in courses.
+        """
+        return deadline_order(courses)
+
+    def _plan_courses(self, courses, start_date):
+        """Lists (name, minutes, days) for each schedulable course by deadline."""
+        planned = []
+        for deadline, course in sorted(parse_deadlines(courses), key=lambda pair: pair[0]):
             try:
                 time_remaining = int(float(course["hours"])) * 60 # Convert hours to minutes
-                deadline = parse_date(course["deadline"])
-                
-                start_date = datetime.today().date()
-                
-                date_range = [start_date + timedelta(days=i) for i in range((deadline - start_date).days + 1)]
+                span = (deadline - start_date).days + 1
 
                 if (deadline - start_date).days < 0:
                     print(f"Skipping course '{course['course']}' — deadline has already passed.")
                     continue
-                
-                if not date_range:
-                    continue
-                
+
             except (ValueError, KeyError) as err:
                 print(f"Error processing course {course['course']}: {err}")
                 continue # Invalid input, skip this course
-            
-            date_index = 0
-            blocks = []
-            
-            while time_remaining > 0:
-                duration = min(25, time_remaining)
-                assigned_date = date_range[date_index % len(date_range)]
-                
-                blocks.append({
-                    "course": course["course"],
-                    "block": "study",
-                    "duration": duration,
-                    "date": str(assigned_date)
-                })
-                
-                time_remaining -= duration
-                
-                if time_remaining > 0:
-                    blocks.append({
-                        "course": course["course"],
-                        "block": "break",
-                        "duration": 5,
-                        "date": str(assigned_date)
-                    })
-                date_index += 1
-                
-            schedule.extend(blocks)
-                    
-        return sorted(schedule, key=lambda x: x["date"])
+
+            if time_remaining > 0:
+                planned.append((course["course"], time_remaining, span))
+        return planned
+
+    def _course_blocks(self, name, total_minutes, span, calendar, start, stop):
+        """Yields (day offset, block) pairs of one course, day by day.
+
+        Study block k of the course falls on day k % span, so day d holds
+        blocks d, d + span, d + 2 * span and so on. Every study block but
+        the course's last is followed by a break.
+        """
+        work = self.work_minutes
+        count = -(-total_minutes // work)
+        last = total_minutes - work * (count - 1)
+        stop = span if stop is None else min(stop, span)
+        for day_offset in range(max(start, 0), min(stop, count)):
+            date = calendar.date_string(day_offset)
+            for nth, k in enumerate(range(day_offset, count, span), 1):
+                final = k == count - 1
+                yield day_offset, {"course": name, "block": "study", "duration": last if final else work, "date": date}
+                if not final:
+                    long_break = self.long_break_every and nth % self.long_break_every == 0
+                    duration = self.long_break_minutes if long_break else self.break_minutes
+                    yield day_offset, {"course": name, "block": "break", "duration": duration, "date": date}
@@ -0,0 +1,197 @@
+"""Progress tracking for the StudyBuddy Scheduler.
+
+This script defines the ProgressIndex class, which keeps running totals of
+completed study time per day and per course, so marking a block done or
+not done updates progress in constant time instead of re-summing the
+schedule.
+"""
+
+from scheduler.blocks import STUDY
+
+
+class ProgressIndex:
+    """Completed and total study minutes per day and per course.
+
+    Blocks are identified by (date, position within the day) ids, which
+    stay the same when a schedule is regenerated without changing that day.
+    Only study blocks count toward the minutes; breaks can still be marked
+    done. When a new schedule changes only some days, set_day() replaces
+    those days without re-summing the rest.
+    """
+
+    def __init__(self, grouped, completed=(), outside=None):
+        """Builds the index for a schedule grouped by date.
+
+        Args:
+            grouped (dict): ScheduleBlocks per 'YYYY-MM-DD' date, as returned
+                by ScheduleBlocks.group_by_date().
+            completed (iterable of tuple, optional): Ids of blocks already
+                done, e.g. carried over from the previous schedule. Ids that
+                don't exist in this schedule are ignored. Defaults to none.
+            outside (dict, optional): (done minutes, total minutes) per
+                course on days of the schedule that aren't in grouped yet,
+                such as calendar pages not loaded; they count toward the
+                course and overall progress until load_day() adds them.
+                Defaults to none.
+        """
+        self.grouped = {}
+        self.completed = set()
+        self.day_totals = {}
+        self.day_done = {}
+        self.course_totals = {}
+        self.course_done = {}
+        # Days each course has blocks on, and the done blocks of each day
+        self._course_days = {}
+        self._day_completed = {}
+        self._outside = {name: list(minutes) for name, minutes in (outside or {}).items()}
+        for date, blocks in grouped.items():
+            self._add_day(date, blocks)
+        for block_id in completed:
+            date, index = block_id
+            if date in self.grouped and 0 <= index < len(self.grouped[date]):
+                self.toggle(block_id)
+
+    def set_day(self, date, blocks=None):
+        """Replaces the blocks of one day, as when a new schedule changes it.
+
+        The day's blocks are no longer the ones that were marked done, so
+        its checkmarks are dropped; other days keep theirs.
+
+        Args:
+            date (str): The date in 'YYYY-MM-DD' format.
+            blocks (ScheduleBlocks, optional): The day's new blocks. Defaults
+                to None, which removes the day.
+        """
+        if date in self.grouped:
+            self._drop_day(date)
+        if blocks:
+            self._add_day(date, blocks)
+
+    def load_day(self, date, blocks, completed=()):
+        """Adds a day counted in the outside totals, with its checkmarks.
+
+        Args:
+            date (str): The date in 'YYYY-MM-DD' format.
+            blocks (ScheduleBlocks): The day's blocks.
+            completed (iterable of tuple, optional): Ids of the day's blocks
+                that are done. Defaults to none.
+        """
+        self.set_day(date, blocks)
+        outside = self._outside
+        for name, minutes in self._course_minutes(blocks).items():
+            outside.setdefault(name, [0, 0])[1] -= minutes
+        for block_id in completed:
+            if block_id[0] == date and 0 <= block_id[1] < len(blocks) and not self.is_done(block_id):
+                self.toggle(block_id)
+                course, minutes = self._study_minutes(block_id)
+                outside[course][0] -= minutes
+        for name in [name for name, minutes in outside.items() if minutes == [0, 0]]:
+            del outside[name]
+
+    @staticmethod
+    def _course_minutes(blocks):
+        """Totals a day's study minutes per course."""
+        minutes = {}
+        names = blocks.course_names
+        for course_id, block_type, duration in zip(blocks.course_ids, blocks.block_types, blocks.durations):
+            name = names[course_id]
+            minutes[name] = minutes.get(name, 0) + (duration if block_type == STUDY else 0)
+        return minutes
+
+    def _add_day(self, date, blocks):
+        """Adds a day's blocks to the totals, none of them done."""
+        self.grouped[date] = blocks
+        minutes = self._course_minutes(blocks)
+        for name, total in minutes.items():
+            self.course_totals[name] = self.course_totals.get(name, 0) + total
+            self.course_done.setdefault(name, 0)
+            self._course_days[name] = self._course_days.get(name, 0) + 1
+        self.day_totals[date] = sum(minutes.values())
+        self.day_done[date] = 0
+
+    def _drop_day(self, date):
+        """Takes a day's blocks and checkmarks out of the totals."""
+        for block_id in self._day_completed.pop(date, ()):
+            course, minutes = self._study_minutes(block_id)
+            self.course_done[course] -= minutes
+            self.completed.discard(block_id)
+        for name, total in self._course_minutes(self.grouped.pop(date)).items():
+            self.course_totals[name] -= total
+            self._course_days[name] -= 1
+            if not self._course_days[name]:
+                del self.course_totals[name], self.course_done[name], self._course_days[name]
+        del self.day_totals[date], self.day_done[date]
+
+    def _study_minutes(self, block_id):
+        """Returns the course and study minutes of a block (0 for breaks)."""
+        date, index = block_id
+        blocks = self.grouped[date]
+        minutes = blocks.durations[index] if blocks.block_types[index] == STUDY else 0
+        return blocks.course_names[blocks.course_ids[index]], minutes
+
+    def toggle(self, block_id):
+        """Marks a block done, or not done if it already was.
+
+        Args:
+            block_id (tuple): (date, position within the day) of the block.
+
+        Returns:
+            bool: Whether the block is now done.
+        """
+        date, _ = block_id
+        course, minutes = self._study_minutes(block_id)
+        if block_id in self.completed:
+            self.completed.remove(block_id)
+            self._day_completed[date].discard(block_id)
+            minutes = -minutes
+        else:
+            self.completed.add(block_id)
+            self._day_completed.setdefault(date, set()).add(block_id)
+        self.day_done[date] += minutes
+        self.course_done[course] += minutes
+        return block_id in self.completed
+
+    def is_done(self, block_id):
+        """Checks whether a block is done.
+
+        Args:
+            block_id (tuple): (date, position within the day) of the block.
+
+        Returns:
+            bool: True if the block is marked done.
+        """
+        return block_id in self.completed
+
+    def day_percent(self, date):
+        """Returns the share of a day's study time that is done.
+
+        Args:
+            date (str): The date in 'YYYY-MM-DD' format.
+
+        Returns:
+            int: Percent done, from 0 to 100.
+        """
+        total = self.day_totals.get(date, 0)
+        return int((self.day_done[date] / total) * 100) if total else 0
+
+    def course_progress(self):
+        """Reports each course's study time done so far.
+
+        Returns:
+            dict: (done minutes, total minutes) per course.
+        """
+        progress = {name: (self.course_done[name], total) for name, total in self.course_totals.items()}
+        for name, (done, total) in self._outside.items():
+            loaded_done, loaded_total = progress.get(name, (0, 0))
+            progress[name] = (loaded_done + done, loaded_total + total)
+        return progress
+
+    def overall_percent(self):
+        """Returns the share of all study time that is done.
+
+        Returns:
+            int: Percent done, from 0 to 100.
+        """
+        progress = self.course_progress().values()
+        total = sum(total for _, total in progress)
+        return int((sum(done for done, _ in progress) / total) * 100) if total else 0
@@ -0,0 +1,278 @@
+"""Strategy registry for the StudyBuddy Scheduler.
+
+This script defines the StrategyRegistry class, which maps strategy names
+to the classes that implement them. Strategy modules are only imported the
+first time a strategy is used, and stateless strategy instances are reused
+across calls.
+
+Strategies can be added in three ways: by name with register(), with the
+register_strategy() class decorator, or by another installed package
+through an entry point in the 'studybuddy.strategies' group whose value is
+'module:ClassName'.
+"""
+
+import importlib
+import inspect
+import threading
+
+ENTRY_POINT_GROUP = "studybuddy.strategies"
+CAPABILITIES = ("incremental", "vectorized", "streaming")
+
+
+class StrategySpec:
+    """Describes one registered strategy and loads it on demand."""
+
+    def __init__(self, name, backends, incremental=False, streaming=False, description="", options=None):
+        """Initializes the StrategySpec.
+
+        Args:
+            name (str): Name the strategy is selected by.
+            backends (dict): Maps backend names to a strategy class or a
+                'module:ClassName' string. Must include 'python'.
+            incremental (bool, optional): Whether courses are scheduled
+                independently, so one course can be rescheduled on its own.
+                Defaults to False.
+            streaming (bool, optional): Whether the strategy can yield blocks
+                lazily instead of building the whole schedule. Defaults to False.
+            description (str, optional): Human-readable name. Defaults to "".
+            options (iterable of str, optional): Names of the options the
+                strategy accepts. Defaults to the keyword parameters of the
+                'python' backend's constructor, read when it is first
+                created with options.
+        """
+        if "python" not in backends:
+            raise ValueError(f"Strategy '{name}' needs a 'python' backend")
+        self.name = name
+        self.backends = dict(backends)
+        self.description = description or name
+        self.options = None if options is None else tuple(options)
+        self.capabilities = {
+            "incremental": incremental,
+            "vectorized": len(self.backends) > 1,
+            "streaming": streaming,
+        }
+        self._classes = {}
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def load(self, backend="python"):
+        """Imports and returns the strategy class for a backend.
+
+        Strategies without the requested backend use their 'python' one.
+
+        Args:
+            backend (str, optional): Backend name. Defaults to 'python'.
+
+        Returns:
+            type: The strategy class.
+        """
+        if backend not in self.backends:
+            backend = "python"
+        cls = self._classes.get(backend)
+        if cls is None:
+            target = self.backends[backend]
+            if isinstance(target, str):
+                module_name, _, attr = target.partition(":")
+                target = getattr(importlib.import_module(module_name), attr)
+            cls = self._classes[backend] = target
+        return cls
+
+    def create(self, backend="python", options=None):
+        """Returns a strategy instance for a backend.
+
+        Without options, one shared instance per backend is reused, since
+        strategies keep no state between calls.
+
+        Args:
+            backend (str, optional): Backend name. Defaults to 'python'.
+            options (dict, optional): Keyword arguments for the strategy.
+                Defaults to None.
+
+        Returns:
+            SchedulingStrategy: The strategy instance.
+
+        Raises:
+            ValueError: If an option isn't one the strategy accepts.
+        """
+        cls = self.load(backend)
+        if options:
+            self.check_options(options)
+            return cls(**options)
+        with self._lock:
+            instance = self._instances.get(cls)
+            if instance is None:
+                instance = self._instances[cls] = cls()
+            return instance
+
+    def check_options(self, options):
+        """Checks option names against the ones the strategy accepts.
+
+        Args:
+            options (dict): Keyword arguments for the strategy.
+
+        Raises:
+            ValueError: If an option isn't one the strategy accepts.
+        """
+        accepted = self.options
+        if accepted is None:
+            parameters = inspect.signature(self.load("python")).parameters.values()
+            if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters):
+                return
+            keyword = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+            accepted = tuple(p.name for p in parameters if p.kind in keyword)
+        unknown = [name for name in options if name not in accepted]
+        if unknown:
+            takes = f"accepts {', '.join(accepted)}" if accepted else "takes no options"
+            raise ValueError(f"Strategy '{self.name}' has no option '{unknown[0]}'; it {takes}")
+
+
+class StrategyRegistry:
+    """Maps strategy names to lazily loaded StrategySpecs."""
+
+    def __init__(self, backends=("python", "numpy")):
+        """Initializes an empty StrategyRegistry.
+
+        Args:
+            backends (iterable of str, optional): Backend names the engine
+                accepts. Defaults to ('python', 'numpy').
+        """
+        self.backends = tuple(backends)
+        self._specs = {}
+        self._entry_points_loaded = False
+        self._lock = threading.Lock()
+
+    def register(self, name, backends, **metadata):
+        """Registers a strategy.
+
+        Args:
+            name (str): Name the strategy is selected by.
+            backends (dict or str or type): Strategy class or
+                'module:ClassName' string per backend, or a single one used
+                as the 'python' backend.
+            **metadata: Capability flags, description and accepted options,
+                see StrategySpec.
+
+        Returns:
+            StrategySpec: The registered spec.
+        """
+        if not isinstance(backends, dict):
+            backends = {"python": backends}
+        spec = StrategySpec(name, backends, **metadata)
+        with self._lock:
+            self._specs[name] = spec
+        return spec
+
+    def _load_entry_points(self):
+        """Registers strategies advertised by installed packages, once."""
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+        from importlib.metadata import entry_points
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name not in self._specs:
+                self.register(entry_point.name, entry_point.value)
+
+    def get(self, name):
+        """Looks up a registered strategy.
+
+        Args:
+            name (str): Strategy name.
+
+        Returns:
+            StrategySpec: The strategy's spec.
+
+        Raises:
+            ValueError: If no strategy is registered under the name.
+        """
+        spec = self._specs.get(name)
+        if spec is None:
+            self._load_entry_points()
+            spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown strategy: {name}")
+        return spec
+
+    def create(self, name, backend="python", options=None):
+        """Returns an instance of a registered strategy.
+
+        Args:
+            name (str): Strategy name.
+            backend (str, optional): Backend name. Defaults to 'python'.
+            options (dict, optional): Keyword arguments for the strategy.
+                Defaults to None.
+
+        Returns:
+            SchedulingStrategy: The strategy instance.
+
+        Raises:
+            ValueError: If the strategy or backend is unknown.
+        """
+        spec = self.get(name)
+        if backend not in self.backends:
+            raise ValueError(f"Unknown backend: {backend}")
+        return spec.create(backend, options)
+
+    def names(self):
+        """Lists the registered strategy names.
+
+        Returns:
+            list of str: Strategy names, in registration order.
+        """
+        self._load_entry_points()
+        return list(self._specs)
+
+    def capabilities(self, name):
+        """Reports what a strategy supports without importing it.
+
+        Args:
+            name (str): Strategy name.
+
+        Returns:
+            dict: 'incremental', 'vectorized' and 'streaming' flags.
+        """
+        return dict(self.get(name).capabilities)
+
+
+registry = StrategyRegistry()
+
+registry.register(
+    "even",
+    {"python": "scheduler.strategy:EvenDistributionStrategy",
+     "numpy": "scheduler.vectorized:VectorizedEvenDistributionStrategy"},
+    incremental=True, description="Even Distribution", options=(),
+)
+registry.register(
+    "urgency",
+    {"python": "scheduler.strategy:UrgencyStrategy",
+     "numpy": "scheduler.vectorized:VectorizedUrgencyStrategy"},
+    incremental=True, description="Urgency-Based", options=(),
+)
+registry.register(
+    "pomodoro", "scheduler.pomodoro:PomodoroScheduler",
+    incremental=True, streaming=True, description="Pomodoro",
+    options=("work_minutes", "break_minutes", "long_break_minutes", "long_break_every"),
+)
+registry.register(
+    "capacity", "scheduler.capacity:CapacityStrategy",
+    description="Capacity-Aware", options=("daily_hours", "blackout_dates", "weekdays"),
+)
+
+
+def register_strategy(name, registry=registry, **metadata):
+    """Class decorator that registers a strategy under a name.
+
+    Args:
+        name (str): Name the strategy is selected by.
+        registry (StrategyRegistry, optional): Registry to add it to.
+            Defaults to the shared registry.
+        **metadata: Capability flags, description and accepted options,
+                see StrategySpec.
+
+    Returns:
+        callable: The decorator, which returns the class unchanged.
+    """
+    def decorator(cls):
+        registry.register(name, cls, **metadata)
+        return cls
+    return decorator
@@ -0,0 +1,319 @@
+"""Schedule result cache for the StudyBuddy Scheduler.
+
+This script defines the ResultCache class, which remembers generated
+schedules by a hash of everything that determines them: the strategy, its
+backend and options, the courses and the first day. Repeated generations
+with the same inputs, from the same user or from students who share
+courses, are answered from the cache instead of being recomputed.
+
+Entries live in an in-process LRU, backed by an optional SQLite file that
+several worker processes can share. The first day is part of every key, so
+schedules for different days live side by side; once a later day comes
+along, earlier days are dropped from the disk tier and age out of the LRU.
+Every caller gets its own copy of a cached schedule, so changing one can't
+change what later callers get.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from scheduler.utils import parse_date
+
+# Set to a file path to share cached schedules between processes
+RESULT_CACHE_ENV = "STUDYBUDDY_RESULT_CACHE"
+
+
+def normalize_course(course):
+    """Reduces a course to the values strategies actually read.
+
+    Equivalent inputs map to the same value: deadlines in either supported
+    format become ISO dates and hours become floats. Values that don't
+    parse are kept as given, since strategies skip them.
+
+    Args:
+        course (dict): Dictionary containing 'course', 'deadline', and
+            'hours' keys.
+
+    Returns:
+        list: [course, deadline, hours] in canonical form, with None for
+            missing keys.
+    """
+    name = repr(course["course"]) if "course" in course else None
+    deadline = course.get("deadline")
+    if "deadline" in course:
+        try:
+            deadline = parse_date(deadline).isoformat()
+        except ValueError:
+            deadline = repr(deadline)
+    hours = course.get("hours")
+    if "hours" in course:
+        try:
+            hours = float(hours)
+        except (TypeError, ValueError):
+            hours = repr(hours)
+    return [name, deadline, hours]
+
+
+def canonical_option(value):
+    """Converts a strategy option value to a form that hashes the same everywhere.
+
+    Sets are sorted, since their iteration order can differ between
+    processes, and dates become ISO strings.
+
+    Args:
+        value: The option value.
+
+    Returns:
+        object: JSON-serializable equivalent of the value.
+
+    Raises:
+        TypeError: If the value has no stable form, such as an arbitrary
+            object whose repr() includes its address.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(key): canonical_option(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, range)):
+        return [canonical_option(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        items = [canonical_option(item) for item in value]
+        return sorted(items, key=lambda item: json.dumps(item, sort_keys=True))
+    raise TypeError(f"Option values of type {type(value).__name__} can't be part of a cache key")
+
+
+def copy_result(value):
+    """Copies a cached result down to its immutable values.
+
+    Lists, tuples and dicts are copied, at any depth; anything else, such
+    as the strings and numbers of a block, is shared.
+
+    Args:
+        value: A schedule, or another result made of lists, tuples and dicts.
+
+    Returns:
+        object: A copy of value that shares nothing mutable with it.
+    """
+    if isinstance(value, list):
+        return [copy_result(item) if isinstance(item, (list, tuple, dict)) else item for item in value]
+    if isinstance(value, dict):
+        return {key: copy_result(item) if isinstance(item, (list, tuple, dict)) else item for key, item in value.items()}
+    if isinstance(value, tuple):
+        return tuple(copy_result(item) for item in value)
+    return value
+
+
+class ResultCache:
+    """LRU cache of generated schedules keyed by a hash of their inputs.
+
+    Schedules are copied on the way in and on the way out, so callers may
+    modify what they get.
+    """
+
+    def __init__(self, max_entries=1024, path=None):
+        """Initializes an empty ResultCache.
+
+        Args:
+            max_entries (int, optional): Schedules kept in memory before the
+                least recently used one is evicted. Defaults to 1024.
+            path (str, optional): SQLite file for the shared on-disk tier.
+                Defaults to no disk tier.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()
+        self._day = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._disk().execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, day TEXT NOT NULL, schedule TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(strategy, backend, options, courses, today, kind="schedule"):
+        """Computes the cache key of a schedule.
+
+        Args:
+            strategy (str): Strategy name.
+            backend (str): Strategy backend.
+            options (dict): Keyword arguments for the strategy.
+            courses (list of dict): The courses, in order.
+            today (datetime.date): First day of the schedule.
+            kind (str, optional): What is cached for these inputs, such as
+                'schedule' or 'plan'. Defaults to 'schedule'.
+
+        Returns:
+            str: Hex digest identifying the inputs.
+
+        Raises:
+            TypeError: If an option value has no stable form; see
+                canonical_option().
+        """
+        payload = json.dumps(
+            [kind, strategy, backend, canonical_option(options or {}), today.isoformat(),
+             [normalize_course(c) for c in courses]],
+            sort_keys=True, separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_or_compute(self, compute, strategy, backend, options, courses, today, kind="schedule"):
+        """Returns the cached result for some inputs, computing it on a miss.
+
+        Inputs whose options have no stable cache key are computed every
+        time.
+
+        Args:
+            compute (callable): Computes the result from nothing when it
+                isn't cached.
+            strategy (str): Strategy name.
+            backend (str): Strategy backend.
+            options (dict): Keyword arguments for the strategy.
+            courses (list of dict): The courses, in order.
+            today (datetime.date): First day of the schedule.
+            kind (str, optional): What compute returns, see make_key().
+                Defaults to 'schedule'.
+
+        Returns:
+            object: What compute returns, or a copy of the cached result.
+                Tuples come back from the disk tier as lists.
+        """
+        try:
+            key = self.make_key(strategy, backend, options, courses, today, kind)
+        except TypeError:
+            return compute()
+        result = self.get(key, today)
+        if result is None:
+            result = compute()
+            self.put(key, today, result)
+        return result
+
+    def get(self, key, today):
+        """Looks up a cached schedule.
+
+        Args:
+            key (str): The cache key from make_key().
+            today (datetime.date): The day the schedule starts on; the
+                disk tier drops days before the latest one seen.
+
+        Returns:
+            list of dict or None: A copy of the cached schedule, or None on
+                a miss.
+        """
+        self._roll_over(today)
+        with self._lock:
+            schedule = self._entries.get(key)
+            if schedule is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy_result(schedule)
+        schedule = self._disk_get(key, today) if self.path else None
+        with self._lock:
+            if schedule is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                self._store(key, schedule)
+        return copy_result(schedule) if schedule is not None else None
+
+    def put(self, key, today, schedule):
+        """Caches a schedule.
+
+        Args:
+            key (str): The cache key from make_key().
+            today (datetime.date): The day the schedule was computed for.
+            schedule (list of dict): The schedule. A copy is cached, so the
+                caller may go on to modify it.
+        """
+        self._roll_over(today)
+        with self._lock:
+            self._store(key, copy_result(schedule))
+        if self.path:
+            self._disk_put(key, today, schedule)
+
+    def clear(self):
+        """Drops every cached schedule and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if self.path:
+            self._disk().execute("DELETE FROM results")
+
+    def stats(self):
+        """Reports how well the cache is doing.
+
+        Returns:
+            dict: 'hits' (memory), 'disk_hits', 'misses', 'hit_rate' (share
+                of lookups answered from either tier) and 'size' (schedules
+                in memory).
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+    def _store(self, key, schedule):
+        """Adds an entry to the LRU. Callers hold the lock."""
+        self._entries[key] = schedule
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _roll_over(self, today):
+        """Drops earlier days from the disk tier once a later day is seen.
+
+        The LRU is left alone: keys include the day, so entries for earlier
+        days are never returned for a later one and are evicted in turn.
+        """
+        if self._day is not None and today <= self._day:
+            return
+        with self._lock:
+            if self._day is not None and today <= self._day:
+                return
+            previous, self._day = self._day, today
+        if previous is not None and self.path:
+            self._disk().execute("DELETE FROM results WHERE day < ?", (today.isoformat(),))
+
+    def _disk(self):
+        """Returns this thread's connection to the disk tier."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _disk_get(self, key, today):
+        """Reads an entry for today from the disk tier."""
+        row = self._disk().execute(
+            "SELECT schedule FROM results WHERE key = ? AND day = ?", (key, today.isoformat())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _disk_put(self, key, today, schedule):
+        """Writes an entry to the disk tier."""
+        self._disk().execute(
+            "INSERT OR REPLACE INTO results (key, day, schedule) VALUES (?, ?, ?)",
+            (key, today.isoformat(), json.dumps(schedule, separators=(",", ":"))),
+        )
+
+
+# Cache shared by every SchedulerEngine in the process
+result_cache = ResultCache(path=os.environ.get(RESULT_CACHE_ENV))
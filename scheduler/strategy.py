@@ -4,18 +4,21 @@ This script defines abstract and concrete scheduling strategies, including
 urgency-based and even distribution strategies.
 """
 
-from datetime import datetime, timedelta
-from scheduler.utils import parse_date
+from datetime import datetime
+from scheduler.blocks import ScheduleBlocks
+from scheduler.utils import calendar_for, deadline_order, parse_deadlines
 
 class SchedulingStrategy:
     """Abstract base class for scheduling strategies."""
 
-    def schedule(self, courses):
+    def schedule(self, courses, today=None):
         """Schedules study blocks for the given courses.
 
         Args:
             courses (list of dict): List of courses, where each course is a
                 dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
 
         Returns:
             list of dict: A list of scheduled blocks.
@@ -25,6 +28,32 @@ class SchedulingStrategy:
         """
         raise NotImplementedError
 
+    def schedule_blocks(self, courses, today=None):
+        """Schedules study blocks and returns them in columnar form.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+
+        Returns:
+            ScheduleBlocks: The scheduled blocks, in the same order as schedule().
+        """
+        return ScheduleBlocks.from_dicts(self.schedule(courses, today))
+
+    def course_order(self, courses):
+        """Lists courses in the order schedule() lays them out within a day.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+
+        Returns:
+            list of int: Positions in courses; input order by default.
+        """
+        return list(range(len(courses)))
+
 
 class UrgencyStrategy(SchedulingStrategy):
     """Schedules study blocks based on course deadlines.
@@ -32,25 +61,27 @@ class UrgencyStrategy(SchedulingStrategy):
     Prioritizes courses with earlier deadlines.
     """
 
-    def schedule(self, courses):
+    def schedule(self, courses, today=None):
         """Generates a schedule based on urgency (earliest deadlines first).
 
         Args:
             courses (list of dict): List of courses, where each course is a
                 dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
 
         Returns:
             list of dict: A list of scheduled blocks, sorted by date.
         """
-        today = datetime.today().date()
+        today = today or datetime.today().date()
+        calendar = calendar_for(today)
         schedule = []
         
-        sorted_courses = sorted(courses, key=lambda c: parse_date(c['deadline']))
+        sorted_courses = sorted(parse_deadlines(courses), key=lambda pair: pair[0])
         
-        for course in sorted_courses:
+        for deadline, course in sorted_courses:
             try:
                 total_minutes = int(float(course["hours"])) * 60
-                deadline = parse_date(course["deadline"])
                 days = (deadline - today).days + 1
                 if days <= 0:
                     days = 1
@@ -61,37 +92,50 @@ class UrgencyStrategy(SchedulingStrategy):
             extra_minutes = total_minutes % days
             
             for i in range(days):
-                date = today + timedelta(days=i)
                 duration = minutes_per_day + (1 if i < extra_minutes else 0)
                 if duration > 0:
                     schedule.append({
                         "course": course["course"],
                         "block": "study",
                         "duration": duration,
-                        "date": str(date)
+                        "date": calendar.date_string(i)
                     })
         return schedule
-            
+
+    def course_order(self, courses):
+        """Lists courses by deadline, the order schedule() handles them in.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+
+        Returns:
+            list of int: Positions in courses.
+        """
+        return deadline_order(courses)
+
 class EvenDistributionStrategy(SchedulingStrategy):
     """Distributes study time evenly across the available days."""
 
-    def schedule(self, courses):
+    def schedule(self, courses, today=None):
         """Generates a schedule with evenly distributed study time.
 
         Args:
             courses (list of dict): List of courses, where each course is a
                 dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
 
         Returns:
             list of dict: A list of scheduled blocks, evenly distributed by date.
         """
-        today = datetime.today().date()
+        today = today or datetime.today().date()
+        calendar = calendar_for(today)
         schedule = []     
         
-        for course in courses:
+        for deadline, course in parse_deadlines(courses):
             try:
                 total_minutes = int(float(course["hours"])) * 60
-                deadline = parse_date(course["deadline"])
                 days = (deadline - today).days + 1
                 if days <= 0:
                     days = 1
@@ -102,14 +146,13 @@ class EvenDistributionStrategy(SchedulingStrategy):
             extra_minutes = total_minutes % days
             
             for i in range(days):
-                date = today + timedelta(days=i)
                 duration = minutes_per_day + (1 if i < extra_minutes else 0)
                 if duration > 0:
                     schedule.append({
                         "course": course["course"],
                         "block": "study",
                         "duration": duration,
-                        "date": str(date)
+                        "date": calendar.date_string(i)
                     })
                     
         return schedule
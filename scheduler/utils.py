@@ -1,61 +1,187 @@
 """Utility functions for the StudyBuddy Scheduler.
 
-This script includes helper functions for parsing dates and generating
-visualizations, such as pie charts for study durations.
+This script includes helper functions for parsing dates and for the
+calendar of days a schedule covers. Chart rendering lives in
+scheduler.charts, which is only imported when a chart is drawn.
 """
 
-import matplotlib.pyplot as plt
-from io import BytesIO
-import base64
-from collections import defaultdict
+import functools
+import re
+import threading
+from datetime import date, datetime, timedelta
 
-from datetime import datetime
+# Accepted input formats, besides ISO dates handled by date.fromisoformat
+_ISO_DATE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_US_DATE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+class DateParseError(ValueError):
+    """Raised when a deadline is not a date in a supported format."""
+
+    def __init__(self, value, reason=None):
+        """Initializes the DateParseError.
+
+        Args:
+            value: The value that could not be parsed.
+            reason (str, optional): Why it was rejected, such as an
+                out-of-range day. Defaults to None.
+        """
+        message = f"Invalid date {value!r}: expected YYYY-MM-DD or MM/DD/YYYY"
+        if reason:
+            message += f" ({reason})"
+        super().__init__(message)
+        self.value = value
+        self.reason = reason
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_string(date_str):
+    """Parses and memoizes one date string; see parse_date."""
+    text = date_str.strip()
+    if len(text) == 10 and text[4] == "-":
+        try:
+            return date.fromisoformat(text)
+        except ValueError:
+            pass
+    match = _ISO_DATE.fullmatch(text)
+    if match:
+        year, month, day = match.groups()
+    else:
+        match = _US_DATE.fullmatch(text)
+        if not match:
+            raise DateParseError(date_str)
+        month, day, year = match.groups()
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError as err:
+        raise DateParseError(date_str, str(err)) from None
 
 def parse_date(date_str):
     """Parses a date string into a datetime.date object.
 
-    Supports multiple date formats. If parsing fails, returns today's date.
+    Supports 'YYYY-MM-DD' and 'MM/DD/YYYY' dates. Parsed strings are kept
+    in a bounded cache, since the same deadlines come up again and again.
+    Dates that are already datetime.date objects are returned unchanged.
 
     Args:
-        date_str (str): The date string to parse.
+        date_str (str or datetime.date): The date string to parse.
 
     Returns:
-        datetime.date: The parsed date or today's date if parsing fails.
+        datetime.date: The parsed date.
+
+    Raises:
+        DateParseError: If the value is not a date in a supported format.
     """
-    try:
-        return datetime.strptime(date_str.strip(), "%Y-%m-%d").date()
-    except ValueError:
+    if isinstance(date_str, date):
+        return date_str.date() if isinstance(date_str, datetime) else date_str
+    if not isinstance(date_str, str):
+        raise DateParseError(date_str)
+    return _parse_date_string(date_str)
+
+def parse_deadlines(courses):
+    """Parses every course's deadline exactly once.
+
+    Courses without a valid deadline are left out, the same way the
+    strategies skip courses with invalid hours.
+
+    Args:
+        courses (list of dict): List of courses, where each course is a
+            dictionary containing a 'deadline' key.
+
+    Returns:
+        list of tuple: (deadline, course) pairs in input order, where the
+            deadline is a datetime.date.
+    """
+    dated = []
+    for course in courses:
         try:
-            return datetime.strptime(date_str.strip(), "%m/%d/%Y").date()
-        except Exception as err:
-            print(f"Error parsing date '{date_str}': {err}")
-            return datetime.today().date()
-        
-def generate_pie_chart(blocks):
-    """Generates a pie chart for study durations by course.
+            dated.append((parse_date(course["deadline"]), course))
+        except (ValueError, KeyError):
+            continue
+    return dated
+
+def deadline_order(courses):
+    """Lists course positions by deadline, earliest first.
+
+    Courses sharing a deadline keep their input order, and courses without
+    a valid deadline come last.
 
     Args:
-        blocks (list of dict): List of schedule blocks, where each block
-            contains 'course' and 'duration' keys.
+        courses (list of dict): List of courses, where each course is a
+            dictionary containing a 'deadline' key.
 
     Returns:
-        str: Base64-encoded PNG image of the pie chart.
+        list of int: Positions in courses.
+    """
+    dated, undated = [], []
+    for i, course in enumerate(courses):
+        try:
+            dated.append((parse_date(course["deadline"]), i))
+        except (ValueError, KeyError):
+            undated.append(i)
+    return [i for _, i in sorted(dated)] + undated
+
+class DayCalendar:
+    """The 'YYYY-MM-DD' strings of consecutive days from a first day.
+
+    Strings are formatted once and shared by every schedule that starts on
+    the same day, instead of calling str() on a date for every block.
     """
-    durations = defaultdict(int)
-    for block in blocks:
-        durations[block["course"]] += block["duration"]
 
-    labels = list(durations.keys())
-    sizes = list(durations.values())
-    colors = plt.cm.Set3.colors[:len(labels)]  # pretty colors
+    def __init__(self, start):
+        """Initializes the DayCalendar.
+
+        Args:
+            start (datetime.date): The first day, at offset 0.
+        """
+        self.start = start
+        self._strings = []
+        self._lock = threading.Lock()
+
+    def strings(self, count):
+        """Returns the date strings of the first count days.
+
+        Args:
+            count (int): Number of days needed.
 
-    fig, ax = plt.subplots(figsize=(3, 3), dpi=100)
-    ax.pie(sizes, labels=labels, autopct='%1.0f%%', startangle=140, colors=colors)
-    ax.axis('equal')  # Equal aspect ratio for a perfect circle
+        Returns:
+            list of str: At least count date strings, indexed by day offset.
+                The list is shared and must not be modified.
+        """
+        if count > len(self._strings):
+            with self._lock:
+                strings = self._strings
+                start = self.start
+                strings.extend(str(start + timedelta(days=i)) for i in range(len(strings), count))
+        return self._strings
 
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight', transparent=True)
-    plt.close(fig)
-    buf.seek(0)
+    def date_string(self, offset):
+        """Returns the date string of the day at an offset from the start.
+
+        Args:
+            offset (int): Days after the start, 0 or more.
+
+        Returns:
+            str: The date in 'YYYY-MM-DD' format.
+        """
+        strings = self._strings
+        if offset >= len(strings):
+            strings = self.strings(offset + 1)
+        return strings[offset]
+
+@functools.lru_cache(maxsize=8)
+def calendar_for(start):
+    """Returns the shared DayCalendar starting on a day.
+
+    Args:
+        start (datetime.date): The first day.
+
+    Returns:
+        DayCalendar: The calendar.
+    """
+    return DayCalendar(start)
 
-    return base64.b64encode(buf.read()).decode('utf-8')
+def __getattr__(name):
+    """Lazily forwards generate_pie_chart to scheduler.charts for older imports."""
+    if name == "generate_pie_chart":
+        from scheduler.charts import generate_pie_chart
+        return generate_pie_chart
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
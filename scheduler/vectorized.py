@@ -0,0 +1,182 @@
+"""NumPy scheduling backend for the StudyBuddy Scheduler.
+
+This script defines array-backed versions of the urgency-based and even
+distribution strategies. Per-day minutes for every course are computed at
+once with NumPy, and schedule dicts are only built for the final output,
+which is identical to the pure-Python strategies.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from scheduler.blocks import ScheduleBlocks
+from scheduler.strategy import EvenDistributionStrategy, UrgencyStrategy
+from scheduler.utils import calendar_for, parse_deadlines
+
+# Placeholder for a course without a name; like the Python strategies, this
+# only fails if the course actually gets a block.
+_MISSING = object()
+
+
+def spread_columns(dated_courses, today):
+    """Computes the blocks of evenly spread courses as columns.
+
+    Matches UrgencyStrategy and EvenDistributionStrategy block for block:
+    courses are handled in the given order, leftover minutes go one per day
+    to the earliest days, and days that would get no time are skipped.
+
+    Args:
+        dated_courses (list of tuple): (deadline, course) pairs from
+            parse_deadlines(), where each course is a dictionary containing
+            'course' and 'hours' keys.
+        today (datetime.date): First day of the schedule.
+
+    Returns:
+        tuple: The list of course names, then arrays holding each block's
+            course index, day offset from today and duration.
+    """
+    names, totals, spans = [], [], []
+    for deadline, course in dated_courses:
+        try:
+            total_minutes = int(float(course["hours"])) * 60
+            days = (deadline - today).days + 1
+            if days <= 0:
+                days = 1
+        except (ValueError, KeyError):
+            continue
+        names.append(course.get("course", _MISSING))
+        totals.append(total_minutes)
+        spans.append(days)
+
+    if not names:
+        empty = np.zeros(0, dtype=np.int64)
+        return names, empty, empty, empty
+
+    totals = np.array(totals, dtype=np.int64)
+    spans = np.array(spans, dtype=np.int64)
+    minutes_per_day, extra_minutes = np.divmod(totals, spans)
+
+    # One row per (course, day) pair, course-major like the Python loops
+    course_idx = np.repeat(np.arange(len(names)), spans)
+    starts = np.cumsum(spans) - spans
+    day_idx = np.arange(len(course_idx)) - np.repeat(starts, spans)
+    durations = minutes_per_day[course_idx] + (day_idx < extra_minutes[course_idx])
+
+    keep = durations > 0
+    course_idx = course_idx[keep]
+    if _MISSING in names and any(names[c] is _MISSING for c in np.unique(course_idx).tolist()):
+        raise KeyError("course")
+    return names, course_idx, day_idx[keep], durations[keep]
+
+
+def spread_courses(dated_courses, today):
+    """Spreads each course's minutes evenly over the days until its deadline.
+
+    Args:
+        dated_courses (list of tuple): (deadline, course) pairs from
+            parse_deadlines(), where each course is a dictionary containing
+            'course' and 'hours' keys.
+        today (datetime.date): First day of the schedule.
+
+    Returns:
+        list of dict: A list of scheduled blocks.
+    """
+    names, course_idx, day_idx, durations = spread_columns(dated_courses, today)
+    if not len(durations):
+        return []
+    dates = calendar_for(today).strings(int(day_idx.max()) + 1)
+    return [
+        {"course": names[c], "block": "study", "duration": d, "date": dates[i]}
+        for c, i, d in zip(course_idx.tolist(), day_idx.tolist(), durations.tolist())
+    ]
+
+
+def spread_blocks(dated_courses, today):
+    """Spreads courses like spread_courses, straight into columnar blocks.
+
+    Args:
+        dated_courses (list of tuple): (deadline, course) pairs from
+            parse_deadlines(), where each course is a dictionary containing
+            'course' and 'hours' keys.
+        today (datetime.date): First day of the schedule.
+
+    Returns:
+        ScheduleBlocks: The scheduled blocks.
+    """
+    names, course_idx, day_idx, durations = spread_columns(dated_courses, today)
+    # Only name the courses that got blocks, which also leaves out _MISSING.
+    # course_idx never decreases, so the names keep their first-use order.
+    used, course_idx = np.unique(course_idx, return_inverse=True)
+    ordinals = day_idx + today.toordinal()
+    return ScheduleBlocks.from_columns(
+        [names[c] for c in used.tolist()], course_idx.tolist(), ordinals.tolist(), durations.tolist()
+    )
+
+
+class VectorizedUrgencyStrategy(UrgencyStrategy):
+    """NumPy-backed UrgencyStrategy with identical output."""
+
+    def schedule(self, courses, today=None):
+        """Generates a schedule based on urgency (earliest deadlines first).
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+
+        Returns:
+            list of dict: A list of scheduled blocks, sorted by date.
+        """
+        today = today or datetime.today().date()
+        sorted_courses = sorted(parse_deadlines(courses), key=lambda pair: pair[0])
+        return spread_courses(sorted_courses, today)
+
+    def schedule_blocks(self, courses, today=None):
+        """Generates the urgency-based schedule directly in columnar form.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+
+        Returns:
+            ScheduleBlocks: The scheduled blocks.
+        """
+        today = today or datetime.today().date()
+        sorted_courses = sorted(parse_deadlines(courses), key=lambda pair: pair[0])
+        return spread_blocks(sorted_courses, today)
+
+
+class VectorizedEvenDistributionStrategy(EvenDistributionStrategy):
+    """NumPy-backed EvenDistributionStrategy with identical output."""
+
+    def schedule(self, courses, today=None):
+        """Generates a schedule with evenly distributed study time.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+
+        Returns:
+            list of dict: A list of scheduled blocks, evenly distributed by date.
+        """
+        return spread_courses(parse_deadlines(courses), today or datetime.today().date())
+
+    def schedule_blocks(self, courses, today=None):
+        """Generates the evenly distributed schedule directly in columnar form.
+
+        Args:
+            courses (list of dict): List of courses, where each course is a
+                dictionary containing 'course', 'deadline', and 'hours' keys.
+            today (datetime.date, optional): First day of the schedule.
+                Defaults to the current date.
+
+        Returns:
+            ScheduleBlocks: The scheduled blocks.
+        """
+        return spread_blocks(parse_deadlines(courses), today or datetime.today().date())
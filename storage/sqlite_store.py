@@ -0,0 +1,412 @@
+"""SQLite storage for the StudyBuddy Scheduler.
+
+This script defines the SQLiteStore class, which persists each user's
+course inputs, generated schedule blocks and completed blocks in a local
+SQLite database, so they survive reconnects and server restarts, and the
+SavedSchedule class, which loads a saved schedule a date range at a time.
+
+The database runs in WAL mode so readers never wait on a writer. Blocks are
+keyed by (user, date, position), which doubles as the (user, date) index
+used to load only the days being viewed, and a second index on
+(user, course) serves per-course queries.
+"""
+
+import os
+import sqlite3
+import threading
+from itertools import islice
+
+from scheduler.blocks import ScheduleBlocks
+
+DEFAULT_DB_PATH = os.environ.get(
+    "STUDYBUDDY_DB", os.path.join(os.path.expanduser("~"), ".cache", "studybuddy", "studybuddy.db")
+)
+
+# Cookie the app sets to tell users apart without accounts
+SESSION_COOKIE = "studybuddy_user"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    user TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    course TEXT NOT NULL,
+    deadline TEXT NOT NULL,
+    hours TEXT NOT NULL,
+    PRIMARY KEY (user, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS blocks (
+    user TEXT NOT NULL,
+    date TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    course TEXT NOT NULL,
+    block TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    PRIMARY KEY (user, date, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS blocks_user_course ON blocks (user, course);
+CREATE TABLE IF NOT EXISTS completed (
+    user TEXT NOT NULL,
+    date TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (user, date, position)
+) WITHOUT ROWID;
+"""
+
+# Statements are kept as constants so every connection's statement cache
+# prepares each one once and reuses it.
+INSERT_COURSE = "INSERT INTO courses (user, position, course, deadline, hours) VALUES (?, ?, ?, ?, ?)"
+DELETE_COURSES = "DELETE FROM courses WHERE user = ?"
+SELECT_COURSES = "SELECT course, deadline, hours FROM courses WHERE user = ? ORDER BY position"
+INSERT_BLOCK = "INSERT INTO blocks (user, date, position, course, block, duration) VALUES (?, ?, ?, ?, ?, ?)"
+DELETE_BLOCKS = "DELETE FROM blocks WHERE user = ?"
+DELETE_DAY_BLOCKS = "DELETE FROM blocks WHERE user = ? AND date = ?"
+SELECT_BLOCKS = (
+    "SELECT course, block, duration, date FROM blocks"
+    " WHERE user = ? AND date >= ? AND date <= ? ORDER BY date, position"
+)
+SELECT_COURSE_MINUTES = (
+    "SELECT course, SUM(duration) FROM blocks WHERE user = ? AND block = 'study' GROUP BY course"
+)
+SELECT_DATES = "SELECT DISTINCT date FROM blocks WHERE user = ? ORDER BY date"
+SELECT_COURSE_PROGRESS = (
+    "SELECT b.course, SUM(CASE WHEN c.position IS NULL THEN 0 ELSE b.duration END), SUM(b.duration)"
+    " FROM blocks b LEFT JOIN completed c ON c.user = b.user AND c.date = b.date AND c.position = b.position"
+    " WHERE b.user = ? AND b.block = 'study' GROUP BY b.course ORDER BY MIN(b.date), b.course"
+)
+INSERT_COMPLETED = "INSERT OR IGNORE INTO completed (user, date, position) VALUES (?, ?, ?)"
+DELETE_COMPLETED = "DELETE FROM completed WHERE user = ? AND date = ? AND position = ?"
+DELETE_ALL_COMPLETED = "DELETE FROM completed WHERE user = ?"
+DELETE_DAY_COMPLETED = "DELETE FROM completed WHERE user = ? AND date = ?"
+SELECT_COMPLETED = (
+    "SELECT date, position FROM completed WHERE user = ? AND date >= ? AND date <= ?"
+)
+
+# Bounds for date range queries that cover every 'YYYY-MM-DD' date
+FIRST_DATE = "0000-00-00"
+LAST_DATE = "9999-99-99"
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def default_store():
+    """Returns the process-wide SQLiteStore at DEFAULT_DB_PATH.
+
+    The database is only opened the first time it is needed.
+
+    Returns:
+        SQLiteStore: The shared store.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SQLiteStore()
+        return _default_store
+
+
+class SQLiteStore:
+    """Persists courses, schedules and progress per user in SQLite.
+
+    Each thread gets its own connection; all of them share the database
+    file, which WAL mode lets many readers and one writer use at once.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=500, timeout=5.0):
+        """Initializes the SQLiteStore and creates the schema if needed.
+
+        Args:
+            path (str, optional): Database file, or ':memory:' for a private
+                in-memory database. Defaults to the STUDYBUDDY_DB environment
+                variable or ~/.cache/studybuddy/studybuddy.db.
+            batch_size (int, optional): Rows sent per executemany() call when
+                writing blocks. Defaults to 500.
+            timeout (float, optional): Seconds to wait for a lock held by
+                another connection. Defaults to 5.0.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._shared = None
+        if path == ":memory:":
+            # A memory database exists per connection, so share one
+            self._shared = self._connect()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._write_lock:
+            self.connection.executescript(SCHEMA)
+
+    def _connect(self):
+        """Opens a connection configured for WAL and prepared statements."""
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None,
+            check_same_thread=self.path != ":memory:",
+            cached_statements=128,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @property
+    def connection(self):
+        """sqlite3.Connection: This thread's connection."""
+        if self._shared is not None:
+            return self._shared
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def _transaction(self):
+        """Returns a context manager that wraps statements in one transaction."""
+        return _Transaction(self.connection, self._write_lock)
+
+    def _write_batches(self, connection, statement, rows):
+        """Runs a statement for every row, batch_size rows at a time."""
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            connection.executemany(statement, batch)
+
+    def save_courses(self, user, courses):
+        """Replaces a user's course inputs.
+
+        Args:
+            user (str): The user id.
+            courses (list of dict): Courses with 'course', 'deadline', and
+                'hours' keys, in the order they are shown.
+        """
+        with self._transaction() as connection:
+            connection.execute(DELETE_COURSES, (user,))
+            connection.executemany(INSERT_COURSE, [
+                (user, position, str(course["course"]), str(course["deadline"]), str(course["hours"]))
+                for position, course in enumerate(courses)
+            ])
+
+    def load_courses(self, user):
+        """Loads a user's course inputs.
+
+        Args:
+            user (str): The user id.
+
+        Returns:
+            list of dict: Courses with 'course', 'deadline', and 'hours'
+                keys, in the order they were saved.
+        """
+        return [
+            {"course": course, "deadline": deadline, "hours": hours}
+            for course, deadline, hours in self.connection.execute(SELECT_COURSES, (user,))
+        ]
+
+    def save_schedule(self, user, schedule):
+        """Replaces a user's schedule and clears their completed blocks.
+
+        Args:
+            user (str): The user id.
+            schedule (ScheduleBlocks or list of dict): The schedule blocks.
+        """
+        with self._transaction() as connection:
+            connection.execute(DELETE_BLOCKS, (user,))
+            connection.execute(DELETE_ALL_COMPLETED, (user,))
+            self._write_batches(connection, INSERT_BLOCK, _block_rows(user, _rows(schedule)))
+
+    def save_days(self, user, days):
+        """Replaces the blocks of some days of a user's schedule.
+
+        Completed blocks on those days are cleared, since positions within
+        a rescheduled day no longer refer to the same blocks.
+
+        Args:
+            user (str): The user id.
+            days (dict): Lists of block dicts per 'YYYY-MM-DD' date; an empty
+                list removes the day.
+        """
+        with self._transaction() as connection:
+            connection.executemany(DELETE_DAY_BLOCKS, [(user, date) for date in days])
+            connection.executemany(DELETE_DAY_COMPLETED, [(user, date) for date in days])
+            rows = (row for blocks in days.values() for row in _rows(blocks or ()))
+            self._write_batches(connection, INSERT_BLOCK, _block_rows(user, rows))
+
+    def load_schedule(self, user, start=None, end=None):
+        """Loads a user's schedule, or only the days in a date range.
+
+        Args:
+            user (str): The user id.
+            start (str, optional): First date to load, 'YYYY-MM-DD'.
+                Defaults to the first day of the schedule.
+            end (str, optional): Last date to load, 'YYYY-MM-DD'. Defaults
+                to the last day of the schedule.
+
+        Returns:
+            ScheduleBlocks: The blocks, sorted by date.
+        """
+        blocks = ScheduleBlocks()
+        rows = self.connection.execute(SELECT_BLOCKS, (user, start or FIRST_DATE, end or LAST_DATE))
+        for course, block, duration, date in rows:
+            blocks.append(course, block, duration, date)
+        return blocks
+
+    def course_minutes(self, user):
+        """Totals a user's scheduled study minutes per course.
+
+        Args:
+            user (str): The user id.
+
+        Returns:
+            dict: Study minutes per course.
+        """
+        return dict(self.connection.execute(SELECT_COURSE_MINUTES, (user,)))
+
+    def load_dates(self, user):
+        """Lists the days of a user's schedule, without loading their blocks.
+
+        Args:
+            user (str): The user id.
+
+        Returns:
+            list of str: 'YYYY-MM-DD' dates that have blocks, in date order.
+        """
+        return [date for date, in self.connection.execute(SELECT_DATES, (user,))]
+
+    def course_progress(self, user):
+        """Totals a user's done and scheduled study minutes per course.
+
+        Args:
+            user (str): The user id.
+
+        Returns:
+            dict: (done minutes, total minutes) per course, like
+                ProgressIndex.course_progress().
+        """
+        return {
+            course: (done, total)
+            for course, done, total in self.connection.execute(SELECT_COURSE_PROGRESS, (user,))
+        }
+
+    def set_completed(self, user, block_ids, done=True):
+        """Marks blocks done or not done.
+
+        Args:
+            user (str): The user id.
+            block_ids (iterable of tuple): (date, position within the day)
+                ids of the blocks, as used by ProgressIndex.
+            done (bool, optional): Whether the blocks are done. Defaults to True.
+        """
+        statement = INSERT_COMPLETED if done else DELETE_COMPLETED
+        with self._transaction() as connection:
+            self._write_batches(connection, statement, ((user, date, position) for date, position in block_ids))
+
+    def load_completed(self, user, start=None, end=None):
+        """Loads the ids of a user's completed blocks.
+
+        Args:
+            user (str): The user id.
+            start (str, optional): First date to load. Defaults to all dates.
+            end (str, optional): Last date to load. Defaults to all dates.
+
+        Returns:
+            set of tuple: (date, position within the day) ids.
+        """
+        rows = self.connection.execute(SELECT_COMPLETED, (user, start or FIRST_DATE, end or LAST_DATE))
+        return {(date, position) for date, position in rows}
+
+    def close(self):
+        """Closes this thread's connection."""
+        connection = self._shared or getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+        self._shared = None
+        self._local.connection = None
+
+
+class SavedSchedule:
+    """A user's saved schedule, loaded from a store one date range at a time.
+
+    Only the dates and the per-course totals are read up front, so a long
+    schedule can be shown a page at a time without loading every block.
+    """
+
+    def __init__(self, store, user):
+        """Initializes the SavedSchedule.
+
+        Args:
+            store (SQLiteStore): The store the schedule was saved to.
+            user (str): The user id.
+        """
+        self.store = store
+        self.user = user
+        self.dates = store.load_dates(user)
+        self.course_progress = store.course_progress(user)
+        self.grouped = {}
+        self.completed = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.dates)
+
+    def load(self, dates):
+        """Loads the blocks and checkmarks of some days, unless already loaded.
+
+        Args:
+            dates (list of str): The days to load, in date order, such as a
+                calendar page. Their whole date range is read at once.
+
+        Returns:
+            tuple: A dict of ScheduleBlocks per newly loaded date and the set
+                of their completed block ids.
+        """
+        with self._lock:
+            if not dates or all(date in self.grouped for date in dates):
+                return {}, set()
+            start, end = dates[0], dates[-1]
+            grouped = self.store.load_schedule(self.user, start, end).group_by_date()
+            grouped = {date: blocks for date, blocks in grouped.items() if date not in self.grouped}
+            completed = {
+                block_id for block_id in self.store.load_completed(self.user, start, end) if block_id[0] in grouped
+            }
+            self.grouped.update(grouped)
+            self.completed |= completed
+            return grouped, completed
+
+
+class _Transaction:
+    """Runs the statements of a with block in one transaction."""
+
+    def __init__(self, connection, lock):
+        self.connection = connection
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+        return False
+
+
+def _rows(schedule):
+    """Returns (course, block, duration, date) rows of block dicts or ScheduleBlocks."""
+    if isinstance(schedule, ScheduleBlocks):
+        return schedule.iter_rows()
+    return ((b["course"], b["block"], b["duration"], b["date"]) for b in schedule)
+
+
+def _block_rows(user, rows):
+    """Yields blocks table rows, numbering each day's blocks from 0."""
+    positions = {}
+    for course, block, duration, date in rows:
+        position = positions.get(date, 0)
+        positions[date] = position + 1
+        yield (user, date, position, course, block, int(duration))
@@ -0,0 +1,226 @@
+"""Unit tests for the FastAPI application.
+
+This script tests the download endpoint of the StudyBuddy Scheduler app,
+ensuring that stored schedules can be downloaded by token.
+"""
+
+import sys
+import os
+import threading
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as app_module
+from app import app
+from exporter.schedule_store import schedule_store
+from monitoring.profiling import RequestProfiler
+
+@pytest.fixture
+def client():
+    """Provides a test client for the app.
+
+    Returns:
+        TestClient: A client that calls the app in-process.
+    """
+    return TestClient(app)
+
+@pytest.fixture
+def token():
+    """Stores a sample schedule and provides its download token.
+
+    Returns:
+        str: The download token.
+    """
+    return schedule_store.put([
+        {"course": "Math", "block": "study", "duration": 60, "date": "2023-11-10"},
+        {"course": "Science", "block": "study", "duration": 30, "date": "2023-11-11"}
+    ])
+
+def test_download_csv(client, token):
+    """Tests downloading a stored schedule as CSV."""
+    res = client.get(f"/download/csv?token={token}")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/csv")
+    assert "attachment; filename=schedule.csv" in res.headers["content-disposition"]
+    assert "Math,study,60,2023-11-10" in res.text
+
+def test_download_txt(client, token):
+    """Tests downloading a stored schedule as plain text."""
+    res = client.get(f"/download/txt?token={token}")
+
+    assert res.status_code == 200
+    assert "2023-11-11 | Science | study | 30 min" in res.text
+
+def test_download_errors(client, token):
+    """Tests the error responses for bad file types and tokens."""
+    assert client.get(f"/download/pdf?token={token}").status_code == 400
+    assert client.get("/download/csv").status_code == 400
+    assert client.get("/download/csv?token=missing").status_code == 404
+
+def test_download_large_schedule_is_streamed(client, monkeypatch):
+    """Tests that schedules too large to cache are streamed in chunks."""
+    monkeypatch.setattr("app.MAX_CACHED_EXPORT_BLOCKS", 10)
+    schedule = [
+        {"course": f"Course {i}", "block": "study", "duration": 25, "date": "2023-11-10"}
+        for i in range(2500)
+    ]
+    token = schedule_store.put(schedule)
+
+    res = client.get(f"/download/csv?token={token}")
+
+    assert res.status_code == 200
+    assert "content-length" not in res.headers
+    assert res.text.count("\n") == 2501
+    assert schedule_store.get_export(token, "csv", lambda s: None) is None
+
+def test_warm_up_runs_every_strategy(monkeypatch):
+    """Tests that the worker warm-up schedules with each registered strategy."""
+    used = []
+    original = app_module.SchedulerEngine.generate_schedule
+
+    def generate_schedule(engine, courses, today=None):
+        used.append(engine.strategy)
+        return original(engine, courses, today)
+
+    monkeypatch.setattr(app_module.SchedulerEngine, "generate_schedule", generate_schedule)
+    app_module.warm_up()
+
+    assert used == app_module.registry.names()
+
+def test_startup_prefetches_quotes_and_warms_up(monkeypatch):
+    """Tests that the lifespan handler starts the quote prefetch and, when asked, the warm-up."""
+    prefetched = threading.Event()
+    warmed = []
+    monkeypatch.setattr(app_module.QuoteFetcher, "refill", lambda fetcher: prefetched.set())
+    monkeypatch.setattr(app_module, "warm_up", lambda: warmed.append(True))
+    monkeypatch.setenv(app_module.WARM_UP_ENV, "1")
+
+    with TestClient(app):
+        assert warmed == [True]
+
+    assert prefetched.wait(5)
+
+def test_share_caches_keeps_configured_paths(monkeypatch, tmp_path):
+    """Tests that shared cache files default to the given directory."""
+    monkeypatch.setenv("STUDYBUDDY_RESULT_CACHE", "/elsewhere/results.db")
+    monkeypatch.delenv("STUDYBUDDY_SCHEDULE_STORE", raising=False)
+    app_module.share_caches(str(tmp_path))
+
+    assert os.environ["STUDYBUDDY_SCHEDULE_STORE"] == os.path.join(str(tmp_path), "schedules.db")
+    assert os.environ["STUDYBUDDY_RESULT_CACHE"] == "/elsewhere/results.db"
+
+def test_metrics_endpoint(client, token):
+    """Tests that downloads show up on the Prometheus endpoint."""
+    client.get(f"/download/csv?token={token}")
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    assert 'studybuddy_downloads_total{filetype="csv",status="200"}' in res.text
+    assert 'studybuddy_export_seconds_count{format="csv"}' in res.text
+    assert "# TYPE studybuddy_result_cache_lookups_total counter" in res.text
+
+def test_download_can_be_profiled(client, token, monkeypatch, tmp_path):
+    """Tests that a download with the profile flag saves a profile."""
+    monkeypatch.setattr("app.request_profiler", RequestProfiler(str(tmp_path), min_interval=0))
+
+    plain = client.get(f"/download/csv?token={token}")
+    res = client.get(f"/download/csv?token={token}&profile=1")
+
+    assert "x-studybuddy-profile" not in plain.headers
+    assert res.status_code == 200
+    assert "Math,study,60,2023-11-10" in res.text
+    assert os.listdir(tmp_path) == [res.headers["x-studybuddy-profile"]]
+
+@pytest.fixture
+def large_token():
+    """Stores a schedule big enough to be compressed and provides its token.
+
+    Returns:
+        str: The download token.
+    """
+    return schedule_store.put([
+        {"course": f"Course {i % 7}", "block": "study", "duration": 25, "date": "2023-11-10"}
+        for i in range(300)
+    ])
+
+def test_download_sends_etag_and_honors_if_none_match(client, large_token):
+    """Tests that a repeat download with the ETag gets an empty 304."""
+    first = client.get(f"/download/csv?token={large_token}")
+    etag = first.headers["etag"]
+
+    again = client.get(f"/download/csv?token={large_token}", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert "Accept-Encoding" in first.headers["vary"]
+
+def test_download_is_compressed_once(client, monkeypatch):
+    """Tests gzip negotiation and that the compressed body is cached."""
+    # A schedule no other test stores, so nothing is cached for it yet
+    large_token = schedule_store.put([
+        {"course": f"Course {i % 5}", "block": "study", "duration": 50, "date": "2023-11-12"}
+        for i in range(300)
+    ])
+    calls = []
+    original = app_module.compress
+
+    def counting_compress(data, encoding):
+        calls.append(encoding)
+        return original(data, encoding)
+
+    monkeypatch.setattr("app.compress", counting_compress)
+    plain = client.get(f"/download/csv?token={large_token}", headers={"Accept-Encoding": "identity"})
+    first = client.get(f"/download/csv?token={large_token}", headers={"Accept-Encoding": "gzip"})
+    second = client.get(f"/download/csv?token={large_token}", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert first.headers["content-encoding"] == "gzip"
+    assert int(first.headers["content-length"]) < int(plain.headers["content-length"])
+    assert first.text == second.text == plain.text
+    assert first.headers["etag"] != plain.headers["etag"]
+    assert calls == ["gzip"]
+
+def test_download_survives_eviction_after_lookup(client, monkeypatch):
+    """Tests that a schedule evicted between its lookup and its export is still served."""
+    large_token = schedule_store.put([
+        {"course": f"Course {i % 7}", "block": "study", "duration": 45, "date": "2023-11-13"}
+        for i in range(300)
+    ])
+    expected = client.get(f"/download/csv?token={large_token}", headers={"Accept-Encoding": "identity"}).text
+    monkeypatch.setattr(schedule_store, "get_export", lambda token, filetype, render: None)
+
+    plain = client.get(f"/download/csv?token={large_token}", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get(f"/download/csv?token={large_token}", headers={"Accept-Encoding": "gzip"})
+
+    assert plain.status_code == gzipped.status_code == 200
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert plain.text == gzipped.text == expected
+
+def test_small_download_is_not_compressed(client, token):
+    """Tests that tiny bodies are sent as is, and revalidate by their plain tag."""
+    res = client.get(f"/download/csv?token={token}", headers={"Accept-Encoding": "gzip"})
+    again = client.get(f"/download/csv?token={token}", headers={"Accept-Encoding": "gzip", "If-None-Match": res.headers["etag"]})
+
+    assert "content-encoding" not in res.headers
+    assert again.status_code == 304
+
+def test_streamed_download_is_compressed(client, monkeypatch):
+    """Tests that schedules too large to cache are gzipped as they stream."""
+    monkeypatch.setattr("app.MAX_CACHED_EXPORT_BLOCKS", 10)
+    schedule = [
+        {"course": f"Course {i}", "block": "study", "duration": 25, "date": "2023-11-10"}
+        for i in range(2500)
+    ]
+    token = schedule_store.put(schedule)
+
+    res = client.get(f"/download/csv?token={token}", headers={"Accept-Encoding": "gzip"})
+
+    assert res.headers["content-encoding"] == "gzip"
+    assert "content-length" not in res.headers
+    assert res.text.count("\n") == 2501
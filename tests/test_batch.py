@@ -0,0 +1,58 @@
+"""Unit tests for batch schedule generation.
+
+This script tests the functionality of the scheduler.batch module,
+ensuring that batches match per-student schedules and keep input order.
+"""
+
+import sys
+import os
+from datetime import date, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.batch import generate_batch, resolve_deadlines
+from scheduler.scheduler_engine import SchedulerEngine
+
+@pytest.fixture
+def students():
+    """Provides course lists for a small cohort.
+
+    Returns:
+        list of list of dict: Each student's courses.
+    """
+    today = date.today()
+    return [
+        [
+            {"course": f"Course {j}", "deadline": str(today + timedelta(days=(i + j) % 20)), "hours": 1 + (i * j) % 5}
+            for j in range(1 + i % 4)
+        ]
+        for i in range(40)
+    ]
+
+@pytest.mark.parametrize("strategy", ["even", "urgency", "pomodoro", "capacity"])
+def test_batch_matches_per_student_loop(strategy, students):
+    """Tests that a batch in this process matches one call per student."""
+    engine = SchedulerEngine(strategy=strategy)
+    expected = [engine.generate_schedule(courses) for courses in students]
+
+    assert engine.generate_batch(students, workers=1) == expected
+
+def test_batch_across_processes_keeps_order(students):
+    """Tests that a batch fanned out over worker processes keeps input order."""
+    engine = SchedulerEngine(strategy="urgency")
+    expected = [engine.generate_schedule(courses) for courses in students]
+
+    result = generate_batch(students, strategy="urgency", workers=2, chunksize=7, columnar=True)
+
+    assert [list(blocks) for blocks in result] == expected
+
+def test_deadlines_are_parsed_once(students):
+    """Tests that equal deadline strings share one parsed date."""
+    resolved = resolve_deadlines(students)
+
+    assert isinstance(resolved[0][0]["deadline"], date)
+    assert isinstance(students[0][0]["deadline"], str)
+    assert resolved[2][0]["deadline"] is resolved[1][1]["deadline"]
+    with pytest.raises(ValueError):
+        generate_batch(students, strategy="unknown")
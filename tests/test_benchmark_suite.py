@@ -0,0 +1,44 @@
+"""Unit tests for the benchmark suite's baseline comparison.
+
+This script tests the compare function of benchmarks/suite.py, ensuring
+that slowdowns beyond the tolerance are reported as regressions and that
+the suite exits with an error status when it finds one.
+"""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import suite
+
+def results(**seconds):
+    """Builds a results document with the given seconds per case."""
+    return {"version": suite.RESULTS_VERSION, "results": {
+        name: {"seconds": value, "number": 1} for name, value in seconds.items()
+    }}
+
+def test_compare_classifies_cases():
+    """Tests that cases are marked by how they moved against the baseline."""
+    baseline = results(steady=1.0, slower=1.0, faster=1.0)
+    current = results(steady=1.4, slower=1.6, faster=0.6, added=1.0)
+
+    rows = {name: status for name, _, _, status in suite.compare(current, baseline, tolerance=0.5)}
+
+    assert rows == {"steady": "ok", "slower": "regression", "faster": "faster", "added": "new"}
+
+def test_regression_fails_the_run(monkeypatch, tmp_path, capsys):
+    """Tests that main() returns 1 on a regression and 0 otherwise."""
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(results(case=1.0)))
+    monkeypatch.setattr(suite, "build_cases", lambda quick: [("case", lambda: None)])
+
+    monkeypatch.setattr(suite, "time_case", lambda run, repeat, min_time: (2.0, 1))
+    assert suite.main(["--baseline", str(baseline)]) == 1
+    assert "1 regression(s)" in capsys.readouterr().out
+
+    monkeypatch.setattr(suite, "time_case", lambda run, repeat, min_time: (1.1, 1))
+    out = tmp_path / "results.json"
+    assert suite.main(["--baseline", str(baseline), "--json", str(out)]) == 0
+    assert json.loads(out.read_text())["results"]["case"]["seconds"] == 1.1
@@ -0,0 +1,179 @@
+"""Unit tests for ScheduleBlocks.
+
+This script tests the functionality of the ScheduleBlocks class, ensuring
+that columnar blocks behave like the list of dicts they replace while
+using far less memory.
+"""
+
+import sys
+import os
+import tracemalloc
+from array import array
+from datetime import date, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from exporter.file_exporter import FileExporter
+from scheduler.blocks import ScheduleBlocks
+from scheduler.scheduler_engine import SchedulerEngine
+
+@pytest.fixture
+def sample_schedule():
+    """Provides a sample schedule for testing.
+
+    Returns:
+        list of dict: A list of schedule blocks with 'course', 'block',
+        'duration', and 'date' keys.
+    """
+    return [
+        {"course": "Math", "block": "study", "duration": 60, "date": "2023-11-11"},
+        {"course": "Science", "block": "review", "duration": 30, "date": "2023-11-10"},
+        {"course": "Math", "block": "break", "duration": 5, "date": "2023-11-10"},
+        {"course": "Math", "block": "study", "duration": 90, "date": "2023-11-11"}
+    ]
+
+def test_round_trip_and_indexing(sample_schedule):
+    """Tests that blocks iterate, index and slice like the original dicts."""
+    blocks = ScheduleBlocks.from_dicts(sample_schedule)
+
+    assert len(blocks) == 4
+    assert list(blocks) == sample_schedule
+    assert blocks == sample_schedule
+    assert blocks[1] == sample_schedule[1]
+    assert blocks[1:3] == sample_schedule[1:3]
+    assert blocks.course_names == ["Math", "Science"]
+
+def test_group_and_sum(sample_schedule):
+    """Tests grouping by date and totaling minutes per course."""
+    blocks = ScheduleBlocks.from_dicts(sample_schedule)
+    grouped = blocks.group_by_date()
+
+    assert list(grouped) == ["2023-11-10", "2023-11-11"]
+    assert grouped["2023-11-10"] == sample_schedule[1:3]
+    assert blocks.sum_by_course() == {"Math": 155, "Science": 30}
+    assert blocks.sum_by_course("study") == {"Math": 150}
+    assert blocks.sum_by_course("nap") == {}
+
+def test_exports_match_dict_exports(sample_schedule):
+    """Tests that exporting from columns gives the same files as from dicts."""
+    exporter = FileExporter()
+    blocks = ScheduleBlocks.from_dicts(sample_schedule)
+
+    assert exporter.export_to_csv(blocks) == exporter.export_to_csv(sample_schedule)
+    assert exporter.export_to_txt(blocks) == exporter.export_to_txt(sample_schedule)
+    assert exporter.export_to_jsonl(blocks) == exporter.export_to_jsonl(sample_schedule)
+
+def test_from_columns_with_block_types(sample_schedule):
+    """Tests building blocks from typed columns whose block type names are in another order."""
+    ordinals = array("i", [date(2023, 11, 10).toordinal()] * 3)
+    blocks = ScheduleBlocks.from_columns(
+        ["Math"], [0, 0, 0], ordinals, array("q", [100_000, 5, 30]),
+        block_names=["review", "study", "break"], block_types=[1, 2, 0],
+    )
+
+    assert [b["block"] for b in blocks] == ["study", "break", "review"]
+    assert blocks.durations.typecode == "q"
+    assert blocks.sum_by_course("review") == {"Math": 30}
+
+@pytest.mark.parametrize("strategy,backend", [
+    ("even", "python"), ("urgency", "python"), ("pomodoro", "python"),
+    ("even", "numpy"), ("urgency", "numpy"),
+])
+def test_generate_blocks_matches_generate_schedule(strategy, backend):
+    """Tests that every strategy's columnar output matches its dict output."""
+    today = date.today()
+    courses = [
+        {"course": f"Course {i}", "deadline": str(today + timedelta(days=3 * i)), "hours": i + 1}
+        for i in range(10)
+    ]
+    engine = SchedulerEngine(strategy=strategy, backend=backend)
+
+    assert engine.generate_blocks(courses) == engine.generate_schedule(courses)
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("strategy", ["even", "urgency"])
+def test_generate_blocks_with_repeated_names_and_long_blocks(strategy, backend):
+    """Tests columnar output for courses sharing a name and blocks too long for 16 bits."""
+    today = date(2025, 1, 6)
+    courses = [
+        {"course": "C0", "deadline": str(today + timedelta(days=4)), "hours": 1},
+        {"course": "C1", "deadline": str(today + timedelta(days=2)), "hours": 3},
+        {"course": "C0", "deadline": str(today), "hours": 1000},
+    ]
+    engine = SchedulerEngine(strategy=strategy, backend=backend, cache=None)
+    blocks = engine.generate_blocks(courses, today)
+
+    assert blocks == engine.generate_schedule(courses, today)
+    assert blocks.course_names == ["C0", "C1"] or blocks.course_names == ["C1", "C0"]
+    assert len(blocks.durations) == len(blocks.ordinals)
+    assert max(blocks.durations) == 60000
+
+def test_durations_widen_when_overflowing_mid_list():
+    """Tests that a duration too long for 16 bits in the middle of a batch isn't stored twice."""
+    day = date(2025, 1, 6)
+    blocks = ScheduleBlocks.from_columns(["Math"], [0, 0, 0], [day.toordinal()] * 3, [30, 40_000, 20])
+    assert list(blocks.durations) == [30, 40_000, 20]
+    assert blocks.durations.typecode == "q"
+
+    blocks = ScheduleBlocks()
+    blocks.extend_rows([("Math", "study", 30, day), ("Math", "study", -40_000, day), ("Art", "break", 5, day)])
+    assert list(blocks.durations) == [30, -40_000, 5]
+    assert len(blocks.durations) == len(blocks.course_ids) == 3
+
+def test_concat_matches_from_dicts(sample_schedule):
+    """Tests that joining per-day blocks gives the same blocks and digest as one from_dicts()."""
+    schedule = sorted(sample_schedule, key=lambda b: b["date"]) + [
+        {"course": "Art", "block": "nap", "duration": 40_000, "date": "2023-11-12"},
+        {"course": "Science", "block": "study", "duration": 20, "date": "2023-11-13"},
+    ]
+    days = {}
+    for block in schedule:
+        days.setdefault(block["date"], []).append(block)
+    joined = ScheduleBlocks.concat(ScheduleBlocks.from_dicts(blocks) for blocks in days.values())
+    whole = ScheduleBlocks.from_dicts(schedule)
+
+    assert joined == schedule
+    assert joined.durations.typecode == "q"
+    assert joined.digest() == whole.digest()
+    assert ScheduleBlocks.concat([]).digest() == ScheduleBlocks().digest()
+
+def test_appending_to_slices_leaves_the_parent_alone(sample_schedule):
+    """Tests that slices and days copy the shared name tables before adding to them."""
+    blocks = ScheduleBlocks.from_dicts(sample_schedule)
+    digest = blocks.digest()
+    day = blocks.group_by_date()["2023-11-10"]
+    head = blocks[:2]
+
+    day.append("History", "quiz", 15, "2023-11-10")
+    head.append("Art", "study", 20, "2023-11-12")
+
+    assert blocks.course_names == ["Math", "Science"]
+    assert "quiz" not in blocks.block_names
+    assert blocks.digest() == digest
+    assert day[-1] == {"course": "History", "block": "quiz", "duration": 15, "date": "2023-11-10"}
+    assert head.course_names == ["Math", "Science", "Art"]
+    assert "History" not in head.course_names
+
+    blocks.append("Music", "study", 10, "2023-11-12")
+    assert "Music" not in head.course_names
+
+def test_memory_is_an_order_of_magnitude_smaller():
+    """Tests that columns use at least 10x less memory than block dicts."""
+    start = date(2025, 1, 1)
+    schedule = [
+        {"course": f"Course {i % 20}", "block": "study", "duration": 25, "date": str(start + timedelta(days=i % 300))}
+        for i in range(20000)
+    ]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    dicts = [dict(b, date=str(date.fromisoformat(b["date"]))) for b in schedule]
+    dict_bytes = tracemalloc.get_traced_memory()[0] - before
+    before = tracemalloc.get_traced_memory()[0]
+    blocks = ScheduleBlocks.from_dicts(schedule)
+    column_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    assert len(dicts) == len(blocks)
+    assert column_bytes * 10 < dict_bytes
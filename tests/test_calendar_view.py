@@ -0,0 +1,143 @@
+"""Unit tests for the CalendarView component.
+
+This script tests the calendar paging helpers and checks that the
+CalendarView only renders the days of the page being shown, so the
+payload sent to the browser stays bounded for long schedules.
+"""
+
+import sys
+import os
+import asyncio
+import json
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from reactpy import component, use_state
+from reactpy.core.layout import Layout
+
+from frontend import ui
+from frontend.ui import CalendarView, calendar_pages, load_session
+from scheduler.blocks import ScheduleBlocks
+from scheduler.incremental import IncrementalScheduler
+from scheduler.scheduler_engine import SchedulerEngine
+from storage.sqlite_store import SQLiteStore
+
+def pomodoro_plan(deadline):
+    """Builds a Pomodoro schedule for five courses starting on 2099-01-01.
+
+    Args:
+        deadline (str): Deadline of every course.
+
+    Returns:
+        ScheduleBlocks: The schedule blocks.
+    """
+    courses = [{"course": f"Course {i}", "deadline": deadline, "hours": 100} for i in range(5)]
+    return SchedulerEngine(strategy="pomodoro").generate_blocks(courses, date(2099, 1, 1))
+
+def find_handler(model, text, event="on_click"):
+    """Finds the event handler target of the element whose text is given."""
+    if model.get("children") == [text]:
+        return model["eventHandlers"][event]["target"]
+    for child in model.get("children", []):
+        if isinstance(child, dict):
+            target = find_handler(child, text, event)
+            if target:
+                return target
+    return None
+
+async def render_and_click(schedule_blocks, button):
+    """Renders a CalendarView, clicks a button and returns both payloads as JSON."""
+    async with Layout(CalendarView(schedule_blocks)) as layout:
+        update = await layout.render()
+        target = find_handler(update["model"], button)
+        await layout.deliver({"type": "layout-event", "target": target, "data": [{}]})
+        click = await layout.render()
+    return json.dumps(update), json.dumps(click)
+
+def test_calendar_pages_by_week_and_month():
+    """Tests that days are split into Monday-to-Sunday weeks and calendar months."""
+    grouped = dict.fromkeys(["2025-03-01", "2025-03-02", "2025-03-03", "2025-03-09", "2025-03-10", "2025-04-01"])
+
+    assert calendar_pages(grouped, "week") == [
+        ["2025-03-01", "2025-03-02"], ["2025-03-03", "2025-03-09"], ["2025-03-10"], ["2025-04-01"]
+    ]
+    assert calendar_pages(grouped, "month") == [
+        ["2025-03-01", "2025-03-02", "2025-03-03", "2025-03-09", "2025-03-10"], ["2025-04-01"]
+    ]
+    assert calendar_pages({}) == []
+
+def test_payload_independent_of_schedule_length():
+    """Tests that a year-long plan sends no more than a two-week plan per interaction."""
+    short = asyncio.run(render_and_click(pomodoro_plan("2099-01-14"), "Next ▶"))
+    long = asyncio.run(render_and_click(pomodoro_plan("2099-12-31"), "Next ▶"))
+
+    assert "(2 of 35)" in long[1]
+    assert len(long[0]) <= len(short[0]) * 1.1
+    assert len(long[1]) <= len(short[1]) * 1.1
+    assert len(long[0]) < 20_000
+
+def test_patches_only_the_changed_days(monkeypatch):
+    """Tests that showing the planner's per-day blocks again only regroups the days it rebuilt."""
+    planner = IncrementalScheduler("even", today=date(2099, 1, 1))
+    courses = [{"course": f"Course {i}", "deadline": f"2099-01-{10 + 5 * i}", "hours": 10} for i in range(3)]
+    planner.update(courses)
+    setters = {}
+
+    @component
+    def Planner():
+        """Shows the planner's calendar, with a setter the test calls after an update.
+
+        Returns:
+            ReactPy component: The calendar view.
+        """
+        args, set_args = use_state((planner.grouped(), ()))
+        setters["args"] = set_args
+        return CalendarView(*args)
+
+    async def render_edit():
+        """Renders the calendar, edits a course and renders the patched calendar."""
+        async with Layout(Planner()) as layout:
+            first = await layout.render()
+            edited = [dict(c) for c in courses]
+            edited[0]["hours"] = 20
+            diff = planner.update(edited)
+            monkeypatch.setattr(ui, "group_schedule", None)
+            sums = []
+            sum_by_course = ScheduleBlocks.sum_by_course
+            monkeypatch.setattr(ScheduleBlocks, "sum_by_course", lambda self: sums.append(self) or sum_by_course(self))
+            setters["args"]((planner.grouped(), diff.days))
+            second = await layout.render()
+        return json.dumps(first), json.dumps(second), len(sums), len(diff.days)
+
+    first, second, regrouped, changed = asyncio.run(render_edit())
+
+    assert "Course 0: 0 of 600 min" in first
+    assert "Course 0: 0 of 1200 min" in second
+    assert regrouped == changed == 10
+
+def test_saved_schedule_loads_pages_as_they_are_shown(tmp_path, monkeypatch):
+    """Tests that a restored schedule loads its first week, then each page it is paged to."""
+    store = SQLiteStore(str(tmp_path / "studybuddy.db"))
+    monkeypatch.setattr(ui, "default_store", lambda: store)
+    store.save_schedule("alice", pomodoro_plan("2099-01-31"))
+    _, saved = load_session("alice")
+    pages = calendar_pages(saved.dates)
+
+    assert list(saved.grouped) == pages[0]
+
+    async def page_forward():
+        """Renders the saved schedule, pages forward and waits for the page to load."""
+        async with Layout(CalendarView(saved)) as layout:
+            first = await layout.render()
+            target = find_handler(first["model"], "Next ▶")
+            await layout.deliver({"type": "layout-event", "target": target, "data": [{}]})
+            await layout.render()
+            await asyncio.wait_for(layout.render(), 5)
+        return json.dumps(first)
+
+    first = asyncio.run(page_forward())
+    store.close()
+
+    assert "Course 0: 0 of 6000 min" in first
+    assert list(saved.grouped) == pages[0] + pages[1]
@@ -0,0 +1,95 @@
+"""Unit tests for the CapacityStrategy.
+
+This script tests the functionality of the CapacityStrategy class,
+ensuring that daily caps, blackout dates and weekday availability are
+respected and that time which doesn't fit is reported.
+"""
+
+import sys
+import os
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.capacity import CapacityStrategy
+from scheduler.scheduler_engine import SchedulerEngine
+
+@pytest.fixture
+def today():
+    """Provides today's date.
+
+    Returns:
+        datetime.date: Today.
+    """
+    return date.today()
+
+def daily_totals(schedule):
+    """Sums the scheduled minutes per date."""
+    totals = defaultdict(int)
+    for block in schedule:
+        totals[block["date"]] += block["duration"]
+    return totals
+
+def test_daily_cap_and_deadlines(today):
+    """Tests that no day exceeds the cap and earlier deadlines go first."""
+    courses = [
+        {"course": "Math", "deadline": str(today + timedelta(days=9)), "hours": 10},
+        {"course": "Science", "deadline": str(today + timedelta(days=2)), "hours": 5}
+    ]
+    schedule, unscheduled = CapacityStrategy(daily_hours=3).plan(courses)
+
+    assert unscheduled == {}
+    assert max(daily_totals(schedule).values()) <= 180
+    assert schedule[0] == {"course": "Science", "block": "study", "duration": 180, "date": str(today)}
+    assert sum(b["duration"] for b in schedule if b["course"] == "Math") == 600
+    assert all(b["date"] <= str(today + timedelta(days=2)) for b in schedule if b["course"] == "Science")
+
+def test_blackouts_and_weekdays(today):
+    """Tests that blacked-out dates and unavailable weekdays get no time."""
+    blackout = today + timedelta(days=1)
+    weekdays = [d for d in range(7) if d != (today + timedelta(days=2)).weekday()]
+    courses = [{"course": "Math", "deadline": str(today + timedelta(days=5)), "hours": 4}]
+
+    schedule = CapacityStrategy(daily_hours=1, blackout_dates=[str(blackout)], weekdays=weekdays).schedule(courses)
+    dates = [b["date"] for b in schedule]
+
+    assert str(blackout) not in dates
+    assert str(today + timedelta(days=2)) not in dates
+    assert len(dates) == 4
+
+def test_infeasible_time_is_reported(today):
+    """Tests that time that can't fit before a deadline is reported."""
+    courses = [
+        {"course": "Math", "deadline": str(today + timedelta(days=1)), "hours": 5},
+        {"course": "Art", "deadline": "2000-01-01", "hours": 1}
+    ]
+    schedule, unscheduled = CapacityStrategy(daily_hours=2).plan(courses)
+
+    assert sum(daily_totals(schedule).values()) == 240
+    assert unscheduled == {"Math": 120}
+
+def test_engine_capacity_strategy(today):
+    """Tests that the engine runs the capacity strategy with its options."""
+    courses = [{"course": "Math", "deadline": str(today + timedelta(days=30)), "hours": 10}]
+    engine = SchedulerEngine(strategy="capacity", options={"daily_hours": 2})
+
+    assert max(daily_totals(engine.generate_schedule(courses)).values()) == 120
+    with pytest.raises(ValueError):
+        CapacityStrategy(weekdays=[7])
+
+def test_scales_to_thousands_of_courses(today):
+    """Tests that a year with 5,000 courses schedules interactively."""
+    courses = [
+        {"course": f"Course {i}", "deadline": str(today + timedelta(days=i % 365)), "hours": 1 + i % 3}
+        for i in range(5000)
+    ]
+    start = time.perf_counter()
+    schedule, unscheduled = CapacityStrategy(daily_hours=12).plan(courses)
+
+    assert time.perf_counter() - start < 2.0
+    assert max(daily_totals(schedule).values()) <= 720
+    scheduled = sum(b["duration"] for b in schedule)
+    assert scheduled + sum(unscheduled.values()) == sum(60 * (1 + i % 3) for i in range(5000))
@@ -0,0 +1,136 @@
+"""Unit tests for chart rendering.
+
+This script tests the functionality of the scheduler.charts module,
+ensuring that pie charts are rendered as valid SVG and that importing the
+scheduler does not import matplotlib.
+"""
+
+import sys
+import os
+import asyncio
+import base64
+import subprocess
+import xml.etree.ElementTree as ET
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from scheduler.charts import (
+    ChartCache, ChartRenderPool, course_durations, generate_pie_chart,
+    generate_pie_chart_png, render_pie_png, svg_data_uri,
+)
+
+# Seconds allowed for importing the scheduler engine in a fresh interpreter
+IMPORT_BUDGET_SECONDS = 0.5
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+@pytest.fixture
+def day_blocks():
+    """Provides the schedule blocks for one day.
+
+    Returns:
+        list of dict: Blocks with 'course' and 'duration' keys.
+    """
+    return [
+        {"course": "Math", "block": "study", "duration": 60, "date": "2023-11-10"},
+        {"course": "Science & Art", "block": "study", "duration": 30, "date": "2023-11-10"},
+        {"course": "Math", "block": "break", "duration": 30, "date": "2023-11-10"}
+    ]
+
+def test_svg_pie_chart(day_blocks):
+    """Tests that the SVG chart has one slice and two labels per course."""
+    svg = generate_pie_chart(day_blocks)
+    root = ET.fromstring(svg)
+
+    assert len(root.findall(f"{SVG_NS}path")) == 2
+    texts = [t.text for t in root.findall(f"{SVG_NS}text")]
+    assert texts == ["75%", "Math", "25%", "Science & Art"]
+    assert svg_data_uri(svg).startswith("data:image/svg+xml")
+
+def test_svg_pie_chart_single_course():
+    """Tests that a day with a single course is drawn as a full circle."""
+    root = ET.fromstring(generate_pie_chart([{"course": "Math", "duration": 25}]))
+
+    assert len(root.findall(f"{SVG_NS}circle")) == 1
+    assert not root.findall(f"{SVG_NS}path")
+
+def test_chart_cache_hits_on_equal_totals(day_blocks):
+    """Tests that days with the same per-course totals share one cached chart."""
+    cache = ChartCache()
+    other_day = [
+        {"course": "Math", "block": "study", "duration": 90, "date": "2023-11-11"},
+        {"course": "Science & Art", "block": "study", "duration": 30, "date": "2023-11-11"}
+    ]
+
+    first = cache.get_svg(course_durations(day_blocks))
+    second = cache.get_svg(course_durations(other_day))
+
+    assert first is second
+    assert first == generate_pie_chart(day_blocks)
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+def test_chart_cache_is_bounded():
+    """Tests that the least recently used chart is evicted when the cache is full."""
+    cache = ChartCache(max_entries=2)
+    cache.get_svg({"Math": 10})
+    cache.get_svg({"Math": 20})
+    cache.get_svg({"Math": 10})
+    cache.get_svg({"Math": 30})
+    cache.get_svg({"Math": 10})
+
+    assert cache.stats() == {"hits": 2, "misses": 3, "size": 2}
+
+def test_png_pie_chart(day_blocks):
+    """Tests that the matplotlib renderer still produces a PNG."""
+    png = base64.b64decode(generate_pie_chart_png(day_blocks))
+
+    assert png.startswith(b"\x89PNG")
+
+def test_png_rendering_is_thread_safe(day_blocks):
+    """Tests that PNG charts can be rendered from several threads at once."""
+    from concurrent.futures import ThreadPoolExecutor
+    durations = [{"Math": minutes, "Art": 30} for minutes in range(10, 90, 10)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        pngs = list(executor.map(render_pie_png, durations))
+
+    assert all(base64.b64decode(png).startswith(b"\x89PNG") for png in pngs)
+
+def test_render_pool_with_backpressure():
+    """Tests rendering PNG charts on the process pool with one pending slot.
+
+    Concurrent requests queue for the slot instead of failing, and a repeat
+    request is served from the cache.
+    """
+    cache = ChartCache()
+    pool = ChartRenderPool(max_workers=2, max_pending=1, cache=cache)
+
+    async def main():
+        first = await asyncio.gather(*(pool.render_png({"Math": m, "Art": 30}) for m in (10, 20, 30)))
+        again = await pool.render_png({"Math": 10, "Art": 30})
+        return first, again
+
+    try:
+        pngs, again = asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    assert len(set(pngs)) == 3
+    assert again == pngs[0]
+    assert cache.stats() == {"hits": 1, "misses": 3, "size": 3}
+
+def test_scheduler_import_budget():
+    """Tests that importing the scheduler is fast and skips matplotlib."""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import scheduler.scheduler_engine\n"
+        "print(time.perf_counter() - start, 'matplotlib' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    elapsed, has_matplotlib = out.stdout.split()
+
+    assert has_matplotlib == "False"
+    assert float(elapsed) < IMPORT_BUDGET_SECONDS
@@ -1,17 +1,22 @@
 """Unit tests for the FileExporter.
 
 This script tests the functionality of the FileExporter class, ensuring
-that schedules are correctly exported to CSV and plain text formats.
+that schedules are correctly exported to every registered format and
+loaded back.
 """
 
+import io
 import sys
+from array import array
 import os
 import pytest
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from exporter import columnar
 from exporter.file_exporter import FileExporter
+from scheduler.blocks import ScheduleBlocks
 
 @pytest.fixture
 def sample_schedule():
@@ -53,3 +58,133 @@ def test_export_to_txt(sample_schedule):
     assert "2023-11-11 | Math | study | 90 min" in txt_output
     assert txt_output.count("\n") == 2  # 3 rows = 2 newlines
 
+def test_streaming_exports_match_full_exports(sample_schedule):
+    """Tests that the chunked exporters produce the same content as the full exports.
+
+    Uses a chunk size smaller than the schedule so that several chunks are yielded.
+    """
+    exporter = FileExporter(chunk_size=2)
+    schedule = sample_schedule * 3
+
+    csv_chunks = list(exporter.iter_csv(schedule))
+    txt_chunks = list(exporter.iter_txt(iter(schedule)))
+
+    assert len(csv_chunks) == 5
+    assert len(txt_chunks) == 5
+    assert "".join(csv_chunks) == FileExporter().export_to_csv(schedule)
+    assert "".join(txt_chunks) == FileExporter().export_to_txt(schedule)
+
+@pytest.mark.parametrize("name", FileExporter.format_names())
+def test_formats_round_trip(sample_schedule, name):
+    """Tests that every available format loads back the schedule it exported.
+
+    Both block dicts and ScheduleBlocks are exported, with a chunk size
+    smaller than the schedule so that several chunks are written.
+    """
+    exporter = FileExporter(chunk_size=2)
+    spec = FileExporter.get_format(name)
+    for schedule in (sample_schedule, ScheduleBlocks.from_dicts(sample_schedule)):
+        content = exporter.export(name, schedule)
+        stream = io.BytesIO(content) if spec.binary else io.StringIO(content, newline="")
+        assert exporter.load(name, stream) == sample_schedule
+    empty = exporter.export(name, [])
+    stream = io.BytesIO(empty) if spec.binary else io.StringIO(empty, newline="")
+    assert exporter.load(name, stream) == []
+
+def test_filename_writes_the_file(sample_schedule, tmp_path):
+    """Tests that passing a filename streams the export to that file."""
+    exporter = FileExporter(chunk_size=1)
+    csv_path = tmp_path / "schedule.csv"
+    columns_path = tmp_path / "schedule.sbc"
+
+    assert exporter.export_to_csv(sample_schedule, str(csv_path)) == str(csv_path)
+    assert exporter.export("columns", sample_schedule, str(columns_path)) == str(columns_path)
+
+    assert csv_path.read_bytes().decode("utf-8") == exporter.export_to_csv(sample_schedule)
+    assert columns_path.read_bytes() == exporter.export("columns", sample_schedule)
+    assert exporter.load("csv", str(csv_path)) == sample_schedule
+    assert exporter.load("columns", str(columns_path)) == sample_schedule
+
+def test_ics_events(sample_schedule):
+    """Tests that iCalendar events are escaped, folded and laid out through the day."""
+    schedule = sample_schedule + [
+        {"course": "History, 1; intro " + "x" * 80, "block": "study", "duration": 45, "date": "2023-11-10"},
+    ]
+    content = FileExporter().export_to_ics(schedule)
+    lines = content.split("\r\n")
+
+    assert content.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n")
+    assert content.endswith("END:VCALENDAR\r\n")
+    assert content.count("BEGIN:VEVENT") == 4
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    # Day's blocks follow each other from 8:00
+    assert [line for line in lines if line.startswith("DTSTART")] == [
+        "DTSTART:20231110T080000", "DTSTART:20231110T090000",
+        "DTSTART:20231111T080000", "DTSTART:20231110T093000",
+    ]
+    assert "SUMMARY:History\\, 1\\; intro " in content
+    assert FileExporter().load("ics", io.StringIO(content, newline="")) == schedule
+
+def test_columns_file_layout(sample_schedule):
+    """Tests that the columns file header describes aligned columns and bad files are refused."""
+    blocks = ScheduleBlocks.from_dicts(sample_schedule)
+    content = FileExporter().export("columns", blocks)
+    rows, duration_typecode, names_length = columnar.parse_header(content[:columnar.HEADER.size])
+    offsets = columnar.column_offsets(rows, duration_typecode, names_length)
+
+    assert rows == 3
+    assert duration_typecode == "h"
+    assert all(offset % columnar.ALIGNMENT == 0 for offset, _ in offsets.values())
+    offset, _ = offsets["durations"]
+    assert memoryview(content)[offset:offset + 6].cast("h").tolist() == [60, 30, 90]
+
+    with pytest.raises(ValueError):
+        FileExporter().load("columns", io.BytesIO(b"not a columns file at all"))
+    with pytest.raises(ValueError):
+        FileExporter().load("columns", io.BytesIO(content[:-8]))
+
+def test_columns_file_duration_type_codes(sample_schedule):
+    """Tests that other integer duration columns are written as h or q and bad type codes get their own error."""
+    blocks = ScheduleBlocks.from_dicts(sample_schedule)
+    wide = ScheduleBlocks.from_columns(
+        blocks.course_names, blocks.course_ids, blocks.ordinals, array("l", blocks.durations),
+        block_names=blocks.block_names, block_types=blocks.block_types,
+    )
+    content = FileExporter().export("columns", wide)
+
+    assert columnar.parse_header(content[:columnar.HEADER.size])[1] == "q"
+    assert FileExporter().load("columns", io.BytesIO(content)) == sample_schedule
+
+    wide.durations = array("d", blocks.durations)
+    with pytest.raises(ValueError, match="type code 'd'"):
+        FileExporter().export("columns", wide)
+
+    header = bytearray(FileExporter().export("columns", blocks)[:columnar.HEADER.size])
+    header[6:7] = b"l"
+    with pytest.raises(ValueError, match="Unsupported duration type code 'l'"):
+        columnar.parse_header(header)
+    header[5] = 2
+    with pytest.raises(ValueError, match="version 2"):
+        columnar.parse_header(header)
+
+def test_format_registry(sample_schedule):
+    """Tests that formats can be registered and unknown formats are refused."""
+    exporter = FileExporter()
+    with pytest.raises(ValueError):
+        exporter.export("xlsx", sample_schedule)
+    with pytest.raises(ValueError):
+        FileExporter.get_format("xlsx")
+
+    FileExporter.register_format("courses", lambda self, schedule: (f"{e['course']}\n" for e in schedule))
+    try:
+        assert exporter.export("courses", sample_schedule) == "Math\nScience\nMath\n"
+        assert "courses" in FileExporter.format_names()
+        with pytest.raises(ValueError):
+            exporter.load("courses", io.StringIO(""))
+    finally:
+        del FileExporter._formats["courses"]
+
+    arrow = FileExporter.get_format("arrow")
+    assert arrow.requires == "pyarrow"
+    assert ("arrow" in FileExporter.format_names()) == arrow.available
+    assert FileExporter.columnar_format() == ("arrow" if arrow.available else "columns")
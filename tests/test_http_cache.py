@@ -0,0 +1,64 @@
+"""Unit tests for the download caching and compression helpers.
+
+This script tests the functionality of the exporter.http_cache module,
+ensuring that ETags are matched like RFC 9110 describes, content codings
+are negotiated by quality, and streamed compression round-trips.
+"""
+
+import sys
+import os
+import gzip
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from exporter import http_cache
+from exporter.http_cache import choose_encoding, compress, etag_matches, iter_compressed, strong_etag
+
+def test_strong_etag_per_encoding():
+    """Tests that each content coding gets its own tag."""
+    assert strong_etag("abc", "csv") == '"abc.csv"'
+    assert strong_etag("abc", "csv", "gzip") == '"abc.csv.gzip"'
+    assert strong_etag("abc", "txt") != strong_etag("abc", "csv")
+
+def test_etag_matches():
+    """Tests If-None-Match lists, weak tags and the wildcard."""
+    etag = strong_etag("abc", "csv")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+def test_choose_encoding(monkeypatch):
+    """Tests negotiation by quality values."""
+    monkeypatch.setattr(http_cache, "ENCODINGS", ("br", "gzip"))
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("br;q=0.5, gzip") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("*") == "br"
+    assert choose_encoding("") is None
+
+    monkeypatch.setattr(http_cache, "ENCODINGS", ("gzip",))
+    assert choose_encoding("br") is None
+
+def test_gzip_is_deterministic():
+    """Tests that equal bodies compress to equal bytes."""
+    data = b"Math,study,60,2023-11-10\r\n" * 100
+    assert compress(data, "gzip") == compress(data, "gzip")
+    assert gzip.decompress(compress(data, "gzip")) == data
+
+def test_streamed_gzip_round_trips():
+    """Tests that streamed compression decodes to the joined chunks."""
+    chunks = [f"row {i}\n" * 50 for i in range(20)]
+    body = b"".join(iter_compressed(chunks, "gzip"))
+    assert gzip.decompress(body) == "".join(chunks).encode("utf-8")
+
+@pytest.mark.skipif(http_cache.brotli is None, reason="brotli is not installed")
+def test_brotli_round_trips():
+    """Tests brotli whole-body and streamed compression."""
+    brotli = http_cache.brotli
+    chunks = [f"row {i}\n" * 50 for i in range(20)]
+    data = "".join(chunks).encode("utf-8")
+    assert brotli.decompress(compress(data, "br")) == data
+    assert brotli.decompress(b"".join(iter_compressed(chunks, "br"))) == data
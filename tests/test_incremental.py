@@ -0,0 +1,132 @@
+"""Unit tests for incremental rescheduling.
+
+This script tests the IncrementalScheduler and ScheduleDiff classes,
+ensuring that incremental updates match full schedules and that diffs
+only touch the days that changed.
+"""
+
+import sys
+import os
+from datetime import date, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.blocks import ScheduleBlocks
+from scheduler.incremental import IncrementalScheduler
+from scheduler.scheduler_engine import SchedulerEngine
+
+TODAY = date(2025, 3, 3)
+
+def day(offset):
+    """Returns the date string a number of days after TODAY."""
+    return str(TODAY + timedelta(days=offset))
+
+def by_date(schedule):
+    """Returns a full run's blocks stably sorted by date, the order IncrementalScheduler keeps."""
+    return sorted(schedule, key=lambda b: b["date"])
+
+@pytest.fixture
+def courses():
+    """Provides a list of courses with staggered deadlines.
+
+    Returns:
+        list of dict: A list of courses with 'course', 'deadline', and 'hours' keys.
+    """
+    return [
+        {"course": f"Course {i}", "deadline": day(3 + i * 2), "hours": 2 + i}
+        for i in range(6)
+    ]
+
+@pytest.mark.parametrize("strategy", ["even", "urgency", "pomodoro", "capacity"])
+def test_updates_match_full_schedule(strategy, courses):
+    """Tests that adding, editing and removing courses matches a full run, block for block."""
+    engine = SchedulerEngine(strategy=strategy, options={"daily_hours": 3} if strategy == "capacity" else None)
+    planner = engine.incremental_scheduler(TODAY)
+
+    planner.update(courses)
+    assert planner.schedule() == by_date(engine.generate_schedule(courses, TODAY))
+
+    edited = [dict(c) for c in courses]
+    edited[2]["hours"] = 9
+    planner.update(edited)
+    assert planner.schedule() == by_date(engine.generate_schedule(edited, TODAY))
+
+    # Moving a deadline forward moves the course ahead of others on shared days
+    edited[4]["deadline"] = day(2)
+    planner.update(edited)
+    assert planner.schedule() == by_date(engine.generate_schedule(edited, TODAY))
+
+    keys = [0, 1, 3, 4, 5]
+    remaining = [edited[k] for k in keys]
+    planner.update(remaining, keys=keys)
+    assert planner.schedule() == by_date(engine.generate_schedule(remaining, TODAY))
+
+    planner.set_course(6, {"course": "Course 6", "deadline": day(1), "hours": 1})
+    remaining.append({"course": "Course 6", "deadline": day(1), "hours": 1})
+    assert planner.schedule() == by_date(engine.generate_schedule(remaining, TODAY))
+
+def test_edit_only_reschedules_that_course(courses):
+    """Tests that editing one course only changes the days it covers."""
+    planner = IncrementalScheduler("even", today=TODAY)
+    planner.update(courses)
+
+    diff = planner.set_course(0, {"course": "Course 0", "deadline": day(1), "hours": 4})
+
+    assert diff.days == [day(0), day(1), day(2), day(3)]
+    assert {key for _, key, _ in diff.changes} == {0}
+    assert not planner.set_course(0, {"course": "Course 0", "deadline": day(1), "hours": 4})
+
+def test_diff_patches_a_grouped_view(courses):
+    """Tests that applying every diff to a grouped view keeps it in sync."""
+    planner = IncrementalScheduler("urgency", today=TODAY)
+    view = planner.update(courses).apply({})
+
+    planner.update(courses[:4]).apply(view)
+    planner.remove_course(0).apply(view)
+
+    assert {date: [b for blocks in view[date].values() for b in blocks] for date in view} == \
+        {date: planner.day(date) for date in planner.dates()}
+
+def test_capacity_diff_lists_changed_days(courses):
+    """Tests that a capacity replan only reports days whose blocks changed."""
+    planner = IncrementalScheduler("capacity", options={"daily_hours": 3}, today=TODAY)
+    planner.update(courses)
+    before = {date: planner.day(date) for date in planner.dates()}
+
+    edited = [dict(c) for c in courses]
+    edited[-1]["hours"] = 3
+    diff = planner.update(edited)
+
+    assert diff.days
+    for date in set(before) | set(planner.dates()):
+        assert (date in diff.days) == (before.get(date) != planner.day(date))
+
+@pytest.mark.parametrize("strategy", ["urgency", "pomodoro", "capacity"])
+def test_grouped_days_track_updates(strategy, courses):
+    """Tests that the per-day blocks are patched to match the schedule, leaving other days alone."""
+    planner = IncrementalScheduler(strategy, options={"daily_hours": 3} if strategy == "capacity" else None, today=TODAY)
+    planner.update(courses)
+    grouped = planner.grouped()
+    before = dict(grouped)
+
+    edited = [dict(c) for c in courses]
+    edited[4]["deadline"] = day(2)
+    diff = planner.update(edited)
+
+    assert grouped is planner.grouped()
+    assert {date: list(blocks) for date, blocks in grouped.items()} == {date: planner.day(date) for date in planner.dates()}
+    assert all(grouped[date] is before[date] for date in grouped.keys() - set(diff.days))
+    assert planner.blocks().digest() == ScheduleBlocks.from_dicts(planner.schedule()).digest()
+
+def test_reordering_rows_lists_reordered_days(courses):
+    """Tests that swapping two rows reports the days where their blocks swap places."""
+    planner = IncrementalScheduler("even", today=TODAY)
+    planner.update(courses, keys=list(range(6)))
+
+    swapped = [courses[1], courses[0]] + courses[2:]
+    diff = planner.update(swapped, keys=[1, 0, 2, 3, 4, 5])
+
+    assert set(diff.days) >= {day(offset) for offset in range(4)}
+    assert planner.schedule() == by_date(SchedulerEngine("even").generate_schedule(swapped, TODAY))
+    assert [b["course"] for b in planner.grouped()[day(0)]][:2] == ["Course 1", "Course 0"]
@@ -0,0 +1,113 @@
+"""Unit tests for the metrics registry.
+
+This script tests the functionality of the monitoring.metrics module,
+ensuring that per-thread values add up, histograms render cumulative
+buckets in the Prometheus text format, and disabled metrics record nothing.
+"""
+
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from monitoring.metrics import MetricsRegistry, timed, timed_iter
+
+def test_counter_sums_threads():
+    """Tests that counts recorded on many threads are summed."""
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs", "Jobs run.", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(("b",), amount=5)
+
+    assert counter.value(("a",)) == 8000
+    assert counter.value(("b",)) == 5
+    assert len(counter._shards) == 9
+
+def test_histogram_renders_cumulative_buckets():
+    """Tests the text format of a histogram."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, ("home",))
+
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="home",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="home",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{route="home",le="+Inf"} 4' in text
+    assert 'latency_seconds_sum{route="home"} 3.65' in text
+    assert 'latency_seconds_count{route="home"} 4' in text
+
+def test_counter_and_callback_text():
+    """Tests that counters get a _total suffix and callbacks are read on render."""
+    registry = MetricsRegistry()
+    registry.counter("hits", "Hits.").inc()
+    registry.callback("size", "Size.", "gauge", lambda: 7)
+    registry.callback("lookups", "Lookups.", "counter", lambda: {("hit",): 2}, ("outcome",))
+
+    text = registry.render()
+
+    assert "# TYPE hits_total counter\nhits_total 1\n" in text
+    assert "# TYPE size gauge\nsize 7\n" in text
+    assert 'lookups_total{outcome="hit"} 2' in text
+
+def test_label_values_are_escaped():
+    """Tests that quotes and newlines in label values are escaped."""
+    registry = MetricsRegistry()
+    registry.counter("renders", "Renders.", ("component",)).inc(('say "hi"\n',))
+
+    assert 'renders_total{component="say \\"hi\\"\\n"} 1' in registry.render()
+
+def test_disabled_registry_records_nothing():
+    """Tests that nothing is recorded while the registry is disabled."""
+    registry = MetricsRegistry(enabled=False)
+    counter = registry.counter("jobs", "Jobs run.")
+    histogram = registry.histogram("seconds", "Seconds.")
+
+    @timed(histogram)
+    def work():
+        return 42
+
+    counter.inc()
+    with histogram.time():
+        pass
+
+    assert work() == 42
+    assert counter.value() == 0
+    assert histogram.count() == 0
+
+def test_timed_iter_records_once_per_generator():
+    """Tests that a timed generator records one value when exhausted or closed."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("export_seconds", "Export time.")
+
+    @timed_iter(histogram)
+    def chunks(n):
+        yield from range(n)
+
+    assert list(chunks(3)) == [0, 1, 2]
+    partial = chunks(3)
+    next(partial)
+    partial.close()
+
+    assert histogram.count() == 2
+
+def test_reset_zeroes_values():
+    """Tests that reset() clears every metric."""
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs", "Jobs run.")
+    counter.inc()
+    registry.reset()
+
+    assert counter.value() == 0
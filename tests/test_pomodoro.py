@@ -5,12 +5,14 @@ ensuring that it generates valid schedules with correct block lengths.
 """
 import sys
 import os
+from datetime import date, timedelta
 import pytest
 
 # Add project root to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from scheduler.pomodoro import PomodoroScheduler
+from scheduler.scheduler_engine import SchedulerEngine
 
 @pytest.fixture
 def pomodoro_input():
@@ -59,4 +61,49 @@ def test_pomodoro_block_lengths(pomodoro_input):
             assert 1 <= block["duration"] <= 25
         elif block["block"] == "break":
             # Allow short breaks
-            assert block["duration"] in (5, 10)
\ No newline at end of file
+            assert block["duration"] in (5, 10)
+
+def test_window_matches_full_schedule(pomodoro_input):
+    """Tests that a window of days holds exactly those days of the full schedule."""
+    today = date(2099, 11, 1)
+    scheduler = PomodoroScheduler()
+    full = scheduler.schedule(pomodoro_input, today)
+
+    week = scheduler.window(pomodoro_input, days=7, today=today, start=3)
+
+    first, last = str(today + timedelta(days=3)), str(today + timedelta(days=9))
+    assert week == [block for block in full if first <= block["date"] <= last]
+    assert list(scheduler.iter_schedule(pomodoro_input, today)) == full
+
+def test_window_of_long_plan_is_lazy():
+    """Tests that a week of a year-long plan doesn't generate the whole year."""
+    today = date(2099, 1, 1)
+    courses = [{"course": f"Course {i}", "deadline": "2099-12-31", "hours": 500} for i in range(50)]
+    scheduler = PomodoroScheduler()
+
+    blocks = scheduler.iter_schedule(courses, today, days=7)
+    first = next(blocks)
+    rest = list(blocks)
+
+    assert first["date"] == "2099-01-01"
+    assert {block["date"] for block in rest} == {str(today + timedelta(days=i)) for i in range(7)}
+
+def test_configurable_lengths_and_long_breaks():
+    """Tests custom work and break lengths with a long break every third pomodoro."""
+    scheduler = PomodoroScheduler(work_minutes=50, break_minutes=10, long_break_minutes=30, long_break_every=3)
+    courses = [{"course": "Math", "deadline": "2099-01-01", "hours": 4}]
+
+    schedule = scheduler.schedule(courses, date(2099, 1, 1))
+
+    assert [b["duration"] for b in schedule if b["block"] == "study"] == [50, 50, 50, 50, 40]
+    assert [b["duration"] for b in schedule if b["block"] == "break"] == [10, 10, 30, 10]
+    with pytest.raises(ValueError):
+        PomodoroScheduler(work_minutes=0)
+
+def test_engine_streams_only_streaming_strategies(pomodoro_input):
+    """Tests that the engine streams Pomodoro schedules and rejects others."""
+    blocks = SchedulerEngine(strategy="pomodoro").stream_schedule(pomodoro_input, days=1)
+
+    assert len({block["date"] for block in blocks}) == 1
+    with pytest.raises(ValueError):
+        SchedulerEngine(strategy="even").stream_schedule(pomodoro_input)
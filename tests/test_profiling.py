@@ -0,0 +1,109 @@
+"""Unit tests for per-request profiling.
+
+This script tests the functionality of the RequestProfiler class, ensuring
+that only requests asking with the right token are profiled, that profiles
+are rate limited, and that the output directory stays bounded.
+"""
+
+import sys
+import os
+import pstats
+import time
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from monitoring.profiling import RequestProfiler
+
+class FakeClock:
+    """A manually advanced clock for testing rate limits."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def profiler(tmp_path):
+    """Provides a profiler writing to a temporary directory.
+
+    Returns:
+        RequestProfiler: A profiler with no rate limit.
+    """
+    return RequestProfiler(str(tmp_path), min_interval=0, sample_interval=0.001)
+
+def busy_work():
+    """Burns a little CPU so profiles have something to show."""
+    return sum(i * i for i in range(20000))
+
+def test_requested_mode(tmp_path):
+    """Tests which flags select a collector, and that the token is enforced."""
+    profiler = RequestProfiler(str(tmp_path))
+    assert profiler.requested_mode("1") == "cprofile"
+    assert profiler.requested_mode("Sample") == "sample"
+    assert profiler.requested_mode(None) is None
+    assert profiler.requested_mode("flamegraph") is None
+    assert profiler.mode_for_query("?x=1&profile=sample") == "sample"
+
+    guarded = RequestProfiler(str(tmp_path), token="secret")
+    assert guarded.requested_mode("1") is None
+    assert guarded.requested_mode("1", "wrong") is None
+    assert guarded.mode_for_query("profile=1&profile_token=secret") == "cprofile"
+
+    assert RequestProfiler(None).requested_mode("1") is None
+
+def test_cprofile_writes_pstats(profiler):
+    """Tests that a cProfile session saves stats pstats can read."""
+    session = profiler.start("GET /download/csv", "cprofile")
+    busy_work()
+    path = session.stop()
+
+    assert path.endswith("-GET-download-csv.pstats")
+    stats = pstats.Stats(path)
+    assert any(func[2] == "busy_work" for func in stats.stats)
+
+def test_sampling_writes_collapsed_stacks(profiler):
+    """Tests that a sampling session saves 'stack count' lines."""
+    session = profiler.start("ui submit", "sample")
+    deadline = time.monotonic() + 0.05
+    while time.monotonic() < deadline:
+        busy_work()
+    path = session.stop()
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy_work" in line for line in lines)
+
+def test_rate_limit_and_one_at_a_time(tmp_path):
+    """Tests that profiles are refused while one runs or too soon after one."""
+    clock = FakeClock()
+    profiler = RequestProfiler(str(tmp_path), min_interval=10, clock=clock)
+    session = profiler.start("first", "cprofile")
+    clock.now = 1
+    assert profiler.start("concurrent", "cprofile") is None
+    session.stop()
+
+    clock.now = 5
+    assert profiler.start("too soon", "cprofile") is None
+    clock.now = 11
+    later = profiler.start("later", "cprofile")
+    assert later is not None
+    later.stop()
+
+def test_directory_is_bounded(tmp_path):
+    """Tests that only the newest max_files profiles are kept."""
+    profiler = RequestProfiler(str(tmp_path), max_files=3, min_interval=0)
+    paths = []
+    for i in range(5):
+        paths.append(profiler.start(f"request {i}", "cprofile").stop())
+        os.utime(paths[-1], (i, i))
+
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in paths[2:])
+
+def test_disabled_profiler_refuses(tmp_path):
+    """Tests that a profiler without a directory never starts."""
+    assert RequestProfiler(None).start("request", "cprofile") is None
@@ -0,0 +1,84 @@
+"""Unit tests for progress tracking.
+
+This script tests the ProgressIndex class, ensuring that toggling blocks
+keeps per-day and per-course totals right and that progress carries over
+to a regenerated schedule.
+"""
+
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.blocks import ScheduleBlocks
+from scheduler.progress import ProgressIndex
+
+@pytest.fixture
+def grouped():
+    """Provides a two-day schedule grouped by date.
+
+    Returns:
+        dict: ScheduleBlocks per date.
+    """
+    return ScheduleBlocks.from_dicts([
+        {"course": "Math", "block": "study", "duration": 25, "date": "2025-03-03"},
+        {"course": "Math", "block": "break", "duration": 5, "date": "2025-03-03"},
+        {"course": "Art", "block": "study", "duration": 15, "date": "2025-03-03"},
+        {"course": "Math", "block": "study", "duration": 60, "date": "2025-03-04"},
+    ]).group_by_date()
+
+def test_toggle_updates_day_and_course_totals(grouped):
+    """Tests that marking blocks done and undone updates every total."""
+    progress = ProgressIndex(grouped)
+
+    assert progress.toggle(("2025-03-03", 0)) is True
+    assert progress.toggle(("2025-03-03", 1)) is True
+    assert progress.day_percent("2025-03-03") == 62
+    assert progress.course_progress() == {"Math": (25, 85), "Art": (0, 15)}
+
+    assert progress.toggle(("2025-03-03", 0)) is False
+    assert progress.day_percent("2025-03-03") == 0
+    assert progress.is_done(("2025-03-03", 1))
+    assert progress.overall_percent() == 0
+
+def test_completed_blocks_carry_over(grouped):
+    """Tests that carried-over ids are applied and unknown ids are ignored."""
+    progress = ProgressIndex(grouped, [("2025-03-04", 0), ("2025-03-04", 7), ("2025-01-01", 0)])
+
+    assert progress.completed == {("2025-03-04", 0)}
+    assert progress.day_percent("2025-03-04") == 100
+    assert progress.overall_percent() == 60
+
+def test_set_day_matches_a_fresh_index(grouped):
+    """Tests that replacing one day drops only its checkmarks and gives the same totals as a rebuild."""
+    progress = ProgressIndex(grouped, [("2025-03-03", 2), ("2025-03-04", 0)])
+    new_day = ScheduleBlocks.from_dicts([
+        {"course": "Math", "block": "study", "duration": 40, "date": "2025-03-03"},
+        {"course": "Music", "block": "study", "duration": 10, "date": "2025-03-03"},
+    ])
+    progress.set_day("2025-03-03", new_day)
+    fresh = ProgressIndex({**grouped, "2025-03-03": new_day}, [("2025-03-04", 0)])
+
+    assert progress.completed == fresh.completed == {("2025-03-04", 0)}
+    assert progress.course_progress() == fresh.course_progress() == {"Math": (60, 100), "Music": (0, 10)}
+    assert progress.day_percent("2025-03-03") == 0
+    assert progress.overall_percent() == fresh.overall_percent()
+
+    progress.set_day("2025-03-04")
+    assert progress.course_progress() == {"Math": (0, 40), "Music": (0, 10)}
+    assert progress.completed == set()
+
+def test_outside_totals_move_in_as_days_load(grouped):
+    """Tests that loading days counted in the outside totals keeps the course totals the same."""
+    whole = ProgressIndex(grouped, [("2025-03-03", 0), ("2025-03-04", 0)])
+    progress = ProgressIndex({}, outside=whole.course_progress())
+
+    assert progress.course_progress() == whole.course_progress()
+    progress.load_day("2025-03-03", grouped["2025-03-03"], [("2025-03-03", 0)])
+    assert progress.course_progress() == whole.course_progress()
+    assert progress.day_percent("2025-03-03") == whole.day_percent("2025-03-03")
+    progress.load_day("2025-03-04", grouped["2025-03-04"], [("2025-03-04", 0)])
+
+    assert progress.course_progress() == whole.course_progress() == {"Math": (85, 85), "Art": (0, 15)}
+    assert progress.overall_percent() == whole.overall_percent()
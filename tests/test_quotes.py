@@ -1,18 +1,74 @@
 """Unit tests for the QuoteFetcher.
 
-This script tests the functionality of the QuoteFetcher class,
-ensuring that it returns valid quotes in the expected format.
+This script tests the functionality of the QuoteFetcher and QuoteCache
+classes against a local stub of the ZenQuotes API, ensuring that quotes
+are returned in the expected format, cached in memory and on disk, and
+fetched without blocking the event loop.
 """
 
-from api.quotes import QuoteFetcher
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-def test_quotes():
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.quotes import FALLBACK_QUOTE, QuoteCache, QuoteFetcher
+
+
+class StubQuoteHandler(BaseHTTPRequestHandler):
+    """Serves a fixed batch of quotes, optionally after a delay."""
+
+    delay = 0.0
+    requests_served = 0
+
+    def do_GET(self):
+        type(self).requests_served += 1
+        time.sleep(self.delay)
+        body = json.dumps([
+            {"q": "Well begun is half done.", "a": "Aristotle"},
+            {"q": "Simplicity is the ultimate sophistication.", "a": "Leonardo da Vinci"},
+        ]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Runs a stub quote API on a free local port.
+
+    Yields:
+        tuple: The API URL and the handler class, whose attributes control
+            the response delay and count the requests served.
+    """
+    handler = type("Handler", (StubQuoteHandler,), {"delay": 0.0, "requests_served": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/quotes", handler
+    server.shutdown()
+    server.server_close()
+
+
+def test_quotes(stub_server, tmp_path):
     """Tests the QuoteFetcher to ensure it returns a valid quote.
 
     Verifies that the quote is a non-empty string, contains a hyphen
     separating the quote and author, and both parts are non-empty.
     """
-    quote = QuoteFetcher().get_quote()
+    url, _ = stub_server
+    quote = QuoteFetcher(api_url=url, cache=QuoteCache(path=str(tmp_path / "quotes.json"))).get_quote()
 
     assert isinstance(quote, str), "Quote should be a string"
     assert len(quote.strip()) > 0, "Quote should not be empty"
@@ -22,3 +78,67 @@ def test_quotes():
     assert len(parts) == 2, "Quote should be in the format 'quote - author'"
     assert len(parts[0]) > 0, "Quote part should not be empty"
     assert len(parts[1]) > 0, "Author part should not be empty"
+
+
+def test_quote_cache_is_reused_from_disk(stub_server, tmp_path):
+    """Tests that quotes are prefetched once and then served from the cache.
+
+    A second cache pointed at the same file should not hit the API again.
+    """
+    url, handler = stub_server
+    path = str(tmp_path / "quotes.json")
+
+    fetcher = QuoteFetcher(api_url=url, cache=QuoteCache(path=path))
+    for _ in range(5):
+        fetcher.get_quote()
+    assert handler.requests_served == 1
+
+    QuoteFetcher(api_url=url, cache=QuoteCache(path=path)).get_quote()
+    assert handler.requests_served == 1
+    assert os.path.exists(path)
+
+
+def test_expired_cache_is_refilled(stub_server, tmp_path):
+    """Tests that the cache is refilled once its TTL has passed."""
+    url, handler = stub_server
+    cache = QuoteCache(path=str(tmp_path / "quotes.json"), ttl=0)
+    fetcher = QuoteFetcher(api_url=url, cache=cache)
+
+    fetcher.get_quote()
+    fetcher.get_quote()
+    assert handler.requests_served == 2
+
+
+def test_async_quote_times_out_with_fallback(stub_server):
+    """Tests that a slow API is cut off by the timeout instead of hanging."""
+    url, handler = stub_server
+    handler.delay = 1.0
+    fetcher = QuoteFetcher(api_url=url, timeout=0.1, cache=QuoteCache(path=None))
+
+    start = time.perf_counter()
+    quote = asyncio.run(fetcher.get_quote_async())
+
+    assert quote == FALLBACK_QUOTE
+    assert time.perf_counter() - start < 1.0
+
+
+def test_async_quote_does_not_block_event_loop(stub_server):
+    """Tests that other coroutines keep running while a quote is fetched."""
+    url, handler = stub_server
+    handler.delay = 0.3
+    fetcher = QuoteFetcher(api_url=url, cache=QuoteCache(path=None))
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        quote, _ = await asyncio.gather(fetcher.get_quote_async(), ticker())
+        return quote
+
+    quote = asyncio.run(main())
+    assert " - " in quote
+    assert len(ticks) == 5
+    assert ticks[-1] - ticks[0] < 0.3
@@ -0,0 +1,86 @@
+"""Unit tests for the strategy registry.
+
+This script tests the functionality of the StrategyRegistry class,
+ensuring that strategies are imported lazily, reused, registered by
+decorator and described by their capabilities.
+"""
+
+import sys
+import os
+import subprocess
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from scheduler.registry import StrategyRegistry, register_strategy, registry
+from scheduler.scheduler_engine import SchedulerEngine
+from scheduler.strategy import SchedulingStrategy
+
+def test_strategy_modules_load_lazily():
+    """Tests that only the selected strategy's module is imported."""
+    code = (
+        "import sys\n"
+        "from scheduler.scheduler_engine import SchedulerEngine\n"
+        "before = {m for m in ('scheduler.pomodoro', 'scheduler.capacity', 'scheduler.vectorized') if m in sys.modules}\n"
+        "SchedulerEngine(strategy='capacity').generate_schedule([])\n"
+        "after = {m for m in ('scheduler.pomodoro', 'scheduler.capacity', 'scheduler.vectorized') if m in sys.modules}\n"
+        "print(sorted(before), sorted(after))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert out.stdout.strip() == "[] ['scheduler.capacity']"
+
+def test_stateless_instances_are_reused():
+    """Tests that engines share strategy instances unless options are given."""
+    first = SchedulerEngine(strategy="urgency").get_strategy()
+
+    assert SchedulerEngine(strategy="urgency").get_strategy() is first
+    assert SchedulerEngine(strategy="urgency", backend="numpy").get_strategy() is not first
+    assert SchedulerEngine(strategy="pomodoro", backend="numpy").get_strategy() is SchedulerEngine(strategy="pomodoro").get_strategy()
+    with_options = SchedulerEngine(strategy="capacity", options={"daily_hours": 2}).get_strategy()
+    assert with_options is not SchedulerEngine(strategy="capacity", options={"daily_hours": 2}).get_strategy()
+
+def test_capabilities():
+    """Tests the capability metadata of the built-in strategies."""
+    assert registry.capabilities("even") == {"incremental": True, "vectorized": True, "streaming": False}
+    assert registry.capabilities("capacity")["incremental"] is False
+    assert SchedulerEngine(strategy="pomodoro").capabilities["vectorized"] is False
+    assert {"even", "urgency", "pomodoro", "capacity"} <= set(registry.names())
+
+def test_decorator_registration():
+    """Tests registering a custom strategy with the decorator."""
+    custom = StrategyRegistry()
+
+    @register_strategy("nothing", registry=custom, streaming=True)
+    class NothingStrategy(SchedulingStrategy):
+        def schedule(self, courses):
+            return []
+
+    assert isinstance(custom.create("nothing"), NothingStrategy)
+    assert custom.capabilities("nothing")["streaming"] is True
+    with pytest.raises(ValueError):
+        custom.create("even")
+    with pytest.raises(ValueError):
+        custom.create("nothing", backend="fortran")
+
+def test_unknown_options_are_rejected_by_name():
+    """Tests that options a strategy doesn't take raise a ValueError naming both."""
+    with pytest.raises(ValueError, match="'even' has no option 'daily_hours'"):
+        SchedulerEngine(strategy="even", options={"daily_hours": 2}).get_strategy()
+    with pytest.raises(ValueError, match="'capacity' has no option 'work_minutes'"):
+        SchedulerEngine(strategy="capacity", options={"daily_hours": 2, "work_minutes": 20}).get_strategy()
+    assert SchedulerEngine(strategy="pomodoro", options={"work_minutes": 20}).get_strategy().work_minutes == 20
+
+def test_undeclared_options_come_from_the_constructor():
+    """Tests that strategies registered without an options list are checked against __init__."""
+    custom = StrategyRegistry()
+
+    @register_strategy("fixed", registry=custom)
+    class FixedStrategy(SchedulingStrategy):
+        def __init__(self, minutes=30):
+            self.minutes = minutes
+
+    assert custom.create("fixed", options={"minutes": 45}).minutes == 45
+    with pytest.raises(ValueError, match="'fixed' has no option 'hours'; it accepts minutes"):
+        custom.create("fixed", options={"hours": 1})
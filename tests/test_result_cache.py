@@ -0,0 +1,183 @@
+"""Unit tests for the schedule result cache.
+
+This script tests the functionality of the ResultCache class, ensuring
+that equivalent inputs share an entry, keys are stable across processes
+and days, the incremental scheduler reads through the cache, and the disk
+tier is shared between caches.
+"""
+
+import sys
+import os
+import subprocess
+from datetime import date, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.result_cache import ResultCache
+from scheduler.scheduler_engine import SchedulerEngine
+
+@pytest.fixture
+def courses():
+    """Provides a small list of courses.
+
+    Returns:
+        list of dict: Courses due within the next two weeks.
+    """
+    today = date.today()
+    return [
+        {"course": "Math", "deadline": str(today + timedelta(days=5)), "hours": 4},
+        {"course": "History", "deadline": str(today + timedelta(days=12)), "hours": "6"},
+    ]
+
+def test_equivalent_inputs_share_a_key(courses):
+    """Tests that differently written but equal courses hash the same."""
+    today = date.today()
+    deadline = today + timedelta(days=5)
+    rewritten = [dict(c) for c in courses]
+    rewritten[0]["deadline"] = deadline.strftime("%m/%d/%Y")
+    rewritten[0]["hours"] = "4.0"
+    rewritten[1]["hours"] = 6.0
+    key = ResultCache.make_key("even", "python", {}, courses, today)
+    assert ResultCache.make_key("even", "python", None, rewritten, today) == key
+    assert ResultCache.make_key("even", "numpy", {}, courses, today) != key
+    assert ResultCache.make_key("even", "python", {}, courses[::-1], today) != key
+    assert ResultCache.make_key("even", "python", {}, courses, today + timedelta(days=1)) != key
+
+def test_hits_and_misses_are_counted(courses):
+    """Tests that repeat generations are served from the cache."""
+    cache = ResultCache()
+    engine = SchedulerEngine(cache=cache)
+    first = engine.generate_schedule(courses)
+    second = engine.generate_schedule(courses)
+    assert second == first and second is not first
+    assert first == SchedulerEngine(cache=None).generate_schedule(courses)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+def test_changing_a_result_leaves_the_cache_alone(courses, tmp_path):
+    """Tests that callers modifying schedules or plans they got don't change later results."""
+    cache = ResultCache(path=str(tmp_path / "results.db"))
+    engine = SchedulerEngine(cache=cache)
+    expected = SchedulerEngine(cache=None).generate_schedule(courses)
+
+    first = engine.generate_schedule(courses)
+    first[0]["duration"] = 0
+    first.pop()
+    second = engine.generate_schedule(courses)
+    second[0]["course"] = "Changed"
+    assert engine.generate_schedule(courses) == expected
+
+    plans = [SchedulerEngine("capacity", options={"daily_hours": 0.5}, cache=c).incremental_scheduler() for c in (cache, cache, None)]
+    plans[0].update(courses)
+    plans[0].unscheduled.clear()
+    plans[0].day(plans[0].dates()[0])[0]["duration"] = 0
+    plans[1].update(courses)
+    plans[2].update(courses)
+    assert plans[1].unscheduled == plans[2].unscheduled != {}
+    assert plans[1].schedule() == plans[2].schedule()
+
+def test_options_change_the_result(courses):
+    """Tests that engines with different options don't share entries."""
+    cache = ResultCache()
+    short = SchedulerEngine("pomodoro", options={"work_minutes": 20}, cache=cache).generate_schedule(courses)
+    default = SchedulerEngine("pomodoro", cache=cache).generate_schedule(courses)
+    assert short != default
+    assert cache.stats()["misses"] == 2
+
+def test_least_recently_used_entry_is_evicted():
+    """Tests that the LRU keeps at most max_entries schedules."""
+    cache = ResultCache(max_entries=2)
+    today = date.today()
+    cache.put("a", today, [1])
+    cache.put("b", today, [2])
+    cache.get("a", today)
+    cache.put("c", today, [3])
+    assert cache.get("b", today) is None
+    assert cache.get("a", today) == [1]
+    assert cache.stats()["size"] == 2
+
+def test_days_are_part_of_the_key(courses):
+    """Tests that schedules for different days are cached side by side."""
+    cache = ResultCache()
+    engine = SchedulerEngine(cache=cache)
+    today = date.today()
+    first = engine.generate_schedule(courses, today)
+    tomorrow = engine.generate_schedule(courses, today + timedelta(days=1))
+    assert tomorrow != first
+    assert engine.generate_schedule(courses, today) == first
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+def test_option_keys_are_stable_across_processes():
+    """Tests that set-valued options hash the same under different string hash seeds."""
+    script = (
+        "from datetime import date; from scheduler.result_cache import ResultCache; "
+        "print(ResultCache.make_key('capacity', 'python', "
+        "{'blackout_dates': {'2025-03-04', '2025-03-09', '2025-03-11', 'x', 'y', 'z'}}, [], date(2025, 3, 3)))"
+    )
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True,
+            env=dict(os.environ, PYTHONHASHSEED=str(seed)),
+        ).stdout
+        for seed in range(4)
+    }
+    assert len(keys) == 1
+
+def test_unstable_options_are_not_cached(courses):
+    """Tests that options without a stable form are computed every time."""
+    cache = ResultCache()
+    today = date.today()
+    with pytest.raises(TypeError):
+        ResultCache.make_key("even", "python", {"hook": object()}, courses, today)
+    assert ResultCache.make_key("capacity", "python", {"blackout_dates": {today}}, courses, today) == \
+        ResultCache.make_key("capacity", "python", {"blackout_dates": [today.isoformat()]}, courses, today)
+
+    calls = []
+    for _ in range(2):
+        cache.get_or_compute(lambda: calls.append(1) or [], "even", "python", {"hook": object()}, courses, today)
+    assert len(calls) == 2
+    assert cache.stats()["size"] == 0
+
+@pytest.mark.parametrize("disk", [False, True])
+def test_incremental_scheduler_uses_the_cache(courses, disk, tmp_path):
+    """Tests that per-course schedules and capacity plans come from the cache the second time."""
+    path = str(tmp_path / "results.db")
+    today = date.today()
+    for strategy, options, lookups in [("even", None, len(courses)), ("capacity", {"daily_hours": 0.5}, 1)]:
+        caches = [ResultCache(path=path), ResultCache(path=path)] if disk else [ResultCache()] * 2
+        first, second = [
+            SchedulerEngine(strategy, options=options, cache=cache).incremental_scheduler(today) for cache in caches
+        ]
+        first.update(courses)
+        second.update(courses)
+
+        assert second.schedule() == first.schedule()
+        assert second.unscheduled == first.unscheduled
+        stats = caches[1].stats()
+        assert stats["hits"] + stats["disk_hits"] == lookups
+    assert first.unscheduled
+
+def test_disk_tier_is_shared(tmp_path):
+    """Tests that a second cache on the same file sees the first one's entries."""
+    path = str(tmp_path / "results.db")
+    today = date.today()
+    block = {"course": "Math", "block": "study", "duration": 60, "date": str(today)}
+    ResultCache(path=path).put("a", today, [block])
+    other = ResultCache(path=path)
+    assert other.get("a", today) == [block]
+    assert other.get("a", today) == [block]
+    stats = other.stats()
+    assert (stats["disk_hits"], stats["hits"], stats["misses"]) == (1, 1, 0)
+
+def test_disk_tier_drops_old_days(tmp_path):
+    """Tests that rolling over removes earlier days from the disk tier."""
+    path = str(tmp_path / "results.db")
+    today = date.today()
+    cache = ResultCache(path=path)
+    cache.put("a", today, [1])
+    cache.put("b", today + timedelta(days=1), [2])
+    assert ResultCache(path=path).get("a", today) is None
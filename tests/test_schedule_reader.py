@@ -0,0 +1,142 @@
+"""Unit tests for the MappedSchedule reader.
+
+This script tests the functionality of the MappedSchedule class, ensuring
+that queries over a memory-mapped schedule file give the same answers as
+the in-memory ScheduleBlocks and ProgressIndex, and that the sidecar date
+index is reused until the file changes.
+"""
+
+import sys
+import os
+import random
+from datetime import date, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from exporter.file_exporter import FileExporter
+from exporter.schedule_reader import MappedSchedule, index_path
+from scheduler.blocks import ScheduleBlocks
+from scheduler.progress import ProgressIndex
+
+@pytest.fixture
+def schedule():
+    """Provides a schedule whose dates are out of order, like a course-by-course export.
+
+    Returns:
+        list of dict: Schedule blocks with 'course', 'block', 'duration',
+        and 'date' keys.
+    """
+    rng = random.Random(7)
+    start = date(2025, 1, 1)
+    return [
+        {
+            "course": f"Course {rng.randrange(6)}",
+            "block": rng.choice(["study", "study", "break", "review"]),
+            "duration": rng.randrange(5, 120),
+            "date": str(start + timedelta(days=rng.randrange(20))),
+        }
+        for _ in range(2000)
+    ]
+
+@pytest.fixture
+def schedule_file(schedule, tmp_path):
+    """Exports the schedule to a columns file.
+
+    Returns:
+        str: Path of the file.
+    """
+    path = str(tmp_path / "cohort.sbc")
+    FileExporter().export("columns", schedule, path)
+    return path
+
+def test_totals_match_blocks(schedule, schedule_file):
+    """Tests per-course and per-day totals against the in-memory schedule, across chunks."""
+    blocks = ScheduleBlocks.from_dicts(schedule)
+    day_minutes = {}
+    for entry in sorted(schedule, key=lambda entry: entry["date"]):
+        day_minutes[entry["date"]] = day_minutes.get(entry["date"], 0) + entry["duration"]
+
+    with MappedSchedule(schedule_file, chunk_rows=128) as reader:
+        assert len(reader) == 2000
+        assert reader.course_totals() == blocks.sum_by_course()
+        assert reader.course_totals(block="study") == blocks.sum_by_course("study")
+        assert reader.course_totals(block="nap") == {}
+        assert reader.date_totals() == day_minutes
+
+def test_range_queries(schedule, schedule_file):
+    """Tests that date range and single-day queries use the index correctly."""
+    blocks = ScheduleBlocks.from_dicts(schedule)
+    grouped = blocks.group_by_date()
+    in_range = [entry for entry in schedule if "2025-01-05" <= entry["date"] <= "2025-01-09"]
+
+    with MappedSchedule(schedule_file, chunk_rows=100) as reader:
+        for day, day_blocks in grouped.items():
+            assert reader.blocks_on(day) == day_blocks
+        assert reader.blocks_on(date(2024, 12, 31)) == []
+        assert reader.blocks_between("2025-01-05", "2025-01-09") == sorted(in_range, key=lambda e: e["date"])
+        assert reader.course_totals("2025-01-05", "2025-01-09") == ScheduleBlocks.from_dicts(in_range).sum_by_course()
+        assert list(reader.date_totals(start="2025-01-18")) == ["2025-01-18", "2025-01-19", "2025-01-20"]
+        assert reader.block_counts("2025-01-07", "2025-01-07") == {"2025-01-07": len(grouped["2025-01-07"])}
+        assert reader.blocks_between("2026-01-01", "2026-02-01") == []
+
+def test_completion_matches_progress_index(schedule, schedule_file):
+    """Tests that completion over the file matches ProgressIndex for the same block ids."""
+    grouped = ScheduleBlocks.from_dicts(schedule).group_by_date()
+    rng = random.Random(3)
+    completed = [(day, i) for day, blocks in grouped.items() for i in range(len(blocks)) if rng.random() < 0.3]
+    progress = ProgressIndex(grouped, completed)
+
+    with MappedSchedule(schedule_file, chunk_rows=256) as reader:
+        assert reader.completion(completed + [("2025-01-01", 10_000), ("2030-01-01", 0)]) == progress.course_progress()
+        in_range = reader.completion(completed, "2025-01-03", "2025-01-03")
+
+    day = ProgressIndex({"2025-01-03": grouped["2025-01-03"]}, [c for c in completed if c[0] == "2025-01-03"])
+    assert in_range == day.course_progress()
+
+def test_wide_durations_keep_their_digest_and_re_export(schedule, tmp_path):
+    """Tests that blocks read from a file with 64-bit durations hash like the same blocks in memory and export again."""
+    schedule[0]["duration"] = 40_000
+    path = str(tmp_path / "wide.sbc")
+    FileExporter().export("columns", schedule, path)
+    by_date = sorted(schedule, key=lambda entry: entry["date"])
+
+    with MappedSchedule(path) as reader:
+        blocks = reader.blocks_between()
+    assert blocks.durations.typecode == "q"
+    in_memory = ScheduleBlocks.from_dicts(schedule)
+    assert blocks.digest() == in_memory.take(sorted(range(len(schedule)), key=lambda i: schedule[i]["date"])).digest()
+
+    again = str(tmp_path / "again.sbc")
+    FileExporter().export("columns", blocks, again)
+    with MappedSchedule(again) as reader:
+        assert reader.blocks_between() == by_date
+
+def test_index_is_reused_until_the_file_changes(schedule, schedule_file):
+    """Tests that the sidecar index is written once and rebuilt when the file is rewritten."""
+    with MappedSchedule(schedule_file):
+        pass
+    built = os.stat(index_path(schedule_file)).st_mtime_ns
+    with MappedSchedule(schedule_file):
+        pass
+    assert os.stat(index_path(schedule_file)).st_mtime_ns == built
+
+    FileExporter().export("columns", schedule[:10], schedule_file)
+    with MappedSchedule(schedule_file) as reader:
+        assert len(reader) == 10
+        assert reader.course_totals() == ScheduleBlocks.from_dicts(schedule[:10]).sum_by_course()
+
+def test_invalid_and_empty_files(tmp_path):
+    """Tests that non-schedule files are refused and empty schedules answer empty."""
+    bad = tmp_path / "bad.sbc"
+    bad.write_bytes(b"definitely not a schedule")
+    with pytest.raises(ValueError):
+        MappedSchedule(str(bad))
+
+    empty = str(tmp_path / "empty.sbc")
+    FileExporter().export("columns", [], empty)
+    with MappedSchedule(empty) as reader:
+        assert len(reader) == 0
+        assert reader.course_totals() == {}
+        assert reader.date_totals() == {}
+        assert reader.blocks_between() == []
@@ -0,0 +1,104 @@
+"""Unit tests for the ScheduleStore.
+
+This script tests the functionality of the ScheduleStore class, ensuring
+that schedules are stored under short content-derived tokens, evicted by
+LRU and TTL, and exported only once per file type.
+"""
+
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from exporter.schedule_store import ScheduleStore
+
+class FakeClock:
+    """A manually advanced clock for testing expiry."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def sample_schedule():
+    """Provides a sample schedule for testing.
+
+    Returns:
+        list of dict: A list of schedule blocks.
+    """
+    return [
+        {"course": "Math", "block": "study", "duration": 60, "date": "2023-11-10"},
+        {"course": "Math", "block": "study", "duration": 90, "date": "2023-11-11"}
+    ]
+
+def test_token_is_short_and_content_derived(sample_schedule):
+    """Tests that equal schedules share a short token and different ones don't."""
+    store = ScheduleStore()
+    token = store.put(sample_schedule)
+
+    assert len(token) == 16
+    assert store.put([dict(b) for b in sample_schedule]) == token
+    assert store.put(sample_schedule[:1]) != token
+    assert store.get(token) == sample_schedule
+    assert store.get("unknown") is None
+
+def test_lru_eviction(sample_schedule):
+    """Tests that the least recently used schedule is evicted first."""
+    store = ScheduleStore(max_entries=2)
+    first = store.put(sample_schedule[:1])
+    second = store.put(sample_schedule[1:])
+    store.get(first)
+    third = store.put(sample_schedule)
+
+    assert len(store) == 2
+    assert store.get(second) is None
+    assert store.get(first) is not None
+    assert store.get(third) is not None
+
+def test_ttl_expiry(sample_schedule):
+    """Tests that schedules expire once they haven't been used for the TTL."""
+    clock = FakeClock()
+    store = ScheduleStore(ttl=10, clock=clock)
+    token = store.put(sample_schedule)
+
+    clock.now = 9
+    assert store.get(token) is not None
+    clock.now = 18
+    assert store.get(token) is not None
+    clock.now = 30
+    assert store.get(token) is None
+
+def test_export_is_rendered_once(sample_schedule):
+    """Tests that repeated downloads reuse the cached export."""
+    store = ScheduleStore()
+    token = store.put(sample_schedule)
+    calls = []
+
+    def render(schedule):
+        calls.append(schedule)
+        return "rendered"
+
+    assert store.get_export(token, "csv", render) == "rendered"
+    assert store.get_export(token, "csv", render) == "rendered"
+    assert len(calls) == 1
+    assert store.get_export("unknown", "csv", render) is None
+
+def test_shared_file_serves_other_stores(sample_schedule, tmp_path):
+    """Tests that a store on the same file finds schedules another one stored."""
+    path = str(tmp_path / "schedules.db")
+    token = ScheduleStore(path=path).put(sample_schedule)
+    other = ScheduleStore(path=path)
+
+    assert other.get(token) == sample_schedule
+    assert other.get_export(token, "csv", lambda s: "rendered") == "rendered"
+    assert other.get("unknown") is None
+
+def test_shared_file_entries_expire(sample_schedule, tmp_path):
+    """Tests that expired schedules aren't read back from the shared file."""
+    path = str(tmp_path / "schedules.db")
+    token = ScheduleStore(ttl=-1, path=path).put(sample_schedule)
+
+    assert ScheduleStore(path=path).get(token) is None
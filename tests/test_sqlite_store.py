@@ -0,0 +1,111 @@
+"""Unit tests for the SQLite storage layer.
+
+This script tests the SQLiteStore class, ensuring that courses, schedules
+and completed blocks round-trip and that date range loads and per-day
+updates only touch the requested days.
+"""
+
+import sys
+import os
+import threading
+from datetime import date
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.scheduler_engine import SchedulerEngine
+from storage.sqlite_store import SavedSchedule, SQLiteStore
+
+@pytest.fixture
+def store(tmp_path):
+    """Provides a SQLiteStore backed by a temporary database file.
+
+    Returns:
+        SQLiteStore: The store.
+    """
+    store = SQLiteStore(str(tmp_path / "studybuddy.db"), batch_size=7)
+    yield store
+    store.close()
+
+@pytest.fixture
+def schedule():
+    """Provides a Pomodoro schedule covering 2099-01-01 to 2099-01-05.
+
+    Returns:
+        ScheduleBlocks: The schedule blocks.
+    """
+    courses = [
+        {"course": "Math", "deadline": "2099-01-05", "hours": 3},
+        {"course": "Art", "deadline": "2099-01-03", "hours": 2},
+    ]
+    return SchedulerEngine(strategy="pomodoro").generate_blocks(courses, date(2099, 1, 1))
+
+def test_uses_wal_and_indexes(store):
+    """Tests that the database is in WAL mode and range loads use the key."""
+    assert store.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = store.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT course FROM blocks WHERE user = 'a' AND date >= '2099' AND date <= '2100'"
+    ).fetchall()
+    assert "PRIMARY KEY" in plan[0][-1]
+
+def test_courses_round_trip(store):
+    """Tests that courses are saved per user and keep their order."""
+    courses = [{"course": "Math", "deadline": "2099-01-05", "hours": "3"}, {"course": "Art", "deadline": "2099-01-03", "hours": 2.5}]
+    store.save_courses("alice", courses)
+    store.save_courses("bob", courses[:1])
+
+    assert store.load_courses("alice") == [dict(courses[0]), {"course": "Art", "deadline": "2099-01-03", "hours": "2.5"}]
+    assert len(store.load_courses("bob")) == 1
+    assert store.load_courses("carol") == []
+
+def test_schedule_round_trip_and_range(store, schedule):
+    """Tests that a schedule round-trips and a date range loads only its days."""
+    store.save_schedule("alice", schedule)
+
+    assert store.load_schedule("alice") == schedule
+    window = store.load_schedule("alice", "2099-01-02", "2099-01-03")
+    assert {block["date"] for block in window} == {"2099-01-02", "2099-01-03"}
+    assert store.course_minutes("alice") == {"Math": 180, "Art": 120}
+
+def test_save_days_clears_only_those_days(store, schedule):
+    """Tests that replacing some days keeps other days and their checkmarks."""
+    store.save_schedule("alice", schedule)
+    store.set_completed("alice", [("2099-01-01", 0), ("2099-01-04", 0), ("2099-01-04", 1)])
+    store.set_completed("alice", [("2099-01-04", 1)], done=False)
+
+    new_day = [{"course": "Math", "block": "study", "duration": 50, "date": "2099-01-01"}]
+    store.save_days("alice", {"2099-01-01": new_day, "2099-01-05": []})
+
+    assert store.load_completed("alice") == {("2099-01-04", 0)}
+    assert store.load_schedule("alice", "2099-01-01", "2099-01-01").to_dicts() == new_day
+    assert not len(store.load_schedule("alice", "2099-01-05", "2099-01-05"))
+
+def test_threads_share_the_database(store, schedule):
+    """Tests that writes from other threads are visible to this one."""
+    threads = [
+        threading.Thread(target=store.save_schedule, args=(f"user{i}", schedule))
+        for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(store.load_schedule(f"user{i}") == schedule for i in range(4))
+
+def test_saved_schedule_loads_a_range_at_a_time(store, schedule):
+    """Tests that a SavedSchedule reads only dates and totals up front and loads each range once."""
+    store.save_schedule("alice", schedule)
+    store.set_completed("alice", [("2099-01-01", 0), ("2099-01-04", 0)])
+    saved = SavedSchedule(store, "alice")
+
+    assert saved.dates == ["2099-01-01", "2099-01-02", "2099-01-03", "2099-01-04", "2099-01-05"]
+    assert saved.course_progress == {"Art": (25, 120), "Math": (25, 180)}
+    assert saved.grouped == {}
+
+    days, completed = saved.load(["2099-01-01", "2099-01-02"])
+    assert list(days) == ["2099-01-01", "2099-01-02"]
+    assert days["2099-01-01"] == [b for b in schedule if b["date"] == "2099-01-01"]
+    assert completed == {("2099-01-01", 0)}
+    assert saved.load(["2099-01-02"]) == ({}, set())
+    assert list(saved.load(["2099-01-02", "2099-01-03"])[0]) == ["2099-01-03"]
@@ -0,0 +1,56 @@
+"""Unit tests for the scheduler utilities.
+
+This script tests the date parsing helpers in scheduler.utils, including
+the supported formats, error reporting and once-per-course parsing.
+"""
+
+import sys
+import os
+from datetime import date, datetime
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.utils import DateParseError, deadline_order, parse_date, parse_deadlines
+
+@pytest.mark.parametrize("value", ["2025-03-07", " 2025-03-07 ", "2025-3-7", "03/07/2025", "3/7/2025"])
+def test_parse_date_formats(value):
+    """Tests that ISO and US formats, padded or not, parse to the same date."""
+    assert parse_date(value) == date(2025, 3, 7)
+
+def test_parse_date_passes_dates_through():
+    """Tests that dates are returned as-is and datetimes are truncated."""
+    day = date(2025, 3, 7)
+    assert parse_date(day) is day
+    assert parse_date(datetime(2025, 3, 7, 12, 30)) == day
+
+@pytest.mark.parametrize("value", ["", "tomorrow", "2025-02-30", "13/01/2025", "2025/03/07", None])
+def test_parse_date_raises_typed_error(value, capsys):
+    """Tests that invalid dates raise DateParseError without printing."""
+    with pytest.raises(DateParseError) as excinfo:
+        parse_date(value)
+
+    assert isinstance(excinfo.value, ValueError)
+    assert excinfo.value.value == value
+    assert capsys.readouterr().out == ""
+
+def test_parse_deadlines_skips_invalid_courses():
+    """Tests that courses without a valid deadline are left out."""
+    courses = [
+        {"course": "Math", "deadline": "2025-03-07", "hours": 2},
+        {"course": "Art", "deadline": "soon", "hours": 2},
+        {"course": "History", "hours": 2},
+    ]
+
+    assert parse_deadlines(courses) == [(date(2025, 3, 7), courses[0])]
+
+def test_deadline_order_is_stable_and_puts_undated_last():
+    """Tests that courses are ordered by deadline, ties in input order, invalid deadlines last."""
+    courses = [
+        {"deadline": "2025-03-09"},
+        {"deadline": "bad"},
+        {"deadline": "03/07/2025"},
+        {},
+        {"deadline": "2025-03-07"},
+    ]
+    assert deadline_order(courses) == [2, 4, 0, 1, 3]
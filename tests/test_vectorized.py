@@ -0,0 +1,67 @@
+"""Unit tests for the NumPy scheduling backend.
+
+This script tests that the vectorized urgency-based and even distribution
+strategies produce exactly the same output as the pure-Python ones.
+"""
+
+import sys
+import os
+import json
+import random
+from datetime import date, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler.scheduler_engine import SchedulerEngine
+
+@pytest.fixture
+def random_courses():
+    """Provides a mix of regular and edge-case courses.
+
+    Returns:
+        list of dict: Courses with 'course', 'deadline', and 'hours' keys,
+        including past deadlines, zero and fractional hours, US-format
+        dates and entries that the strategies skip.
+    """
+    rng = random.Random(326)
+    today = date.today()
+    courses = []
+    for i in range(200):
+        deadline = today + timedelta(days=rng.randint(-5, 120))
+        deadline_str = str(deadline) if i % 3 else deadline.strftime("%m/%d/%Y")
+        courses.append({"course": f"Course {i}", "deadline": deadline_str, "hours": rng.choice([0, 1, 2.5, 7, 40, "3"])})
+    courses.append({"course": "No hours", "deadline": str(today)})
+    courses.append({"course": "Bad hours", "deadline": str(today), "hours": "lots"})
+    return courses
+
+@pytest.mark.parametrize("strategy", ["urgency", "even"])
+def test_numpy_backend_is_identical(strategy, random_courses):
+    """Tests that the NumPy backend matches the Python backend byte for byte."""
+    expected = SchedulerEngine(strategy=strategy).generate_schedule(random_courses)
+    actual = SchedulerEngine(strategy=strategy, backend="numpy").generate_schedule(random_courses)
+
+    assert json.dumps(actual) == json.dumps(expected)
+
+def test_numpy_backend_empty_and_unknown():
+    """Tests the NumPy backend with no courses and rejects unknown backends."""
+    assert SchedulerEngine(strategy="even", backend="numpy").generate_schedule([]) == []
+    with pytest.raises(ValueError):
+        SchedulerEngine(strategy="even", backend="fortran").generate_schedule([])
+
+@pytest.mark.parametrize("strategy", ["urgency", "even"])
+def test_numpy_blocks_leave_out_courses_without_blocks(strategy):
+    """Tests that unnamed or empty courses don't reach the NumPy backend's name table."""
+    today = date.today()
+    courses = [
+        {"deadline": str(today + timedelta(days=3)), "hours": 0},
+        {"course": "Empty", "deadline": str(today + timedelta(days=2)), "hours": 0},
+        {"course": "Math", "deadline": str(today + timedelta(days=4)), "hours": 2},
+        {"course": "Art", "deadline": str(today + timedelta(days=1)), "hours": 1},
+    ]
+    expected = SchedulerEngine(strategy=strategy).generate_blocks(courses, today)
+    actual = SchedulerEngine(strategy=strategy, backend="numpy").generate_blocks(courses, today)
+
+    assert actual.course_names == expected.course_names
+    assert list(actual) == list(expected)
+    assert actual.digest() == expected.digest()